@@ -0,0 +1,78 @@
+from fastapi import HTTPException, Header, Request, Response
+from collections.abc import Callable
+from typing import Annotated
+from datetime import date
+import hashlib
+import logging
+
+from crud import crud
+
+logger = logging.getLogger(__name__)
+
+
+class ConditionalRequest:
+    """
+    Dependency of the analysis endpoints for conditional requests. The ETag of a response is a hash of the path, the
+    query parameters, the Accept header, the current day and the version of the data, which is the watermark of the
+    tables and the run of the model for predictions. If the If-None-Match header holds it, the request is answered with
+    304 Not Modified before the analysis runs.
+    """
+    def __init__(self, tables: tuple[str, ...], model: str | None = None, skip: Callable[[Request], bool] | None = None) -> None:
+        """
+        Args:
+            tables (tuple): Tables the analysis reads, keys of Watermark.WATERMARKS
+            model (str, optional): Name of the runs of the model the endpoint predicts with. Defaults to None.
+            skip (Callable, optional): Returns True for requests whose response changes on every call, they get no ETag. Defaults to None.
+        """
+        self.tables = tables
+        self.model = model
+        self.skip = skip
+
+    async def __call__(self, request: Request, response: Response, if_none_match: Annotated[str | None, Header()] = None) -> str | None:
+        """
+        Gets the ETag of the request and sets it on the response
+
+        Returns:
+            str | None: ETag, None if the request is skipped or the version could not be read
+
+        Raises:
+            HTTPException: 304 if the If-None-Match header holds the ETag
+        """
+        if self.skip is not None and self.skip(request):
+            return None
+
+        try:
+            version = await crud.get_data_version(self.tables, self.model)
+        except Exception:
+            logger.warning("Error while reading the data version of %s", request.url.path, exc_info=True)
+            return None
+
+        etag = makeETag(request, version)
+        if if_none_match is not None and matches(if_none_match, etag):
+            raise HTTPException(status_code=304, headers={"ETag": etag})
+
+        response.headers["ETag"] = etag
+        return etag
+
+
+def makeETag(request: Request, version: tuple) -> str:
+    """
+    Gets the strong ETag of a request and the version of its data
+
+    Args:
+        request (Request): Request to an analysis endpoint
+        version (tuple): Version of the data of the analysis
+
+    Returns:
+        str: Quoted hex digest
+    """
+    key = (request.url.path, sorted(request.query_params.multi_items()), request.headers.get("accept"), date.today().isoformat(), version)
+    return f'"{hashlib.blake2b(repr(key).encode(), digest_size=16).hexdigest()}"'
+
+def matches(if_none_match: str, etag: str) -> bool:
+    """
+    Checks if the If-None-Match header holds the ETag, weak ETags compare like strong ones for GET requests
+    """
+    if if_none_match.strip() == "*":
+        return True
+    return any(tag.strip().removeprefix("W/") == etag for tag in if_none_match.split(","))
@@ -1,4 +1,5 @@
 VERSION="api"
 DESCRIPTIVE="descriptive"
 DIAGNOSTIC="diagnostic"
-PREDICTIVE="predictive"
\ No newline at end of file
+PREDICTIVE="predictive"
+METRICS="metrics"
@@ -1,18 +1,21 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Header
 from typing import Annotated
+from datetime import date
 
 
 from crud import crud
 from api.constants import VERSION, DESCRIPTIVE
 
 from api.auth import is_token_valid
+from api.conditional import ConditionalRequest
+from api.encoding import negotiate, encode, ARROW
 
 
 router = APIRouter()
 
 
 @router.get(f"/{VERSION}/{DESCRIPTIVE}/customers-signup/", status_code=210)
-async def get_customers_signup(token: Annotated[str, Depends(is_token_valid)], last_days: int = 0, month: bool = False, year: bool = False, showzeros: bool = False, percentage: bool = False, cumulative: bool = False):
+async def get_customers_signup(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("customers",)))], last_days: int = 0, month: bool = False, year: bool = False, showzeros: bool = False, percentage: bool = False, cumulative: bool = False, year_over_year: bool = False, last_month: bool = False, date_from: Annotated[date | None, Query(alias="from")] = None, date_to: Annotated[date | None, Query(alias="to")] = None, rolling: bool = False, max_points: int | None = None, since: str | None = None, columnar: bool = False, accept: Annotated[str | None, Header()] = None):
     """
     Get the amount of customers that signed up in the last days, month or year.
 
@@ -24,8 +27,18 @@ async def get_customers_signup(token: Annotated[str, Depends(is_token_valid)], l
     - showzeros (bool, optional): If True, the data will show the days/months/years with no customers. Defaults to False.
     - percentage (bool, optional): If True, the data will show the percentage of customers that signed up in the last days, month or year in relation to the previous period. Defaults to False.
     - cumulative (bool, optional): If True, cumulative growth is calculated. Defaults to False.
+    - year_over_year (bool, optional): If True and percentage is True, the percentage in relation to the same period one year earlier is added. Defaults to False.
+    - last_month (bool, optional): If True and percentage is True, the percentage in relation to the same period one month earlier is added. Defaults to False.
+    - from (date, optional): First day to consider, e.g. 2024-01-01. Defaults to None, which means no lower bound.
+    - to (date, optional): Last day to consider, inclusive. Defaults to None, which means up to today.
+    - rolling (bool, optional): If True, the moving sums and averages of the last 7, 30 and 90 days are added to the daily data as "rolling", e.g. {"7": {"sum": {"2024-01-07": 70}, "average": {"2024-01-07": 10.0}}}. Defaults to False.
+    - max_points (int, optional): If set, every series is reduced to at most this many buckets, keeping the first and the last one and the lowest and highest of the buckets in between. Defaults to None, which means all buckets.
+    - since (str, optional): Cursor of an earlier response, every response sends its own as the X-Cursor header, e.g. "2024-05-03:1520". If set, delta is added to the result, and if no earlier bucket changed since, only the buckets from the one of the cursor on are returned and delta is True, buckets that left a last_days window are not listed. Defaults to None, which means all buckets.
+    - columnar (bool, optional): If True, every series is returned as parallel arrays instead of a dictionary per bucket, e.g. {"start": "2024-01-01", "freq": "D", "values": [3, 0, 5], "cumulative": [3, 3, 8]}. "labels" lists the buckets if they are not consecutive. Defaults to False.
+    - Accept (header, optional): application/json, application/msgpack or application/vnd.apache.arrow.stream, Arrow IPC streams are always columnar with one row per bucket. Defaults to application/json.
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If no data is found, it will raise a 404 error.
     - HTTPException: If there is an error, it will raise a 400 error.
 
@@ -42,9 +55,50 @@ async def get_customers_signup(token: Annotated[str, Depends(is_token_valid)], l
         }
 
     """
+    media_type = negotiate(accept)
     try:
-        data = await crud.get_customers_signup(last_days=last_days, month=month, year=year, showzeros=showzeros, percentage=percentage, cumulative=cumulative)
-        return data
+        data, cursor = await crud.get_customers_signup(last_days=last_days, month=month, year=year, showzeros=showzeros, percentage=percentage, cumulative=cumulative, year_over_year=year_over_year, last_month=last_month, date_from=date_from, date_to=date_to, rolling=rolling, max_points=max_points, since=since, columnar=columnar or media_type == ARROW)
+        return encode(data, media_type, status_code=210, etag=etag, cursor=cursor)
+    except Exception as e:
+        if e == "No data found":
+            raise HTTPException(status_code=404, detail=str(e))
+        else:
+            raise HTTPException(status_code=400, detail=str(e))
+
+@router.get(f"/{VERSION}/{DESCRIPTIVE}/customers-signup/granularities/", status_code=210)
+async def get_customers_signup_granularities(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("customers",)))], granularities: Annotated[list[str], Query()] = ["day", "week", "month", "quarter", "year"], showzeros: bool = False, cumulative: bool = False, date_from: Annotated[date | None, Query(alias="from")] = None, date_to: Annotated[date | None, Query(alias="to")] = None, max_points: int | None = None, since: str | None = None, columnar: bool = False, accept: Annotated[str | None, Header()] = None):
+    """
+    Get the customers that signed up per day, ISO week, month, quarter and year in one call, the data is only collected once.
+
+    **Args:**
+    - token (str)
+    - granularities (list, optional): Any of day, week, month, quarter and year, e.g. ?granularities=day&granularities=week. Defaults to all of them.
+    - showzeros (bool, optional): If True, the data will show the buckets with no customers that signed up. Defaults to False.
+    - cumulative (bool, optional): If True, cumulative growth is calculated. Defaults to False.
+    - from (date, optional): First day to consider, e.g. 2024-01-01. Defaults to None, which means no lower bound.
+    - to (date, optional): Last day to consider, inclusive. Defaults to None, which means up to today.
+    - max_points (int, optional): If set, every series is reduced to at most this many buckets, keeping the first and the last one and the lowest and highest of the buckets in between. Defaults to None, which means all buckets.
+    - since (str, optional): Cursor of an earlier response, every response sends its own as the X-Cursor header, e.g. "2024-05-03:1520". If set, delta is added to the result, and if no earlier bucket changed since, only the buckets from the one of the cursor on are returned and delta is True, buckets that left a last_days window are not listed. Defaults to None, which means all buckets.
+    - columnar (bool, optional): If True, every series is returned as parallel arrays instead of a dictionary per bucket, e.g. {"start": "2024-01-01", "freq": "D", "values": [3, 0, 5], "cumulative": [3, 3, 8]}. "labels" lists the buckets if they are not consecutive. Defaults to False.
+    - Accept (header, optional): application/json, application/msgpack or application/vnd.apache.arrow.stream, Arrow IPC streams are always columnar with one row per bucket. Defaults to application/json.
+
+    **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
+    - HTTPException: If no data is found, it will raise a 404 error.
+    - HTTPException: If there is an error, it will raise a 400 error.
+
+    **Returns:**
+    - dict: The growth and cumulative growth per granularity.
+        Example: {
+            "week": {"growth": {"2024-W01": 100, "2024-W02": 120}, "cumulative_growth": {}},
+            "quarter": {"growth": {"2024-Q1": 1500}, "cumulative_growth": {}},
+            "typeofgraph": "line"
+        }
+    """
+    media_type = negotiate(accept)
+    try:
+        data, cursor = await crud.get_customers_signup_granularities(granularities=granularities, showzeros=showzeros, cumulative=cumulative, date_from=date_from, date_to=date_to, max_points=max_points, since=since, columnar=columnar or media_type == ARROW)
+        return encode(data, media_type, status_code=210, etag=etag, cursor=cursor)
     except Exception as e:
         if e == "No data found":
             raise HTTPException(status_code=404, detail=str(e))
@@ -52,7 +106,7 @@ async def get_customers_signup(token: Annotated[str, Depends(is_token_valid)], l
             raise HTTPException(status_code=400, detail=str(e))
         
 @router.get(f"/{VERSION}/{DESCRIPTIVE}/orders-amount/", status_code=210)
-async def get_orders_amount(token: Annotated[str, Depends(is_token_valid)], last_days: int = 0, month: bool = False, year: bool = False, showzeros: bool = False, percentage: bool = False, cumulative: bool = False):
+async def get_orders_amount(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("orders",)))], last_days: int = 0, month: bool = False, year: bool = False, showzeros: bool = False, percentage: bool = False, cumulative: bool = False, year_over_year: bool = False, last_month: bool = False, date_from: Annotated[date | None, Query(alias="from")] = None, date_to: Annotated[date | None, Query(alias="to")] = None, rolling: bool = False, max_points: int | None = None, since: str | None = None, columnar: bool = False, accept: Annotated[str | None, Header()] = None):
     """
     Get the amount of orders made in the last days, month or year.
 
@@ -64,8 +118,18 @@ async def get_orders_amount(token: Annotated[str, Depends(is_token_valid)], last
     - showzeros (bool, optional): If True, the data will show the days/months/years with no orders. Defaults to False.
     - percentage (bool, optional): If True, the data will show the percentage of orders made in the last days, month or year in relation to the previous period. Defaults to False.
     - cumulative (bool, optional): If True, cumulative growth is calculated. Defaults to False.
+    - year_over_year (bool, optional): If True and percentage is True, the percentage in relation to the same period one year earlier is added. Defaults to False.
+    - last_month (bool, optional): If True and percentage is True, the percentage in relation to the same period one month earlier is added. Defaults to False.
+    - from (date, optional): First day to consider, e.g. 2024-01-01. Defaults to None, which means no lower bound.
+    - to (date, optional): Last day to consider, inclusive. Defaults to None, which means up to today.
+    - rolling (bool, optional): If True, the moving sums and averages of the last 7, 30 and 90 days are added to the daily data as "rolling", e.g. {"7": {"sum": {"2024-01-07": 70}, "average": {"2024-01-07": 10.0}}}. Defaults to False.
+    - max_points (int, optional): If set, every series is reduced to at most this many buckets, keeping the first and the last one and the lowest and highest of the buckets in between. Defaults to None, which means all buckets.
+    - since (str, optional): Cursor of an earlier response, every response sends its own as the X-Cursor header, e.g. "2024-05-03:1520". If set, delta is added to the result, and if no earlier bucket changed since, only the buckets from the one of the cursor on are returned and delta is True, buckets that left a last_days window are not listed. Defaults to None, which means all buckets.
+    - columnar (bool, optional): If True, every series is returned as parallel arrays instead of a dictionary per bucket, e.g. {"start": "2024-01-01", "freq": "D", "values": [3, 0, 5], "cumulative": [3, 3, 8]}. "labels" lists the buckets if they are not consecutive. Defaults to False.
+    - Accept (header, optional): application/json, application/msgpack or application/vnd.apache.arrow.stream, Arrow IPC streams are always columnar with one row per bucket. Defaults to application/json.
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If no data is found, it will raise a 404 error.
     - HTTPException: If there is an error, it will raise a 400 error.
 
@@ -81,9 +145,50 @@ async def get_orders_amount(token: Annotated[str, Depends(is_token_valid)], last
             "2024": 200
         }
     """
+    media_type = negotiate(accept)
     try:
-        data = await crud.get_orders_amount(last_days=last_days, month=month, year=year, showzeros=showzeros, percentage=percentage, cumulative=cumulative)
-        return data
+        data, cursor = await crud.get_orders_amount(last_days=last_days, month=month, year=year, showzeros=showzeros, percentage=percentage, cumulative=cumulative, year_over_year=year_over_year, last_month=last_month, date_from=date_from, date_to=date_to, rolling=rolling, max_points=max_points, since=since, columnar=columnar or media_type == ARROW)
+        return encode(data, media_type, status_code=210, etag=etag, cursor=cursor)
+    except Exception as e:
+        if e == "No data found":
+            raise HTTPException(status_code=404, detail=str(e))
+        else:
+            raise HTTPException(status_code=400, detail=str(e))
+
+@router.get(f"/{VERSION}/{DESCRIPTIVE}/orders-amount/granularities/", status_code=210)
+async def get_orders_amount_granularities(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("orders",)))], granularities: Annotated[list[str], Query()] = ["day", "week", "month", "quarter", "year"], showzeros: bool = False, cumulative: bool = False, date_from: Annotated[date | None, Query(alias="from")] = None, date_to: Annotated[date | None, Query(alias="to")] = None, max_points: int | None = None, since: str | None = None, columnar: bool = False, accept: Annotated[str | None, Header()] = None):
+    """
+    Get the orders per day, ISO week, month, quarter and year in one call, the data is only collected once.
+
+    **Args:**
+    - token (str)
+    - granularities (list, optional): Any of day, week, month, quarter and year, e.g. ?granularities=day&granularities=week. Defaults to all of them.
+    - showzeros (bool, optional): If True, the data will show the buckets with no orders. Defaults to False.
+    - cumulative (bool, optional): If True, cumulative growth is calculated. Defaults to False.
+    - from (date, optional): First day to consider, e.g. 2024-01-01. Defaults to None, which means no lower bound.
+    - to (date, optional): Last day to consider, inclusive. Defaults to None, which means up to today.
+    - max_points (int, optional): If set, every series is reduced to at most this many buckets, keeping the first and the last one and the lowest and highest of the buckets in between. Defaults to None, which means all buckets.
+    - since (str, optional): Cursor of an earlier response, every response sends its own as the X-Cursor header, e.g. "2024-05-03:1520". If set, delta is added to the result, and if no earlier bucket changed since, only the buckets from the one of the cursor on are returned and delta is True, buckets that left a last_days window are not listed. Defaults to None, which means all buckets.
+    - columnar (bool, optional): If True, every series is returned as parallel arrays instead of a dictionary per bucket, e.g. {"start": "2024-01-01", "freq": "D", "values": [3, 0, 5], "cumulative": [3, 3, 8]}. "labels" lists the buckets if they are not consecutive. Defaults to False.
+    - Accept (header, optional): application/json, application/msgpack or application/vnd.apache.arrow.stream, Arrow IPC streams are always columnar with one row per bucket. Defaults to application/json.
+
+    **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
+    - HTTPException: If no data is found, it will raise a 404 error.
+    - HTTPException: If there is an error, it will raise a 400 error.
+
+    **Returns:**
+    - dict: The growth and cumulative growth per granularity.
+        Example: {
+            "week": {"growth": {"2024-W01": 100, "2024-W02": 120}, "cumulative_growth": {}},
+            "quarter": {"growth": {"2024-Q1": 1500}, "cumulative_growth": {}},
+            "typeofgraph": "line"
+        }
+    """
+    media_type = negotiate(accept)
+    try:
+        data, cursor = await crud.get_orders_amount_granularities(granularities=granularities, showzeros=showzeros, cumulative=cumulative, date_from=date_from, date_to=date_to, max_points=max_points, since=since, columnar=columnar or media_type == ARROW)
+        return encode(data, media_type, status_code=210, etag=etag, cursor=cursor)
     except Exception as e:
         if e == "No data found":
             raise HTTPException(status_code=404, detail=str(e))
@@ -91,7 +196,7 @@ async def get_orders_amount(token: Annotated[str, Depends(is_token_valid)], last
             raise HTTPException(status_code=400, detail=str(e))
 
 @router.get(f"/{VERSION}/{DESCRIPTIVE}/employees-amount/", status_code=210)
-async def get_employees_amount(token: Annotated[str, Depends(is_token_valid)]):
+async def get_employees_amount(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("employees", "roles")))]):
     """
     Get the amount of employees in the company.
 
@@ -99,6 +204,7 @@ async def get_employees_amount(token: Annotated[str, Depends(is_token_valid)]):
     - token (str)
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If there is an error, it will raise a 404 error.
 
     **Returns:**
@@ -111,7 +217,7 @@ async def get_employees_amount(token: Annotated[str, Depends(is_token_valid)]):
         raise HTTPException(status_code=404, detail=str(e))
 
 @router.get(f"/{VERSION}/{DESCRIPTIVE}/products-amount/", status_code=210)
-async def get_products_amount(token: Annotated[str, Depends(is_token_valid) ], limit: int = 5, well_stocked: bool = False, out_of_stock: bool = False):
+async def get_products_amount(token: Annotated[str, Depends(is_token_valid) ], etag: Annotated[str | None, Depends(ConditionalRequest(("products",)))], limit: int = 5, well_stocked: bool = False, out_of_stock: bool = False):
     """
     Get the amount of products in the company. Default well and out of stock products are shown.
 
@@ -122,6 +228,7 @@ async def get_products_amount(token: Annotated[str, Depends(is_token_valid) ], l
     - out_of_stock (bool, optional): If True, the data will show the out of stock products. Defaults to False.
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If there is an error, it will raise a 404 error.
 
     **Returns:**
@@ -135,7 +242,7 @@ async def get_products_amount(token: Annotated[str, Depends(is_token_valid) ], l
         raise HTTPException(status_code=404, detail=str(e))
 
 @router.get(f"/{VERSION}/{DESCRIPTIVE}/products-mostly-bought/", status_code=210)
-async def get_products_mostly_bought(token: Annotated[str, Depends(is_token_valid)], last_days: int = 0, month: bool = False, year: bool = False, limit: int = 5):
+async def get_products_mostly_bought(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("ordersProducts", "products")))], last_days: int = 0, month: bool = False, year: bool = False, limit: int = 5):
     """
     Get the products that are mostly bought in the last days, month or year.
 
@@ -146,6 +253,7 @@ async def get_products_mostly_bought(token: Annotated[str, Depends(is_token_vali
     - year (bool, optional): If True, the data will be filtered by year. Defaults to False.
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If no data is found, it will raise a 404 error.
     - HTTPException: If there is an error, it will raise a 400 error.
 
@@ -163,7 +271,7 @@ async def get_products_mostly_bought(token: Annotated[str, Depends(is_token_vali
             raise HTTPException(status_code=400, detail=str(e))
 
 @router.get(f"/{VERSION}/{DESCRIPTIVE}/routes-amount/", status_code=210)
-async def get_routes_amount(token: Annotated[str, Depends(is_token_valid)], limit: int = 5):
+async def get_routes_amount(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("routes", "routesOrders")))], limit: int = 5):
     """
     Get the amount of routes in the company.
 
@@ -172,6 +280,7 @@ async def get_routes_amount(token: Annotated[str, Depends(is_token_valid)], limi
     - limit (int, optional): The amount of routes to show. Defaults to 5.
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If there is an error, it will raise a 404 error.
 
     **Returns:**
@@ -185,7 +294,7 @@ async def get_routes_amount(token: Annotated[str, Depends(is_token_valid)], limi
         raise HTTPException(status_code=404, detail=str(e))
     
 @router.get(f"/{VERSION}/{DESCRIPTIVE}/invoices-amount/", status_code=210)
-async def get_invoices_amount(token: Annotated[str, Depends(is_token_valid)], last_days: int = 0, month: bool = False, year: bool = False, showzeros: bool = False, percentage: bool = False, cumulative: bool = False):
+async def get_invoices_amount(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("invoices",)))], last_days: int = 0, month: bool = False, year: bool = False, showzeros: bool = False, percentage: bool = False, cumulative: bool = False, year_over_year: bool = False, last_month: bool = False, date_from: Annotated[date | None, Query(alias="from")] = None, date_to: Annotated[date | None, Query(alias="to")] = None, rolling: bool = False, max_points: int | None = None, since: str | None = None, columnar: bool = False, accept: Annotated[str | None, Header()] = None):
     """
     Get the amount of invoices in the company.
 
@@ -197,16 +306,67 @@ async def get_invoices_amount(token: Annotated[str, Depends(is_token_valid)], la
     - showzeros (bool, optional): If True, the data will show the days/months/years with no invoices. Defaults to False.
     - percentage (bool, optional): If True, the data will show the percentage of invoices in the last days, month or year in relation to the previous period. Defaults to False.
     - cumulative (bool, optional): If True, cumulative growth is calculated. Defaults to False.
+    - year_over_year (bool, optional): If True and percentage is True, the percentage in relation to the same period one year earlier is added. Defaults to False.
+    - last_month (bool, optional): If True and percentage is True, the percentage in relation to the same period one month earlier is added. Defaults to False.
+    - from (date, optional): First day to consider, e.g. 2024-01-01. Defaults to None, which means no lower bound.
+    - to (date, optional): Last day to consider, inclusive. Defaults to None, which means up to today.
+    - rolling (bool, optional): If True, the moving sums and averages of the last 7, 30 and 90 days are added to the daily data as "rolling", e.g. {"7": {"sum": {"2024-01-07": 70}, "average": {"2024-01-07": 10.0}}}. Defaults to False.
+    - max_points (int, optional): If set, every series is reduced to at most this many buckets, keeping the first and the last one and the lowest and highest of the buckets in between. Defaults to None, which means all buckets.
+    - since (str, optional): Cursor of an earlier response, every response sends its own as the X-Cursor header, e.g. "2024-05-03:1520". If set, delta is added to the result, and if no earlier bucket changed since, only the buckets from the one of the cursor on are returned and delta is True, buckets that left a last_days window are not listed. Defaults to None, which means all buckets.
+    - columnar (bool, optional): If True, every series is returned as parallel arrays instead of a dictionary per bucket, e.g. {"start": "2024-01-01", "freq": "D", "values": [3, 0, 5], "cumulative": [3, 3, 8]}. "labels" lists the buckets if they are not consecutive. Defaults to False.
+    - Accept (header, optional): application/json, application/msgpack or application/vnd.apache.arrow.stream, Arrow IPC streams are always columnar with one row per bucket. Defaults to application/json.
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If there is an error, it will raise a 404 error.
 
     **Returns:**
     - dict: The amount of invoices in the company.
 
     """
+    media_type = negotiate(accept)
     try:
-        data = await crud.get_invoices_amount(last_days=last_days, month=month, year=year, showzeros=showzeros, percentage=percentage, cumulative=cumulative)
-        return data
+        data, cursor = await crud.get_invoices_amount(last_days=last_days, month=month, year=year, showzeros=showzeros, percentage=percentage, cumulative=cumulative, year_over_year=year_over_year, last_month=last_month, date_from=date_from, date_to=date_to, rolling=rolling, max_points=max_points, since=since, columnar=columnar or media_type == ARROW)
+        return encode(data, media_type, status_code=210, etag=etag, cursor=cursor)
     except Exception as e:
-        raise HTTPException(status_code=404, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=404, detail=str(e))
+
+@router.get(f"/{VERSION}/{DESCRIPTIVE}/invoices-amount/granularities/", status_code=210)
+async def get_invoices_amount_granularities(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("invoices",)))], granularities: Annotated[list[str], Query()] = ["day", "week", "month", "quarter", "year"], showzeros: bool = False, cumulative: bool = False, date_from: Annotated[date | None, Query(alias="from")] = None, date_to: Annotated[date | None, Query(alias="to")] = None, max_points: int | None = None, since: str | None = None, columnar: bool = False, accept: Annotated[str | None, Header()] = None):
+    """
+    Get the invoices per day, ISO week, month, quarter and year in one call, the data is only collected once.
+
+    **Args:**
+    - token (str)
+    - granularities (list, optional): Any of day, week, month, quarter and year, e.g. ?granularities=day&granularities=week. Defaults to all of them.
+    - showzeros (bool, optional): If True, the data will show the buckets with no invoices. Defaults to False.
+    - cumulative (bool, optional): If True, cumulative growth is calculated. Defaults to False.
+    - from (date, optional): First day to consider, e.g. 2024-01-01. Defaults to None, which means no lower bound.
+    - to (date, optional): Last day to consider, inclusive. Defaults to None, which means up to today.
+    - max_points (int, optional): If set, every series is reduced to at most this many buckets, keeping the first and the last one and the lowest and highest of the buckets in between. Defaults to None, which means all buckets.
+    - since (str, optional): Cursor of an earlier response, every response sends its own as the X-Cursor header, e.g. "2024-05-03:1520". If set, delta is added to the result, and if no earlier bucket changed since, only the buckets from the one of the cursor on are returned and delta is True, buckets that left a last_days window are not listed. Defaults to None, which means all buckets.
+    - columnar (bool, optional): If True, every series is returned as parallel arrays instead of a dictionary per bucket, e.g. {"start": "2024-01-01", "freq": "D", "values": [3, 0, 5], "cumulative": [3, 3, 8]}. "labels" lists the buckets if they are not consecutive. Defaults to False.
+    - Accept (header, optional): application/json, application/msgpack or application/vnd.apache.arrow.stream, Arrow IPC streams are always columnar with one row per bucket. Defaults to application/json.
+
+    **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
+    - HTTPException: If no data is found, it will raise a 404 error.
+    - HTTPException: If there is an error, it will raise a 400 error.
+
+    **Returns:**
+    - dict: The amount and cumulative amount per granularity.
+        Example: {
+            "week": {"amount": {"2024-W01": 100, "2024-W02": 120}, "cumulative_amount": {}},
+            "quarter": {"amount": {"2024-Q1": 1500}, "cumulative_amount": {}},
+            "typeofgraph": "line"
+        }
+    """
+    media_type = negotiate(accept)
+    try:
+        data, cursor = await crud.get_invoices_amount_granularities(granularities=granularities, showzeros=showzeros, cumulative=cumulative, date_from=date_from, date_to=date_to, max_points=max_points, since=since, columnar=columnar or media_type == ARROW)
+        return encode(data, media_type, status_code=210, etag=etag, cursor=cursor)
+    except Exception as e:
+        if e == "No data found":
+            raise HTTPException(status_code=404, detail=str(e))
+        else:
+            raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
@@ -4,12 +4,13 @@ from typing import Annotated
 from crud import crud
 from api.constants import VERSION, DIAGNOSTIC
 from api.auth import is_token_valid
+from api.conditional import ConditionalRequest
 
 
 router = APIRouter()
 
 @router.get(f"/{VERSION}/{DIAGNOSTIC}/products-orders-correlation/", status_code=211)
-async def get_products_orders_correlation(token: Annotated[str, Depends(is_token_valid)]):
+async def get_products_orders_correlation(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("orders", "ordersProducts", "products", "customers")))]):
     """
     Get the correlation between products and orders.
 
@@ -17,6 +18,7 @@ async def get_products_orders_correlation(token: Annotated[str, Depends(is_token
     - token (str)
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If there is an error, it will raise a 400 error.
 
     **Returns:**
@@ -30,7 +32,7 @@ async def get_products_orders_correlation(token: Annotated[str, Depends(is_token
 
 
 @router.get(f"/{VERSION}/{DIAGNOSTIC}/products-orders-correlation/change-price", status_code=211)
-async def get_changing_price_orders_correlation(token: Annotated[str, Depends(is_token_valid)], price_percentage: float = 0.1, n_random: int = 0):
+async def get_changing_price_orders_correlation(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("orders", "ordersProducts", "products", "customers"), skip=lambda request: request.query_params.get("n_random", "0") not in ("0", "")))], price_percentage: float = 0.1, n_random: int = 0):
     """
     Get the correlation between products and orders when the price changes.
 
@@ -40,6 +42,7 @@ async def get_changing_price_orders_correlation(token: Annotated[str, Depends(is
     - n_random (int, optional): The amount of random products to show. Defaults to 0.
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If there is an error, it will raise a 404 error.
 
     **Returns:**
@@ -53,7 +56,7 @@ async def get_changing_price_orders_correlation(token: Annotated[str, Depends(is
     
 
 @router.get(f"/{VERSION}/{DIAGNOSTIC}/items-bought-correlation/", status_code=211)
-async def get_items_bought_correlation(productId: str, amount_combined_products: int):
+async def get_items_bought_correlation(productId: str, amount_combined_products: int, etag: Annotated[str | None, Depends(ConditionalRequest(("ordersProducts", "products")))]):
     """
     Get the items which are bought together.
 
@@ -62,6 +65,7 @@ async def get_items_bought_correlation(productId: str, amount_combined_products:
     - amount_combined_products (int)
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If there is an error, it will raise a 404 error.
 
     **Returns:**
@@ -0,0 +1,120 @@
+from fastapi import Response
+from datetime import date
+from decimal import Decimal
+import json
+import numpy as np
+import orjson
+
+from DataAnalysis.descriptive.dependencies import columnLabels
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+ARROW = "application/vnd.apache.arrow.stream"
+# Media types of the Accept header the time-series endpoints can be served as, application/x-msgpack is the older name of MessagePack
+MEDIA_TYPES = {JSON: JSON, MSGPACK: MSGPACK, "application/x-msgpack": MSGPACK, ARROW: ARROW}
+
+def negotiate(accept: str | None) -> str:
+    """
+    Picks the media type of the response from the Accept header, the supported one of the highest quality and the
+    first one on ties
+
+    Args:
+        accept (str | None): Accept header of the request
+
+    Returns:
+        str: One of JSON, MSGPACK and ARROW, JSON if the header is missing or none of them is accepted
+    """
+    if not accept:
+        return JSON
+
+    accepted = []
+    for position, part in enumerate(accept.split(",")):
+        media_type, *parameters = [i.strip() for i in part.split(";")]
+        quality = 1.0
+        for parameter in parameters:
+            name, _, value = parameter.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+
+        if quality > 0 and media_type.lower() in MEDIA_TYPES:
+            accepted.append((-quality, position, MEDIA_TYPES[media_type.lower()]))
+
+    return min(accepted)[2] if accepted else JSON
+
+def encode(data: dict, media_type: str, status_code: int = 200, etag: str | None = None, cursor: str | None = None) -> Response:
+    """
+    Serializes a result as the negotiated media type. JSON is written by orjson instead of the encoder of FastAPI,
+    which walks the whole result in Python first. Arrow IPC streams need a columnar result.
+
+    Args:
+        data (dict): Result of the endpoint
+        media_type (str): One of JSON, MSGPACK and ARROW
+        status_code (int, optional): Status code of the response. Defaults to 200.
+        etag (str, optional): ETag of the response. Defaults to None.
+        cursor (str, optional): Cursor of the daily aggregate of a growth result, sent as the X-Cursor header. Defaults to None.
+
+    Returns:
+        Response: Response with the serialized result
+    """
+    if media_type == MSGPACK:
+        import msgpack # Imported on first use, most clients ask for JSON
+        content = msgpack.packb(data, default=_default)
+    elif media_type == ARROW:
+        content = _arrow(data)
+    else:
+        content = orjson.dumps(data, default=_default, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY)
+
+    headers = {"Vary": "Accept"}
+    if etag is not None:
+        headers["ETag"] = etag
+    if cursor is not None:
+        headers["X-Cursor"] = cursor
+    return Response(content=content, status_code=status_code, media_type=media_type, headers=headers)
+
+def _default(value):
+    """
+    Converts the values neither orjson nor MessagePack serialize like FastAPI does
+    """
+    if isinstance(value, date):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Type is not serializable: {type(value).__name__}")
+
+def _arrow(data: dict) -> bytes:
+    """
+    Writes a columnar result as an Arrow IPC stream with one row per bucket. Nested granularities are stacked with a
+    granularity column, moving windows become rolling_<window>_<measure> columns and the other values of the result
+    are kept in the schema metadata.
+    """
+    import pyarrow as pa # Imported on first use, most clients ask for JSON
+
+    series = {None: data} if "freq" in data else {name: item for name, item in data.items() if isinstance(item, dict) and "freq" in item}
+
+    tables = []
+    for granularity, columns in series.items():
+        table = {"bucket": columnLabels(columns)}
+        for name, values in columns.items():
+            if name == "rolling":
+                table.update((f"rolling_{window}_{measure}", values) for window, measures in values.items() for measure, values in measures.items())
+            elif isinstance(values, list) and name != "labels":
+                table[name] = values
+        if granularity is not None:
+            table["granularity"] = [granularity] * len(table["bucket"])
+        tables.append(pa.table(table))
+
+    table = pa.concat_tables(tables, promote_options="permissive")
+    metadata = {name: json.dumps(value, default=_default) for name, value in data.items() if name not in series and not isinstance(value, (dict, list))}
+    table = table.replace_schema_metadata(metadata)
+
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_stream(sink, table.schema) as writer:
+        writer.write_table(table)
+    return sink.getvalue().to_pybytes()
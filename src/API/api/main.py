@@ -1,11 +1,26 @@
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
-from api import descriptive, diagnostic, predictive, auth
+from api import descriptive, diagnostic, predictive, auth, metrics
+
+from DataAnalysis.dependencies import session_scope
+from DataAnalysis.db.session import SessionLocal, engine
+from DataAnalysis.db.rollups import RollupRefresher, createRollupTables
 
 
+# The rollups are refreshed in the background while the API runs, requests only read them
+rollup_refresher = RollupRefresher(SessionLocal)
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    createRollupTables(engine)
+    rollup_refresher.start()
+    yield
+    rollup_refresher.stop()
+
+app = FastAPI(lifespan=lifespan)
 
 app.add_middleware(
     CORSMiddleware,
@@ -13,10 +28,18 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "X-Cursor"],
 )
 
+# Every request shares one session, which is closed and returned to the pool when the request ends
+@app.middleware("http")
+async def db_session(request: Request, call_next):
+    with session_scope():
+        return await call_next(request)
+
 # Routers
 app.include_router(descriptive.router)
 app.include_router(diagnostic.router)
 app.include_router(predictive.router)
 app.include_router(auth.router)
+app.include_router(metrics.router)
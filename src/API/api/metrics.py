@@ -0,0 +1,112 @@
+from fastapi import APIRouter, Depends
+from typing import Annotated
+
+from crud import crud
+from api.constants import VERSION, METRICS
+
+from api.auth import is_token_valid
+
+
+router = APIRouter()
+
+
+@router.get(f"/{VERSION}/{METRICS}/pool", status_code=200)
+async def get_pool_metrics(token: Annotated[str, Depends(is_token_valid)]):
+    """
+    Get the statistics of the database connection pool.
+
+    **Args:**
+    - token (str)
+
+    **Returns:**
+    - dict: The state of the pool and the checkout statistics since the start of the API.
+        Example: {
+            "size": 10,
+            "checked_in": 2,
+            "checked_out": 1,
+            "overflow": 0,
+            "max_overflow": 20,
+            "checkouts": 120,
+            "waits": 0,
+            "timeouts": 0,
+            "wait_time_total_ms": 0.0,
+            "wait_time_max_ms": 0.0,
+            "checkout_latency_histogram": {"<=1ms": 118, "<=5ms": 2, ...}
+        }
+    """
+    return await crud.get_pool_metrics()
+
+@router.get(f"/{VERSION}/{METRICS}/replica", status_code=200)
+async def get_replica_metrics(token: Annotated[str, Depends(is_token_valid)]):
+    """
+    Get the state of the read replica the analyses read from.
+
+    **Args:**
+    - token (str)
+
+    **Raises:**
+    - HTTPException: If no read replica is configured, it will raise a 404 error.
+
+    **Returns:**
+    - dict: Whether the replica is used, its lag in seconds, the error of the last check and the statistics of its connection pool.
+        Example: {
+            "available": true,
+            "lag": 0.4,
+            "max_lag": 30.0,
+            "error": null,
+            "pool": {"size": 10, "checked_in": 1, "checked_out": 0, ...}
+        }
+    """
+    return await crud.get_replica_metrics()
+
+@router.get(f"/{VERSION}/{METRICS}/queries", status_code=200)
+async def get_query_metrics(token: Annotated[str, Depends(is_token_valid)]):
+    """
+    Get the statistics of the database queries by the repository method that issued them, the methods spending the most time in the database first.
+    Queries slower than SLOW_QUERY_THRESHOLD_MS are also written with their parameters to the slow query log.
+
+    **Args:**
+    - token (str)
+
+    **Returns:**
+    - list: The query statistics since the start of the API.
+        Example: [
+            {
+                "tag": "RollupRepository.getBuckets",
+                "queries": 12,
+                "errors": 0,
+                "slow_queries": 0,
+                "total_ms": 48.2,
+                "max_ms": 15.4,
+                "avg_ms": 4.017,
+                "rows": 8736,
+                "bytes": 663936
+            },
+            ...
+        ]
+    """
+    return await crud.get_query_metrics()
+
+@router.get(f"/{VERSION}/{METRICS}/cache", status_code=200)
+async def get_cache_metrics(token: Annotated[str, Depends(is_token_valid)]):
+    """
+    Get the statistics of the result cache of the descriptive and diagnostic endpoints.
+    Results are cached per analysis and parameters until the watermark of the tables they are computed from changes.
+
+    **Args:**
+    - token (str)
+
+    **Returns:**
+    - dict: The state of the cache and its hits and misses since the start of the API.
+        Example: {
+            "entries": 42,
+            "bytes": 1048576,
+            "max_bytes": 67108864,
+            "hits": 950,
+            "misses": 50,
+            "hit_rate": 0.95,
+            "evictions": 0,
+            "invalidations": 8
+        }
+    """
+    return await crud.get_cache_metrics()
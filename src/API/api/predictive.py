@@ -2,6 +2,7 @@ from fastapi import APIRouter, Depends
 from typing import Annotated
 
 from api.auth import is_token_valid
+from api.conditional import ConditionalRequest
 
 from crud import crud
 from api.constants import VERSION, PREDICTIVE
@@ -9,7 +10,7 @@ from api.constants import VERSION, PREDICTIVE
 router = APIRouter()
 
 @router.get(f"/{VERSION}/{PREDICTIVE}/customers-growth/", status_code=212)
-async def get_customers_growth(token: Annotated[str, Depends(is_token_valid)]):
+async def get_customers_growth(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("customers",), "CustomerGrowth"))]):
     """
     Get the customers growth prediction.
 
@@ -17,6 +18,7 @@ async def get_customers_growth(token: Annotated[str, Depends(is_token_valid)]):
     - token (str)
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If there is an error, it will raise a 400 error.
 
     **Returns:**
@@ -35,7 +37,7 @@ async def get_customers_growth(token: Annotated[str, Depends(is_token_valid)]):
     return data
 
 @router.get(f"/{VERSION}/{PREDICTIVE}/customers-growth/month/", status_code=212)
-async def get_customers_growth_month(token: Annotated[str, Depends(is_token_valid)]):
+async def get_customers_growth_month(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("customers",), "CustomerGrowthMonthly"))]):
     """
     Get the customers growth prediction.
 
@@ -43,6 +45,7 @@ async def get_customers_growth_month(token: Annotated[str, Depends(is_token_vali
     - token (str)
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If there is an error, it will raise a 400 error.
 
     **Returns:**
@@ -58,7 +61,7 @@ async def get_customers_growth_month(token: Annotated[str, Depends(is_token_vali
     return data
 
 @router.get(f"/{VERSION}/{PREDICTIVE}/cumulative-customers-growth/", status_code=212, deprecated=True)
-async def get_cumulative_customers_growth(token: Annotated[str, Depends(is_token_valid)], one_day: bool = False ,seven_days: bool = False, month: bool = False, year: bool = False):
+async def get_cumulative_customers_growth(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("customers",), "CumulativeCustomerGrowth"))], one_day: bool = False ,seven_days: bool = False, month: bool = False, year: bool = False):
     """
     Get the cumulative customers growth prediction.
 
@@ -70,6 +73,7 @@ async def get_cumulative_customers_growth(token: Annotated[str, Depends(is_token
     - year (bool, optional): If True, the data will be predicted by year. Defaults to False.
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If there is an error, it will raise a 400 error.
 
     **Returns:**
@@ -81,7 +85,7 @@ async def get_cumulative_customers_growth(token: Annotated[str, Depends(is_token
     return data
 
 @router.get(f"/{VERSION}/{PREDICTIVE}/orders-growth/", status_code=212)
-async def get_orders_growth(token: Annotated[str, Depends(is_token_valid)]):
+async def get_orders_growth(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("orders",), "OrdersGrowth"))]):
     """
     Get the orders growth prediction.
 
@@ -89,6 +93,7 @@ async def get_orders_growth(token: Annotated[str, Depends(is_token_valid)]):
     - token (str)
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If there is an error, it will raise a 400 error.
 
     **Returns:**
@@ -109,7 +114,7 @@ async def get_orders_growth(token: Annotated[str, Depends(is_token_valid)]):
     return data
 
 @router.get(f"/{VERSION}/{PREDICTIVE}/orders-growth/month/", status_code=212)
-async def get_orders_growth_month(token: Annotated[str, Depends(is_token_valid)]):
+async def get_orders_growth_month(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("orders",), "OrdersGrowthMonthly"))]):
     """
     Get the orders growth prediction.
 
@@ -117,6 +122,7 @@ async def get_orders_growth_month(token: Annotated[str, Depends(is_token_valid)]
     - token (str)
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If there is an error, it will raise a 400 error.
 
     **Returns:**
@@ -132,7 +138,7 @@ async def get_orders_growth_month(token: Annotated[str, Depends(is_token_valid)]
     return data
 
 @router.get(f"/{VERSION}/{PREDICTIVE}/cumulative-orders-growth/", status_code=212, deprecated=True)
-async def get_cumulative_orders_growth(token: Annotated[str, Depends(is_token_valid)], one_day: bool = False ,seven_days: bool = False, month: bool = False, year: bool = False):
+async def get_cumulative_orders_growth(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("orders",), "CumulativeOrdersGrowth"))], one_day: bool = False ,seven_days: bool = False, month: bool = False, year: bool = False):
     """
     Get the cumulative orders growth prediction.
 
@@ -144,6 +150,7 @@ async def get_cumulative_orders_growth(token: Annotated[str, Depends(is_token_va
     - year (bool, optional): If True, the data will be predicted by year. Defaults to False.
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If there is an error, it will raise a 400 error.
 
     **Returns:**
@@ -155,7 +162,7 @@ async def get_cumulative_orders_growth(token: Annotated[str, Depends(is_token_va
     return data
 
 @router.get(f"/{VERSION}/{PREDICTIVE}/route-classifier/", status_code=212)
-async def get_route_classifier(token: Annotated[str, Depends(is_token_valid)], latitude: float, longitude: float):
+async def get_route_classifier(token: Annotated[str, Depends(is_token_valid)], etag: Annotated[str | None, Depends(ConditionalRequest(("routes", "routesOrders", "orders", "customers"), "RouteClassifier"))], latitude: float, longitude: float):
     """
     Get the route classifier data.
 
@@ -163,6 +170,7 @@ async def get_route_classifier(token: Annotated[str, Depends(is_token_valid)], l
     - token (str)
 
     **Raises:**
+    - HTTPException: If the If-None-Match header holds the ETag of the current data, it will answer with 304 Not Modified without running the analysis.
     - HTTPException: If there is an error, it will raise a 400 error.
 
     **Returns:**
@@ -1,4 +1,5 @@
 from fastapi import HTTPException
+from fastapi.concurrency import run_in_threadpool
 
 from DataAnalysis.descriptive import CustomerSignup, EmployeeAmount, ProductsAmount, ProductsMostlyBought, RoutesAmount, OrdersAmount, InvoicesAmount
 
@@ -7,7 +8,13 @@ from DataAnalysis.diagnostic import ProductOrdersCorrelation, ItemBoughtCorrelat
 from DataAnalysis.predictive.PredictiveEngine.DataPredictor import DataPredictor as DataPredictorPredictiveEngine
 
 from DataAnalysis.db.models.Auth import AuthRepository
-from DataAnalysis.dependencies import get_db
+from DataAnalysis.dependencies import session_scope
+from DataAnalysis.db.session import get_pool_stats, get_replica_stats
+from DataAnalysis.db.instrumentation import query_stats
+from DataAnalysis.db.cache import getCached, getWatermark, getVersion, result_cache
+from DataAnalysis.descriptive.Calendar import GRANULARITIES
+from DataAnalysis.descriptive.dependencies import downsample, changedSince, toColumnar
+from DataAnalysis.descriptive.DailyAggregate import getAggregate
 
 from DataAnalysis.predictive.RouteClassifier.DataPredictor import DataPredictor as RouteClassifierDataPredictor
 
@@ -16,24 +23,37 @@ from api.auth import generate_jwt_token
 from dotenv import load_dotenv
 from os import getenv
 import requests
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 load_dotenv()
 
 
-####################### DESCRIPTIVE #######################
+# The analyses are CPU bound and use the sync session, they run in the threadpool so the event loop keeps serving other requests
 
-async def get_customers_signup(last_days: int = 0, month: bool = False, year: bool = False, showzeros: bool = False, percentage: bool = False, cumulative: bool = False):
-    if month and year:
-        raise HTTPException(status_code=400, detail="Invalid parameters: month and year cannot be True at the same time")
-    if last_days < 0:
-        raise HTTPException(status_code=400, detail="Invalid parameters: last_days cannot be negative")
-    if month and last_days > 0:
-        raise HTTPException(status_code=400, detail="Invalid parameters: month cannot be True if last_days is greater than 0")
-    if year and last_days > 0:
-        raise HTTPException(status_code=400, detail="Invalid parameters: year cannot be True if last_days is greater than 0")
-    return CustomerSignup.CustomerSignup().perform(last_days=last_days, month=month, year=year, showzeros=showzeros, percentage=percentage, cumulative=cumulative)
+async def cached(name: str, tables: tuple[str, ...], compute, **parameters):
+    """
+    Runs an analysis in the threadpool, its result is taken from the result cache while the watermark of its tables is unchanged
+    """
+    return await run_in_threadpool(lambda: getCached(name, tables, parameters, lambda: compute(**parameters)))
+
+async def get_data_version(tables: tuple[str, ...], model: str | None = None) -> tuple:
+    """
+    Gets the version of the data an analysis is computed from: the watermark of its tables and the run of its model if it predicts
+    """
+    def read():
+        version = getWatermark(tables)
+        if model is not None:
+            predictor = RouteClassifierDataPredictor if model == "RouteClassifier" else DataPredictorPredictiveEngine.DataPredictor
+            version += getVersion(("model", model), lambda: (predictor(model).get_model_version(),))
+        return version
+
+    return await run_in_threadpool(read)
 
-async def get_orders_amount(last_days: int = 0, month: bool = False, year: bool = False, showzeros: bool = False, percentage: bool = False, cumulative: bool = False):
+####################### DESCRIPTIVE #######################
+
+def check_growth(last_days: int, month: bool, year: bool, date_from: date | None, date_to: date | None, rolling: bool, max_points: int | None) -> str:
+    """
+    Validates the parameters of the growth of the customers, orders and invoices, and gets its granularity
+    """
     if month and year:
         raise HTTPException(status_code=400, detail="Invalid parameters: month and year cannot be True at the same time")
     if last_days < 0:
@@ -42,43 +62,144 @@ async def get_orders_amount(last_days: int = 0, month: bool = False, year: bool
         raise HTTPException(status_code=400, detail="Invalid parameters: month cannot be True if last_days is greater than 0")
     if year and last_days > 0:
         raise HTTPException(status_code=400, detail="Invalid parameters: year cannot be True if last_days is greater than 0")
-    return OrdersAmount.OrdersAmount().perform(last_days=last_days, month=month, year=year, showzeros=showzeros, percentage=percentage, cumulative=cumulative)
+    check_range(date_from, date_to)
+    if rolling and (month or year):
+        raise HTTPException(status_code=400, detail="Invalid parameters: rolling is only available for the daily growth")
+    check_max_points(max_points)
+    return "month" if month else "year" if year else "day"
+
+def check_granularities(granularities: list[str], date_from: date | None, date_to: date | None, max_points: int | None) -> tuple[str, ...]:
+    """
+    Validates the parameters of the growth of several granularities, duplicates are removed
+    """
+    unknown = [i for i in granularities if i not in GRANULARITIES]
+    if not granularities or unknown:
+        raise HTTPException(status_code=400, detail=f"Invalid parameters: granularities must be any of {', '.join(GRANULARITIES)}")
+    check_range(date_from, date_to)
+    check_max_points(max_points)
+    return tuple(dict.fromkeys(granularities))
+
+def check_range(date_from: date | None, date_to: date | None) -> None:
+    """
+    Validates the days of a growth
+    """
+    if date_from is not None and date_to is not None and date_from > date_to:
+        raise HTTPException(status_code=400, detail="Invalid parameters: from cannot be after to")
+
+def check_max_points(max_points: int | None) -> None:
+    """
+    Validates the number of buckets the series are reduced to
+    """
+    if max_points is not None and max_points < 2:
+        raise HTTPException(status_code=400, detail="Invalid parameters: max_points must be at least 2")
+
+async def cached_growth(name: str, tables: tuple[str, ...], compute, rollup: str, granularity: str, since: str | None, max_points: int | None, columnar: bool, **parameters):
+    """
+    Runs a growth analysis like cached, the cursor of its daily aggregate is cached with the result. With since only the
+    buckets changed since that cursor are returned, everything if it is outdated, and delta tells which of both it is.
+    The series are reduced to max_points and converted to parallel arrays if columnar is True.
+
+    Returns:
+        tuple: The result and the cursor of its daily aggregate, which the endpoints send as the X-Cursor header
+    """
+    aggregate = getAggregate(rollup)
+    result, cursor = await cached(name, tables, lambda **parameters: (compute(**parameters), aggregate.getCursor(parameters["date_to"])), **parameters)
+
+    day = None
+    if since is not None:
+        try:
+            day = await run_in_threadpool(aggregate.getSince, since)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid parameters: since is not a valid cursor")
+    if day is not None:
+        result = changedSince(result, day, granularity)
+
+    result = downsample(result, max_points)
+    if columnar:
+        result = toColumnar(result, granularity, parameters.get("year_over_year", False), parameters.get("last_month", False))
+
+    if since is not None:
+        result = {**result, "delta": day is not None}
+    return result, cursor
+
+async def get_customers_signup(last_days: int = 0, month: bool = False, year: bool = False, showzeros: bool = False, percentage: bool = False, cumulative: bool = False, year_over_year: bool = False, last_month: bool = False, date_from: date | None = None, date_to: date | None = None, rolling: bool = False, max_points: int | None = None, since: str | None = None, columnar: bool = False):
+    granularity = check_growth(last_days, month, year, date_from, date_to, rolling, max_points)
+    return await cached_growth(
+        "CustomerSignup", ('customers',), lambda **parameters: CustomerSignup.CustomerSignup().perform(**parameters),
+        CustomerSignup.ROLLUP, granularity, since, max_points, columnar,
+        last_days=last_days, month=month, year=year, showzeros=showzeros, percentage=percentage, cumulative=cumulative,
+        year_over_year=year_over_year, last_month=last_month, date_from=date_from, date_to=date_to, rolling=rolling
+    )
+
+async def get_customers_signup_granularities(granularities: list[str], showzeros: bool = False, cumulative: bool = False, date_from: date | None = None, date_to: date | None = None, max_points: int | None = None, since: str | None = None, columnar: bool = False):
+    granularities = check_granularities(granularities, date_from, date_to, max_points)
+    return await cached_growth(
+        "CustomerSignupGranularities", ('customers',), lambda **parameters: CustomerSignup.CustomerSignup().performGranularities(**parameters),
+        CustomerSignup.ROLLUP, "day", since, max_points, columnar,
+        granularities=granularities, showzeros=showzeros, cumulative=cumulative, date_from=date_from, date_to=date_to
+    )
+
+async def get_orders_amount(last_days: int = 0, month: bool = False, year: bool = False, showzeros: bool = False, percentage: bool = False, cumulative: bool = False, year_over_year: bool = False, last_month: bool = False, date_from: date | None = None, date_to: date | None = None, rolling: bool = False, max_points: int | None = None, since: str | None = None, columnar: bool = False):
+    granularity = check_growth(last_days, month, year, date_from, date_to, rolling, max_points)
+    return await cached_growth(
+        "OrdersAmount", ('orders',), lambda **parameters: OrdersAmount.OrdersAmount().perform(**parameters),
+        OrdersAmount.ROLLUP, granularity, since, max_points, columnar,
+        last_days=last_days, month=month, year=year, showzeros=showzeros, percentage=percentage, cumulative=cumulative,
+        year_over_year=year_over_year, last_month=last_month, date_from=date_from, date_to=date_to, rolling=rolling
+    )
+
+async def get_orders_amount_granularities(granularities: list[str], showzeros: bool = False, cumulative: bool = False, date_from: date | None = None, date_to: date | None = None, max_points: int | None = None, since: str | None = None, columnar: bool = False):
+    granularities = check_granularities(granularities, date_from, date_to, max_points)
+    return await cached_growth(
+        "OrdersAmountGranularities", ('orders',), lambda **parameters: OrdersAmount.OrdersAmount().performGranularities(**parameters),
+        OrdersAmount.ROLLUP, "day", since, max_points, columnar,
+        granularities=granularities, showzeros=showzeros, cumulative=cumulative, date_from=date_from, date_to=date_to
+    )
 
 async def get_employees_amount(limit: int = 5):
     if limit < 0:
         raise HTTPException(status_code=400, detail="Invalid parameters: limit cannot be negative")
-    return EmployeeAmount.EmployeeAmount().perform(limit=limit)
+    return await cached("EmployeeAmount", ("employees", "roles"), lambda **parameters: EmployeeAmount.EmployeeAmount().perform(**parameters), limit=limit)
 
 async def get_products_amount(limit: int = 5, well_stocked: bool = False, out_of_stock: bool = False):
-    return ProductsAmount.ProductsAmount().perform(limit=limit, well_stocked=well_stocked, out_of_stock=out_of_stock)
+    return await cached("ProductsAmount", ("products",), lambda **parameters: ProductsAmount.ProductsAmount().perform(**parameters), limit=limit, well_stocked=well_stocked, out_of_stock=out_of_stock)
 
 async def get_products_mostly_bought(last_days: int = 0, month: bool = False, year: bool = False, limit: int = 5):
-    return ProductsMostlyBought.ProductsMostlyBought().perform(last_days=last_days, month=month, year=year, limit=limit)
+    return await cached("ProductsMostlyBought", ("ordersProducts", "products"), lambda **parameters: ProductsMostlyBought.ProductsMostlyBought().perform(**parameters), last_days=last_days, month=month, year=year, limit=limit)
 
 async def get_routes_amount(limit: int = 5):
-    return RoutesAmount.RoutesAmount().perform(limit=limit)
-
-async def get_invoices_amount(last_days: int = 0, month: bool = False, year: bool = False, showzeros: bool = False, percentage: bool = False, cumulative: bool = False):
-    if month and year:
-        raise HTTPException(status_code=400, detail="Invalid parameters: month and year cannot be True at the same time")
-    if last_days < 0:
-        raise HTTPException(status_code=400, detail="Invalid parameters: last_days cannot be negative")
-    if month and last_days > 0:
-        raise HTTPException(status_code=400, detail="Invalid parameters: month cannot be True if last_days is greater than 0")
-    if year and last_days > 0:
-        raise HTTPException(status_code=400, detail="Invalid parameters: year cannot be True if last_days is greater than 0")
-    return InvoicesAmount.InvoicesAmount().perform(last_days=last_days, month=month, year=year, showzeros=showzeros, percentage=percentage, cumulative=cumulative)
+    return await cached("RoutesAmount", ("routes", "routesOrders"), lambda **parameters: RoutesAmount.RoutesAmount().perform(**parameters), limit=limit)
+
+async def get_invoices_amount(last_days: int = 0, month: bool = False, year: bool = False, showzeros: bool = False, percentage: bool = False, cumulative: bool = False, year_over_year: bool = False, last_month: bool = False, date_from: date | None = None, date_to: date | None = None, rolling: bool = False, max_points: int | None = None, since: str | None = None, columnar: bool = False):
+    granularity = check_growth(last_days, month, year, date_from, date_to, rolling, max_points)
+    return await cached_growth(
+        "InvoicesAmount", ('invoices',), lambda **parameters: InvoicesAmount.InvoicesAmount().perform(**parameters),
+        InvoicesAmount.ROLLUP, granularity, since, max_points, columnar,
+        last_days=last_days, month=month, year=year, showzeros=showzeros, percentage=percentage, cumulative=cumulative,
+        year_over_year=year_over_year, last_month=last_month, date_from=date_from, date_to=date_to, rolling=rolling
+    )
+
+async def get_invoices_amount_granularities(granularities: list[str], showzeros: bool = False, cumulative: bool = False, date_from: date | None = None, date_to: date | None = None, max_points: int | None = None, since: str | None = None, columnar: bool = False):
+    granularities = check_granularities(granularities, date_from, date_to, max_points)
+    return await cached_growth(
+        "InvoicesAmountGranularities", ('invoices',), lambda **parameters: InvoicesAmount.InvoicesAmount().performGranularities(**parameters),
+        InvoicesAmount.ROLLUP, "day", since, max_points, columnar,
+        granularities=granularities, showzeros=showzeros, cumulative=cumulative, date_from=date_from, date_to=date_to
+    )
 
 ####################### DIAGNOSTIC #######################
 
 async def get_products_orders_correlation():
-    return ProductOrdersCorrelation.ProductOrdersCorrelation().perform()
+    return await cached("ProductOrdersCorrelation", ("orders", "ordersProducts", "products", "customers"), lambda: ProductOrdersCorrelation.ProductOrdersCorrelation().perform())
 
 async def get_changing_price_orders_correlation(price_percentage: float = 0.1, n_random: int = 0):
-    return ProductOrdersCorrelation.ProductOrdersCorrelation().getChangingPriceOrdersCorrValue(price_percentage=price_percentage, n_random=n_random)
+    if n_random > 0:
+        # Random products are picked on every call, the result is not cached
+        return await run_in_threadpool(lambda: ProductOrdersCorrelation.ProductOrdersCorrelation().getChangingPriceOrdersCorrValue(price_percentage=price_percentage, n_random=n_random))
+    return await cached("ChangingPriceOrdersCorrelation", ("orders", "ordersProducts", "products", "customers"), lambda **parameters: ProductOrdersCorrelation.ProductOrdersCorrelation().getChangingPriceOrdersCorrValue(**parameters), price_percentage=price_percentage, n_random=n_random)
 
 async def get_items_bought_correlation(productId: str, amount_combined_products: int):
-    return ItemBoughtCorrelation.ItemBoughtCorrelation().perform(productId=productId, combination_product_amount=amount_combined_products)
+    return await cached("ItemBoughtCorrelation", ("ordersProducts", "products"), lambda **parameters: ItemBoughtCorrelation.ItemBoughtCorrelation().perform(**parameters), productId=productId, combination_product_amount=amount_combined_products)
 
 
 ####################### PREDICTIVE #######################
@@ -86,13 +207,13 @@ async def get_items_bought_correlation(productId: str, amount_combined_products:
 async def get_customers_growth():
     try:
 
-        return DataPredictorPredictiveEngine.DataPredictor("CustomerGrowth").predict()
+        return await run_in_threadpool(lambda: DataPredictorPredictiveEngine.DataPredictor("CustomerGrowth").predict())
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
     
 async def get_customers_growth_month():
     try:
-        return DataPredictorPredictiveEngine.DataPredictor("CustomerGrowthMonthly", month=True).predict()
+        return await run_in_threadpool(lambda: DataPredictorPredictiveEngine.DataPredictor("CustomerGrowthMonthly", month=True).predict())
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -110,20 +231,20 @@ async def get_cumulative_customers_growth(one_day: bool = False, seven_days: boo
         else: 
             raise HTTPException(status_code=400, detail="Invalid parameters")
 
-        return DataPredictorPredictiveEngine.DataPredictor("CumulativeCustomerGrowth").predict("CumulativeCustomerGrowth", option)
+        return await run_in_threadpool(lambda: DataPredictorPredictiveEngine.DataPredictor("CumulativeCustomerGrowth").predict("CumulativeCustomerGrowth", option))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 async def get_orders_growth():
     try:
 
-        return DataPredictorPredictiveEngine.DataPredictor("OrdersGrowth").predict()
+        return await run_in_threadpool(lambda: DataPredictorPredictiveEngine.DataPredictor("OrdersGrowth").predict())
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
     
 async def get_orders_growth_month():
     try:
-        return DataPredictorPredictiveEngine.DataPredictor("OrdersGrowthMonthly", month=True).predict()
+        return await run_in_threadpool(lambda: DataPredictorPredictiveEngine.DataPredictor("OrdersGrowthMonthly", month=True).predict())
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -141,12 +262,12 @@ async def get_cumulative_orders_growth(one_day: bool = False, seven_days: bool =
         else: 
             raise HTTPException(status_code=400, detail="Invalid parameters")
 
-        return DataPredictorPredictiveEngine.DataPredictor("CumulativeOrdersGrowth").predict("CumulativeOrdersGrowth", option)
+        return await run_in_threadpool(lambda: DataPredictorPredictiveEngine.DataPredictor("CumulativeOrdersGrowth").predict("CumulativeOrdersGrowth", option))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 async def authenticate(email:str, password: str):
-    res = AuthRepository(session=next(get_db()), email=email, password=password).get()
+    res = await run_in_threadpool(lambda: _get_user(email, password))
     if res is None:
         raise HTTPException(status_code=401, detail="Wrong credentials")
     if len(res) == 0:
@@ -156,9 +277,28 @@ async def authenticate(email:str, password: str):
     else:
         raise HTTPException(status_code=401, detail="Not authorized")
 
+def _get_user(email: str, password: str):
+    with session_scope() as session:
+        return AuthRepository(session=session, email=email, password=password).get()
 
 async def get_routes_classifier(latitude: float, longitude: float):
     try:
-        return RouteClassifierDataPredictor("RouteClassifier").predict((latitude, longitude))
+        return await run_in_threadpool(lambda: RouteClassifierDataPredictor("RouteClassifier").predict((latitude, longitude)))
     except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=400, detail=str(e))
+####################### METRICS #######################
+
+async def get_pool_metrics():
+    return get_pool_stats()
+
+async def get_replica_metrics():
+    stats = get_replica_stats()
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No read replica configured")
+    return stats
+
+async def get_query_metrics():
+    return query_stats.get()
+
+async def get_cache_metrics():
+    return result_cache.stats()
@@ -0,0 +1,115 @@
+import pytest
+import os,sys
+import asyncio
+import logging
+from fastapi import HTTPException, Request, Response
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from api import conditional
+from api.conditional import ConditionalRequest, makeETag, matches
+
+def mock_request(query_string: bytes = b"last_days=7"):
+    '''
+    GET request of the orders amount endpoint
+    '''
+    return Request({
+        "type": "http", "method": "GET", "scheme": "http", "server": ("testserver", 80), "root_path": "",
+        "path": "/orders-amount/", "query_string": query_string, "headers": [(b"accept", b"application/json")],
+    })
+
+def mock_version(*versions):
+    '''
+    get_data_version answering the given versions one after the other
+    '''
+    versions = iter(versions)
+    async def get_data_version(tables, model=None):
+        return next(versions)
+    return get_data_version
+
+###################### makeETag Function ######################
+
+def test01_makeETagChangesWithVersion():
+    '''
+    Test case to check that makeETag gets a new ETag if the version or the query changes
+
+    Test01:
+    The same request with two versions and another query with the same version
+    '''
+    etag = makeETag(mock_request(), (1,))
+
+    assert etag == makeETag(mock_request(), (1,))
+    assert etag.startswith('"') and etag.endswith('"')
+    assert makeETag(mock_request(), (2,)) != etag
+    assert makeETag(mock_request(b"last_days=30"), (1,)) != etag
+
+###################### matches Function ######################
+
+def test02_matches():
+    '''
+    Test case to check the matches function
+
+    Test02:
+    Strong, weak and listed tags, * and another tag
+    '''
+    etag = '"abc"'
+
+    assert matches('"abc"', etag)
+    assert matches('W/"abc"', etag)
+    assert matches('"xyz", W/"abc"', etag)
+    assert matches('*', etag)
+    assert not matches('"xyz"', etag)
+
+###################### ConditionalRequest Class ######################
+
+def test03_conditionalRequestNotModified(monkeypatch):
+    '''
+    Test case to check that ConditionalRequest answers with 304 if the If-None-Match header holds the ETag
+
+    Test03:
+    If-None-Match with the ETag of the current version, strong and weak
+    '''
+    monkeypatch.setattr(conditional.crud, "get_data_version", mock_version((1,), (1,)))
+    etag = makeETag(mock_request(), (1,))
+
+    for if_none_match in (etag, f"W/{etag}"):
+        with pytest.raises(HTTPException) as e:
+            asyncio.run(ConditionalRequest(("orders",))(mock_request(), Response(), if_none_match))
+
+        assert e.value.status_code == 304
+        assert e.value.headers["ETag"] == etag
+
+def test04_conditionalRequestChangedVersion(monkeypatch):
+    '''
+    Test case to check that ConditionalRequest answers with a new ETag once the version changed
+
+    Test04:
+    If-None-Match with the ETag of an earlier version
+    '''
+    monkeypatch.setattr(conditional.crud, "get_data_version", mock_version((2,)))
+    response = Response()
+
+    etag = asyncio.run(ConditionalRequest(("orders",))(mock_request(), response, makeETag(mock_request(), (1,))))
+
+    assert etag == makeETag(mock_request(), (2,))
+    assert response.headers["ETag"] == etag
+
+def test05_conditionalRequestVersionError(monkeypatch, caplog):
+    '''
+    Test case to check that ConditionalRequest answers without an ETag if the version cannot be read
+
+    Test05:
+    get_data_version raises
+    '''
+    async def get_data_version(tables, model=None):
+        raise ConnectionError("Database not reachable")
+
+    monkeypatch.setattr(conditional.crud, "get_data_version", get_data_version)
+    response = Response()
+
+    with caplog.at_level(logging.WARNING, logger="api.conditional"):
+        etag = asyncio.run(ConditionalRequest(("orders",))(mock_request(), response, '"abc"'))
+
+    assert etag is None
+    assert "ETag" not in response.headers
+    assert "Error while reading the data version of /orders-amount/" in caplog.text
@@ -1,5 +1,28 @@
-from DataAnalysis.dependencies import get_db
+from weakref import finalize
+
+from DataAnalysis.db.session import SessionLocal
+from DataAnalysis.dependencies import get_session
 
 class DataCollector:
     def __init__(self) -> None:
-        self.db = next(get_db())
+        self.db = get_session()
+        if self.db is None:
+            # No scope is open, e.g. when training a model. The collector owns its session then and closes it
+            # as soon as it is closed or garbage collected.
+            self.db = SessionLocal()
+            self._finalizer = finalize(self, self.db.close)
+        else:
+            self._finalizer = None
+
+    def close(self) -> None:
+        """
+        Closes the session if the collector owns it, sessions of a scope are closed when the scope ends
+        """
+        if self._finalizer is not None:
+            self._finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
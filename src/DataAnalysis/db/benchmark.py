@@ -0,0 +1,100 @@
+import sys
+from collections.abc import Callable
+from time import perf_counter
+
+from sqlalchemy import func, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from DataAnalysis.db.model import Route, Employee, Role, Address, Order, Customer, routesOrders
+from DataAnalysis.db.models.RoutesAmount import ROUTES_AMOUNT
+from DataAnalysis.db.models.EmployeeAmount import EMPLOYEE_AMOUNT
+from DataAnalysis.db.models.RouteClassifier import ROUTE_COORDINATES
+from DataAnalysis.db.models.Auth import EMPLOYEE_ROLE
+
+# Per query: the statement as the repository built it on every call, the statement built once at import and its parameters
+STATEMENTS: dict[str, tuple[Callable[[], object], object, dict]] = {
+    "RoutesAmountRepository.get": (
+        lambda: select(Route.name, func.count(routesOrders.c.orderId).label("order_count"))
+            .join(routesOrders, Route.routeId == routesOrders.c.routeId)
+            .group_by(Route.name)
+            .order_by(func.count(routesOrders.c.orderId).desc())
+            .limit(5),
+        ROUTES_AMOUNT, {"limit": 5},
+    ),
+    "EmployeeAmountRepository.get": (
+        lambda: select(Role.name, func.count(Employee.employeeId).label("employee_count"))
+            .join(Employee, Role.roleId == Employee.roleId)
+            .group_by(Role.name)
+            .order_by(func.count(Employee.employeeId).desc())
+            .limit(5),
+        EMPLOYEE_AMOUNT, {"limit": 5},
+    ),
+    "RouteClassifierRepository.get": (
+        lambda: select(routesOrders.c.routeId, Address.latitude, Address.longitude)
+            .join(Order, routesOrders.c.orderId == Order.orderId)
+            .join(Customer, Order.customerReference == Customer.customerReference)
+            .join(Address, Customer.addressId == Address.addressId),
+        ROUTE_COORDINATES, {},
+    ),
+    "AuthRepository.get": (
+        lambda: select(Employee.email, Role.name)
+            .join(Role, Employee.roleId == Role.roleId)
+            .filter(Employee.email == "benchmark@example.com", Employee.password == "benchmark"),
+        EMPLOYEE_ROLE, {"email": "benchmark@example.com", "password": "benchmark"},
+    ),
+}
+
+def benchmark(engine: Engine, iterations: int = 1000) -> list[dict]:
+    """
+    Measures the time per call of the repository statements in three ways: rebuilt on every call without the compiled
+    cache, rebuilt on every call with the compiled cache and built once at import with the compiled cache. The
+    database time is the same in all three, so the differences are the overhead of building and compiling.
+
+    Args:
+        engine (Engine): Engine of the database, the statements run against its tables
+        iterations (int, optional): Calls per statement and way. Defaults to 1000.
+
+    Returns:
+        list: Per query the microseconds per call of every way
+    """
+    report = []
+    with Session(engine) as session:
+        for name, (build, statement, parameters) in STATEMENTS.items():
+            uncached = {"compiled_cache": None}
+            try:
+                report.append({
+                    "query": name,
+                    "rebuilt_uncached_us": _timePerCall(lambda: session.execute(build(), execution_options=uncached).all(), iterations),
+                    "rebuilt_cached_us": _timePerCall(lambda: session.execute(build()).all(), iterations),
+                    "built_once_cached_us": _timePerCall(lambda: session.execute(statement, parameters).all(), iterations),
+                })
+            except Exception as e:
+                session.rollback()
+                report.append({"query": name, "error": str(e)})
+
+    return report
+
+def _timePerCall(call: Callable[[], object], iterations: int) -> float:
+    """
+    Gets the microseconds per call after one warm-up call
+    """
+    call()
+    start = perf_counter()
+    for _ in range(iterations):
+        call()
+    return round((perf_counter() - start) / iterations * 1e6, 1)
+
+
+if __name__ == "__main__":
+    from DataAnalysis.db.session import engine
+
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    for entry in benchmark(engine, iterations):
+        if "error" in entry:
+            print(f"{entry['query']}: Error while benchmarking: {entry['error']}")
+            continue
+        print(
+            f"{entry['query']}: rebuilt without cache {entry['rebuilt_uncached_us']} us, "
+            f"rebuilt with cache {entry['rebuilt_cached_us']} us, built once {entry['built_once_cached_us']} us"
+        )
@@ -0,0 +1,214 @@
+import sys
+from collections import OrderedDict
+from collections.abc import Callable
+from datetime import date
+from threading import Lock
+from time import monotonic
+from os import getenv
+
+from DataAnalysis.db.models.Watermark import WatermarkRepository
+from DataAnalysis.dependencies import session_scope
+
+from dotenv import load_dotenv
+load_dotenv()
+
+# Bytes the cached results take up at most, the least recently used ones are evicted first
+RESULT_CACHE_MAX_BYTES = int(getenv("RESULT_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+# Number of cached results at most
+RESULT_CACHE_MAX_ENTRIES = int(getenv("RESULT_CACHE_MAX_ENTRIES", 1024))
+# Seconds a result is used at most, also picks up changes the watermarks do not see
+RESULT_CACHE_TTL = float(getenv("RESULT_CACHE_TTL", 300))
+# Seconds between two watermark checks of the same tables, hits within this time do not query the database
+RESULT_CACHE_CHECK_INTERVAL = float(getenv("RESULT_CACHE_CHECK_INTERVAL", 5))
+
+class ResultCache:
+    """
+    LRU cache of analysis results keyed by the analysis, its normalized parameters and the current day, as windows like
+    last_days move with it. Every result is stored with the watermark of the tables it was computed from and is
+    invalidated once the watermark changed. Results are shared between requests and must not be changed.
+    """
+    def __init__(self, max_bytes: int, max_entries: int, ttl: float, check_interval: float) -> None:
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self._entries: OrderedDict[tuple, tuple] = OrderedDict()
+        self._watermarks: dict[tuple, tuple[float, tuple]] = {}
+        self._lock = Lock()
+
+    def get(self, name: str, tables: tuple[str, ...], parameters: dict, compute: Callable[[], object], read_watermark: Callable[[], tuple]) -> object:
+        """
+        Gets the cached result of the analysis, computes and caches it if it is missing or stale
+
+        Args:
+            name (str): Name of the analysis
+            tables (tuple): Tables the analysis reads
+            parameters (dict): Parameters of the analysis
+            compute (Callable): Computes the result
+            read_watermark (Callable): Reads the watermark of the tables
+
+        Returns:
+            object: Result of the analysis
+        """
+        try:
+            watermark = self._watermark(tables, read_watermark)
+        except Exception as e:
+            print(f"Error while reading the watermark of {tables}: {e}")
+            return compute()
+
+        key = (name, date.today(), _normalize(parameters))
+        now = monotonic()
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry_watermark, created_at, size, value = entry
+                if entry_watermark == watermark and now - created_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+
+                self._remove(key)
+                self.invalidations += 1
+            self.misses += 1
+
+        value = compute()
+        self._put(key, watermark, value)
+        return value
+
+    def invalidate(self) -> None:
+        """
+        Removes all cached results
+        """
+        with self._lock:
+            self._entries.clear()
+            self._watermarks.clear()
+            self.bytes = 0
+
+    def stats(self) -> dict:
+        """
+        Gets the statistics of the cache
+
+        Returns:
+            dict: Number and size of the entries, hits, misses, hit rate, evictions and invalidations
+        """
+        with self._lock:
+            requests = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / requests, 4) if requests else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+    def _watermark(self, tables: tuple[str, ...], read_watermark: Callable[[], tuple]) -> tuple:
+        """
+        Gets the watermark of the tables, it is only read again once the check interval passed
+        """
+        now = monotonic()
+        with self._lock:
+            checked = self._watermarks.get(tables)
+            if checked is not None and now - checked[0] < self.check_interval:
+                return checked[1]
+
+        watermark = read_watermark()
+        with self._lock:
+            self._watermarks[tables] = (now, watermark)
+        return watermark
+
+    def _put(self, key: tuple, watermark: tuple, value: object) -> None:
+        """
+        Caches a result, evicts the least recently used ones until the bounds hold again
+        """
+        size = _sizeOf(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (watermark, monotonic(), size, value)
+            self.bytes += size
+
+            while self.bytes > self.max_bytes or len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def _remove(self, key: tuple) -> None:
+        """
+        Removes an entry, the lock has to be held
+        """
+        self.bytes -= self._entries.pop(key)[2]
+
+
+result_cache = ResultCache(RESULT_CACHE_MAX_BYTES, RESULT_CACHE_MAX_ENTRIES, RESULT_CACHE_TTL, RESULT_CACHE_CHECK_INTERVAL)
+
+def getCached(name: str, tables: tuple[str, ...], parameters: dict, compute: Callable[[], object]) -> object:
+    """
+    Gets the result of an analysis from the shared result cache
+
+    Args:
+        name (str): Name of the analysis
+        tables (tuple): Tables the analysis reads, keys of Watermark.WATERMARKS
+        parameters (dict): Parameters of the analysis
+        compute (Callable): Computes the result on a miss
+
+    Returns:
+        object: Result of the analysis
+    """
+    with session_scope() as session:
+        return result_cache.get(name, tables, parameters, compute, lambda: WatermarkRepository(session).get(tables))
+
+def getWatermark(tables: tuple[str, ...]) -> tuple:
+    """
+    Gets the watermark of the tables, it is read from the database at most once per check interval
+
+    Args:
+        tables (tuple): Tables to get the watermark of, keys of Watermark.WATERMARKS
+
+    Returns:
+        tuple: Watermark values of the tables
+    """
+    with session_scope() as session:
+        return result_cache._watermark(tables, lambda: WatermarkRepository(session).get(tables))
+
+def getVersion(key: tuple, read_version: Callable[[], tuple]) -> tuple:
+    """
+    Gets a version of other data than tables, e.g. the run of a model, like a watermark it is read at most once per
+    check interval
+
+    Args:
+        key (tuple): Key of the version, must not be a tuple of table names
+        read_version (Callable): Reads the version
+
+    Returns:
+        tuple: Version
+    """
+    return result_cache._watermark(key, read_version)
+
+
+def _normalize(parameters: dict) -> tuple:
+    """
+    Gets the parameters as a hashable key independent of their order
+    """
+    return tuple(sorted((name, value.isoformat() if isinstance(value, date) else value) for name, value in parameters.items()))
+
+def _sizeOf(value: object) -> int:
+    """
+    Estimates the bytes of a result of dictionaries, lists and scalars
+    """
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(_sizeOf(key) + _sizeOf(item) for key, item in value.items())
+    elif isinstance(value, (list, tuple, set)):
+        size += sum(_sizeOf(item) for item in value)
+    return size
@@ -0,0 +1,252 @@
+import argparse
+import json
+import logging
+import re
+from collections.abc import Callable
+
+from sqlalchemy import Index, event, inspect, text
+from sqlalchemy.engine import Engine, IteratorResult
+from sqlalchemy.engine.result import SimpleResultMetaData
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.elements import TextClause
+
+from DataAnalysis.db.model import Order, Customer, Invoice, Product, ordersProducts, routesOrders
+from DataAnalysis.db.models.BaseRepository import BaseRepository
+from DataAnalysis.db.models.OrderAmount import OrderAmountRepository
+from DataAnalysis.db.models.CustomerSignup import CustomerSignupRepository
+from DataAnalysis.db.models.InvoicesAmount import InvoicesAmountRepository
+from DataAnalysis.db.models.ProductsAmount import ProductsAmountRepository
+from DataAnalysis.db.models.ProductsMostlyBought import ProductsMostlyBoughtRepository
+from DataAnalysis.db.models.ItemBoughtCorrelation import ItemBoughtCorrelationRepository
+from DataAnalysis.db.models.RoutesAmount import RoutesAmountRepository
+from DataAnalysis.db.models.RouteClassifier import RouteClassifierRepository
+from DataAnalysis.db.models.Rollup import RollupRepository
+
+# Indexes of the analytical query paths. The "postgresql_include" columns make them covering on Postgres,
+# so the queries are answered by index only scans.
+INDEXES = [
+    # Bucketing of the growth analyses and the rollup refresh
+    Index("ix_orders_orderDate", Order.orderDate),
+    Index("ix_customers_signedUp", Customer.signedUp),
+    Index("ix_invoices_paymentDate", Invoice.paymentDate, postgresql_include=["invoiceAmount"]),
+
+    # Products with the highest and the lowest stock
+    Index("ix_products_stock_productId", Product.stock, Product.productId, postgresql_include=["name"]),
+
+    # Purchases per product in a time window and the correlation of items bought together
+    Index("ix_ordersProducts_orderDate", ordersProducts.c.orderDate, postgresql_include=["productId", "productAmount"]),
+    Index("ix_ordersProducts_orderId_productId", ordersProducts.c.orderId, ordersProducts.c.productId),
+
+    # Joins of the route analyses: routes -> routesOrders -> orders -> customers -> addresses
+    Index("ix_routesOrders_routeId_orderId", routesOrders.c.routeId, routesOrders.c.orderId),
+    Index("ix_routesOrders_orderId_routeId", routesOrders.c.orderId, routesOrders.c.routeId),
+    Index("ix_orders_customerReference", Order.customerReference),
+    Index("ix_customers_customerReference_addressId", Customer.customerReference, Customer.addressId),
+]
+
+logger = logging.getLogger(__name__)
+
+# Repository queries checked by the report, by the name they are reported under
+QUERIES: dict[str, Callable[[Session], object]] = {
+    "OrderAmountRepository.getBuckets": lambda session: OrderAmountRepository(session).getBuckets("day", last_days=30),
+    "CustomerSignupRepository.getBuckets": lambda session: CustomerSignupRepository(session).getBuckets("day", last_days=30),
+    "InvoicesAmountRepository.getBuckets": lambda session: InvoicesAmountRepository(session).getBuckets("day", last_days=30),
+    "RollupRepository.getBuckets": lambda session: RollupRepository(session, "orders").getBuckets("day", last_days=30),
+    "ProductsAmountRepository.getStockEnds": lambda session: ProductsAmountRepository(session).getStockEnds(3, 2),
+    "ProductsMostlyBoughtRepository.getTopProducts": lambda session: ProductsMostlyBoughtRepository(session).getTopProducts(5, BaseRepository.window_start(30)),
+    "ItemBoughtCorrelationRepository.streamOrdersProducts": lambda session: list(ItemBoughtCorrelationRepository(session).streamOrdersProducts()),
+    "RoutesAmountRepository.get": lambda session: RoutesAmountRepository(session, 5).get(),
+    "RouteClassifierRepository.get": lambda session: RouteClassifierRepository(session).get(),
+}
+
+# Prefix of the EXPLAIN per dialect, other dialects get a plain EXPLAIN
+EXPLAIN = {
+    "postgresql": "EXPLAIN (FORMAT JSON) ",
+    "sqlite": "EXPLAIN QUERY PLAN ",
+}
+
+def explain(statement, parameters: dict | None, dialect) -> TextClause:
+    """
+    Gets the EXPLAIN of a statement. The statement is compiled with its parameters rendered inline, so the EXPLAIN runs
+    as plain text and the rows of the plan are not processed by the result types of the statement.
+
+    Args:
+        statement: Statement to explain
+        parameters (dict | None): Values of the bound parameters the statement was executed with
+        dialect: Dialect of the database
+
+    Returns:
+        TextClause: EXPLAIN of the statement
+    """
+    if parameters:
+        statement = statement.params(parameters)
+    sql = statement.compile(dialect=dialect, compile_kwargs={"literal_binds": True})
+    return text(EXPLAIN.get(dialect.name, "EXPLAIN ") + str(sql).replace(":", r"\:"))
+
+def createIndexes(engine: Engine) -> list[str]:
+    """
+    Creates the indexes that do not exist yet, existing indexes are left untouched
+
+    Args:
+        engine (Engine): Engine of the database
+
+    Returns:
+        list: Names of the created indexes
+    """
+    created = []
+    with engine.begin() as connection:
+        inspector = inspect(connection)
+        for index in INDEXES:
+            existing = {i["name"] for i in inspector.get_indexes(index.table.name)}
+            if index.name not in existing:
+                index.create(connection)
+                created.append(index.name)
+
+    return created
+
+def missingIndexes(engine: Engine) -> list[str]:
+    """
+    Gets the indexes that do not exist in the database
+
+    Args:
+        engine (Engine): Engine of the database
+
+    Returns:
+        list: Names of the missing indexes
+    """
+    inspector = inspect(engine)
+    existing = {index["name"] for table in {index.table.name for index in INDEXES} for index in inspector.get_indexes(table)}
+    return [index.name for index in INDEXES if index.name not in existing]
+
+def explainQueries(session: Session, queries: dict[str, Callable[[Session], object]] = QUERIES) -> list[dict]:
+    """
+    Reports which indexes the repository queries use. The statements of a query are captured instead of executed,
+    then only their EXPLAIN is run.
+
+    Args:
+        session (Session): Session of the database
+        queries (dict, optional): Queries by name. Defaults to QUERIES.
+
+    Returns:
+        list: Per query the used indexes, the tables read by a sequential scan and the plans
+    """
+    report = []
+    for name, query in queries.items():
+        statements = _captureStatements(session, query)
+
+        plans, indexes, scans = [], set(), set()
+        for statement, parameters in statements:
+            try:
+                rows = session.execute(explain(statement, parameters, session.get_bind().dialect)).all()
+            except Exception as e:
+                session.rollback()
+                plans.append(f"Error while explaining: {e}")
+                continue
+
+            plan, used, scanned = _parsePlan(session.get_bind().dialect.name, rows)
+            plans.append(plan)
+            indexes.update(used)
+            scans.update(scanned)
+
+        report.append({
+            "query": name,
+            "statements": len(statements),
+            "indexes": sorted(indexes),
+            "sequential_scans": sorted(scans),
+            "plans": plans,
+        })
+
+    return report
+
+def _captureStatements(session: Session, query: Callable[[Session], object]) -> list[tuple]:
+    """
+    Runs the query while every statement it executes is captured and answered with an empty result
+
+    Returns:
+        list: Statements and their parameters
+    """
+    statements = []
+
+    def capture(state):
+        statements.append((state.statement, state.parameters))
+        keys = list(state.statement.selected_columns.keys()) if hasattr(state.statement, "selected_columns") else []
+        return IteratorResult(SimpleResultMetaData(keys), iter([]))
+
+    event.listen(session, "do_orm_execute", capture)
+    try:
+        query(session)
+    finally:
+        event.remove(session, "do_orm_execute", capture)
+
+    return statements
+
+def _parsePlan(dialect: str, rows: list) -> tuple[object, set, set]:
+    """
+    Gets the indexes and the sequentially scanned tables of an EXPLAIN output
+
+    Args:
+        dialect (str): Name of the dialect that produced the plan
+        rows (list): Rows of the EXPLAIN
+
+    Returns:
+        tuple: The plan, the used indexes and the sequentially scanned tables
+    """
+    indexes, scans = set(), set()
+
+    if dialect == "postgresql":
+        plan = rows[0][0]
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+
+        nodes = [plan[0]["Plan"]]
+        while nodes:
+            node = nodes.pop()
+            if "Index Name" in node:
+                indexes.add(node["Index Name"])
+            if node.get("Node Type") == "Seq Scan":
+                scans.add(node["Relation Name"])
+            nodes.extend(node.get("Plans", []))
+
+        return plan, indexes, scans
+
+    if dialect == "sqlite":
+        plan = [row[-1] for row in rows]
+        for detail in plan:
+            index = re.search(r"USING (?:COVERING )?INDEX (\S+)", detail)
+            if index:
+                indexes.add(index.group(1))
+            elif re.match(r"SCAN (\S+)$", detail):
+                scans.add(detail.split()[1])
+
+        return plan, indexes, scans
+
+    return [tuple(row) for row in rows], indexes, scans
+
+
+def main() -> None:
+    """
+    Creates the missing indexes and logs which indexes the repository queries use, e.g. after a deployment:
+    python -m DataAnalysis.db.indexes
+    """
+    parser = argparse.ArgumentParser(description="Creates the indexes of the analytical queries and reports which indexes the queries use")
+    parser.add_argument("--check", action="store_true", help="only report the missing indexes, nothing is created")
+    parser.add_argument("--no-explain", action="store_true", help="skip the EXPLAIN of the repository queries")
+    arguments = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(message)s")
+
+    from DataAnalysis.db.session import SessionLocal, engine
+
+    if arguments.check:
+        logger.info("Missing indexes: %s", missingIndexes(engine))
+    else:
+        logger.info("Created indexes: %s", createIndexes(engine))
+
+    if not arguments.no_explain:
+        with SessionLocal() as session:
+            for entry in explainQueries(session):
+                logger.info("%s: indexes=%s sequential_scans=%s", entry["query"], entry["indexes"], entry["sequential_scans"])
+
+
+if __name__ == "__main__":
+    main()
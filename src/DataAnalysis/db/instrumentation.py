@@ -0,0 +1,176 @@
+import logging
+import sys
+from contextvars import ContextVar
+from functools import wraps
+from inspect import isgeneratorfunction
+from os import getenv
+from threading import Lock
+from time import perf_counter
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from dotenv import load_dotenv
+load_dotenv()
+
+# Queries taking longer than this are written to the slow query log
+SLOW_QUERY_THRESHOLD_MS = float(getenv("SLOW_QUERY_THRESHOLD_MS", 500))
+# File of the slow query log, the log goes to stderr if it is not set
+SLOW_QUERY_LOG = getenv("SLOW_QUERY_LOG")
+
+UNTAGGED = "untagged"
+
+slow_query_logger = logging.getLogger("DataAnalysis.slow_query")
+if SLOW_QUERY_LOG:
+    slow_query_logger.addHandler(logging.FileHandler(SLOW_QUERY_LOG))
+    slow_query_logger.setLevel(logging.WARNING)
+
+# Failed queries, logged as warnings since the repositories handle the errors themselves
+query_error_logger = logging.getLogger("DataAnalysis.query_error")
+
+_current_tag: ContextVar[str | None] = ContextVar("current_query_tag", default=None)
+
+class QueryStats:
+    """
+    In-process statistics of the queries by the repository method that issued them
+    """
+    def __init__(self) -> None:
+        self._stats: dict[str, dict] = {}
+        self._lock = Lock()
+
+    def _entry(self, tag: str) -> dict:
+        return self._stats.setdefault(tag, {"queries": 0, "errors": 0, "slow_queries": 0, "total_ms": 0.0, "max_ms": 0.0, "rows": 0, "bytes": 0})
+
+    def recordQuery(self, tag: str, elapsed_ms: float, slow: bool) -> None:
+        with self._lock:
+            entry = self._entry(tag)
+            entry["queries"] += 1
+            entry["total_ms"] += elapsed_ms
+            entry["max_ms"] = max(entry["max_ms"], elapsed_ms)
+            if slow:
+                entry["slow_queries"] += 1
+
+    def recordRows(self, tag: str, rows: int, size: int) -> None:
+        with self._lock:
+            entry = self._entry(tag)
+            entry["rows"] += rows
+            entry["bytes"] += size
+
+    def recordError(self, tag: str) -> None:
+        with self._lock:
+            self._entry(tag)["errors"] += 1
+
+    def get(self) -> list[dict]:
+        """
+        Gets the statistics, the repository methods spending the most time in the DB first
+
+        Returns:
+            list: Statistics by repository method
+        """
+        with self._lock:
+            stats = [
+                {"tag": tag, **entry, "total_ms": round(entry["total_ms"], 3), "max_ms": round(entry["max_ms"], 3),
+                 "avg_ms": round(entry["total_ms"] / entry["queries"], 3) if entry["queries"] else 0.0}
+                for tag, entry in self._stats.items()
+            ]
+        return sorted(stats, key=lambda entry: entry["total_ms"], reverse=True)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats.clear()
+
+query_stats = QueryStats()
+
+
+def tagQueries(tag: str, function):
+    """
+    Tags the queries issued while the function runs with the given tag. If a tagged function calls another one,
+    the outer tag is kept. Generator functions are tagged while they are resumed.
+
+    Args:
+        tag (str): Tag, e.g. "OrderAmountRepository.getBuckets"
+        function: Function to wrap
+
+    Returns:
+        The wrapped function
+    """
+    if isgeneratorfunction(function):
+        @wraps(function)
+        def generator(*args, **kwargs):
+            inner = function(*args, **kwargs)
+            try:
+                while True:
+                    token = _current_tag.set(_current_tag.get() or tag)
+                    try:
+                        value = next(inner)
+                    except StopIteration:
+                        return
+                    finally:
+                        _current_tag.reset(token)
+                    yield value
+            finally:
+                inner.close()
+
+        return generator
+
+    @wraps(function)
+    def wrapper(*args, **kwargs):
+        token = _current_tag.set(_current_tag.get() or tag)
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _current_tag.reset(token)
+
+    return wrapper
+
+def currentTag() -> str:
+    """
+    Gets the tag of the running repository method
+    """
+    return _current_tag.get() or UNTAGGED
+
+def recordRows(rows, arrays: dict[str, np.ndarray] | None = None) -> None:
+    """
+    Records the rows fetched by the running repository method and their approximate size in bytes
+
+    Args:
+        rows: Fetched rows
+        arrays (dict, optional): The rows converted to NumPy arrays, their size is cheaper to get. Defaults to None.
+    """
+    if arrays is not None:
+        size = sum(array.nbytes for array in arrays.values())
+    else:
+        size = sum(sys.getsizeof(value) for row in rows for value in row)
+    query_stats.recordRows(currentTag(), len(rows), size)
+
+
+def instrumentEngine(engine: Engine) -> None:
+    """
+    Times every query of the engine, counts and logs failed queries and writes slow queries with their parameters to the slow query log
+
+    Args:
+        engine (Engine): Engine to instrument
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start", []).append(perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed_ms = (perf_counter() - conn.info["query_start"].pop()) * 1000
+        tag = currentTag()
+        slow = elapsed_ms >= SLOW_QUERY_THRESHOLD_MS
+
+        query_stats.recordQuery(tag, elapsed_ms, slow)
+        if slow:
+            slow_query_logger.warning("%s took %.1f ms: %s with parameters %r", tag, elapsed_ms, " ".join(statement.split()), parameters)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(context):
+        if context.connection is not None and context.connection.info.get("query_start"):
+            context.connection.info["query_start"].pop()
+
+        tag = currentTag()
+        query_stats.recordError(tag)
+        query_error_logger.warning("%s failed: %s: %s", tag, context.original_exception, context.statement)
@@ -1,4 +1,4 @@
-from sqlalchemy import Integer, String, ForeignKey, DateTime, Table, Column, Boolean, UUID, Float
+from sqlalchemy import BigInteger, Integer, String, ForeignKey, DateTime, Table, Column, Boolean, UUID, Float
 from sqlalchemy.orm import declarative_base, relationship, Mapped, mapped_column
 from datetime import datetime
 from typing import List
@@ -213,4 +213,20 @@ class Role(Base):
     #description: Mapped[str] = mapped_column(String(255), nullable=True)
     #deleted: Mapped[bool] = mapped_column(Boolean, default=False)
 
+class DailyRollup(Base):
+    __tablename__ = "dailyRollups"
+
+    metric: Mapped[str] = mapped_column(String(40), primary_key=True)
+    day: Mapped[datetime] = mapped_column(DateTime, primary_key=True)
+    count: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    amount: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+
+class RollupWatermark(Base):
+    __tablename__ = "rollupWatermarks"
+
+    metric: Mapped[str] = mapped_column(String(40), primary_key=True)
+    watermark: Mapped[datetime] = mapped_column(DateTime, nullable=True)
+    rows: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    refreshedAt: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
 #Base.metadata.create_all(engine)
\ No newline at end of file
@@ -1,7 +1,14 @@
 from DataAnalysis.db.models.BaseRepository import BaseRepository
 from DataAnalysis.db.models.queryparams import AuthParams
 from DataAnalysis.db.model import Employee, Role
-from sqlalchemy import func
+from sqlalchemy import bindparam, select
+
+# Role of the employee with the email and password bound per call
+EMPLOYEE_ROLE = (
+    select(Employee.email, Role.name)
+    .join(Role, Employee.roleId == Role.roleId)
+    .where(Employee.email == bindparam("email"), Employee.password == bindparam("password"))
+)
 
 class AuthRepository(BaseRepository[Employee]):
     def __init__(self, session, email: str, password: str):
@@ -11,10 +18,8 @@ class AuthRepository(BaseRepository[Employee]):
 
     def get(self) -> list[AuthParams]:
         try:
-            result = (
-                self.session.query(Employee.email, Role.name).join(Role, Employee.roleId == Role.roleId).filter(Employee.email == self.email, Employee.password == self.password).first()
-            )
-            return result
+            rows = self.fetch(EMPLOYEE_ROLE, {"email": self.email, "password": self.password})
+            return rows[0] if rows else None
         except Exception as e:
             print(f"Error while getting employee amount data: {e}")
             return []
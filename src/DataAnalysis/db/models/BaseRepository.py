@@ -1,17 +1,193 @@
-from typing import Type, TypeVar, Generic, List
+from typing import Type, TypeVar, Generic, List, Iterator
+from contextlib import nullcontext
+from inspect import isfunction
+from datetime import datetime, date, time, timedelta
+from sqlalchemy import func, select, DateTime
 from sqlalchemy.orm import Session
+import numpy as np
+
+from DataAnalysis.db.instrumentation import recordRows, tagQueries
 
 T = TypeVar("T")
 
+GRANULARITIES = ("day", "month", "year")
+STREAM_CHUNK_SIZE = 10000
+
 class BaseRepository(Generic[T]):
     def __init__(self, model: Type[T], session: Session):
         self.model = model
         self.session = session
 
+    def __init_subclass__(cls, **kwargs) -> None:
+        # Tags the queries of every public method with "<Repository>.<method>" for the query statistics
+        super().__init_subclass__(**kwargs)
+        for name, attribute in list(vars(cls).items()):
+            if not name.startswith("_") and isfunction(attribute):
+                setattr(cls, name, tagQueries(f"{cls.__name__}.{name}", attribute))
+
     def filter(self, **filters) -> List[T]:
         data = self.session.query(self.model).filter_by(**filters).all()
         return data
 
     def get_from_custom_model(self, model: Type[T]) -> List[T]:
         data = self.session.query(model).all()
-        return data
\ No newline at end of file
+        return data
+
+    def onPrimary(self):
+        """
+        Sends the statements inside the block to the primary if the session routes reads to a read replica,
+        e.g. for tables the repository writes to itself
+
+        Returns:
+            ContextManager: Block running on the primary
+        """
+        return getattr(self.session, "primary", nullcontext)()
+
+    def project(self, *columns, as_arrays: bool = False, **filters) -> list | dict[str, np.ndarray]:
+        """
+        Fetches only the given columns instead of whole ORM entities
+
+        Args:
+            columns: Columns to fetch
+            as_arrays (bool, optional): If True, the columns are returned as NumPy arrays. Defaults to False.
+            filters: Equality filters on the model of the repository
+
+        Returns:
+            list | dict: List of plain rows or dictionary of column name to NumPy array if as_arrays is True
+        """
+        statement = select(*columns)
+        if filters:
+            statement = statement.select_from(self.model).filter_by(**filters)
+        return self.fetch(statement, as_arrays=as_arrays)
+
+    def fetch(self, statement, parameters: dict | None = None, as_arrays: bool = False) -> list | dict[str, np.ndarray]:
+        """
+        Executes a column statement without hydrating ORM entities or touching the identity map
+
+        Args:
+            statement: Select statement of columns
+            parameters (dict, optional): Values of the bound parameters of a statement built once at import. Defaults to None.
+            as_arrays (bool, optional): If True, the columns are returned as NumPy arrays. Defaults to False.
+
+        Returns:
+            list | dict: List of plain rows or dictionary of column name to NumPy array if as_arrays is True
+        """
+        result = self.session.execute(statement, parameters)
+        rows = result.all()
+        if not as_arrays:
+            recordRows(rows)
+            return rows
+
+        arrays = _to_arrays(list(result.keys()), rows)
+        recordRows(rows, arrays)
+        return arrays
+
+    def stream(self, statement, chunk_size: int = STREAM_CHUNK_SIZE, as_arrays: bool = False) -> Iterator[list | dict[str, np.ndarray]]:
+        """
+        Streams the rows of a column statement in chunks through a server-side cursor, so the whole result is never held in memory
+
+        Args:
+            statement: Select statement of columns
+            chunk_size (int, optional): Number of rows per chunk. Defaults to STREAM_CHUNK_SIZE.
+            as_arrays (bool, optional): If True, every chunk is returned as NumPy arrays. Defaults to False.
+
+        Yields:
+            list | dict: Chunk of plain rows or dictionary of column name to NumPy array if as_arrays is True
+        """
+        result = self.session.execute(statement, execution_options={"stream_results": True, "yield_per": chunk_size})
+        keys = list(result.keys())
+        try:
+            for partition in result.partitions():
+                arrays = _to_arrays(keys, partition) if as_arrays else None
+                recordRows(partition, arrays)
+                yield arrays if as_arrays else partition
+        finally:
+            result.close()
+
+    def bucket(self, column, granularity: str, last_days: int = 0, value=None, where: tuple = (), since: datetime = None) -> list:
+        """
+        Counts the rows (or sums a value) per day, month or year inside the DB
+
+        Args:
+            column: Date column the rows are bucketed by
+            granularity (str): One of "day", "month" or "year"
+            last_days (int, optional): Only rows of the last days are bucketed. Defaults to 0, which means no window.
+            value (optional): Column to sum up instead of counting the rows. Defaults to None.
+            where (tuple, optional): Additional filter criteria. Defaults to ().
+            since (datetime, optional): Only rows from this point in time on are bucketed. Defaults to None.
+
+        Returns:
+            list: Rows with the bucket start as ``bucket`` and the count or sum as ``value``, ordered by bucket
+
+        Raises:
+            ValueError: If the granularity is unknown
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Unknown granularity: {granularity}")
+
+        bucket = func.date_trunc(granularity, column, type_=DateTime).label("bucket")
+        measure = func.count() if value is None else func.coalesce(func.sum(value), 0)
+
+        statement = select(bucket, measure.label("value")).where(column <= self._until(granularity), *where)
+        if last_days > 0:
+            statement = statement.where(column >= self.window_start(last_days))
+        if since is not None:
+            statement = statement.where(column >= since)
+
+        return self.fetch(statement.group_by(bucket).order_by(bucket))
+
+    def total(self, column, before: datetime, value=None, where: tuple = ()) -> int:
+        """
+        Counts the rows (or sums a value) dated before the given point in time
+
+        Args:
+            column: Date column to compare against
+            before (datetime): Exclusive upper bound
+            value (optional): Column to sum up instead of counting the rows. Defaults to None.
+            where (tuple, optional): Additional filter criteria. Defaults to ().
+
+        Returns:
+            int: Amount of rows or sum of the value
+        """
+        measure = func.count() if value is None else func.coalesce(func.sum(value), 0)
+        return self.fetch(select(measure).where(column < before, *where))[0][0] or 0
+
+    @staticmethod
+    def window_start(last_days: int) -> datetime:
+        """
+        Gets the first point in time of a last_days window, the day itself is included
+
+        Args:
+            last_days (int): Number of days to look back
+
+        Returns:
+            datetime: Midnight of the first day of the window
+        """
+        return datetime.combine(date.today() - timedelta(days=last_days), time.min)
+
+    @staticmethod
+    def _until(granularity: str) -> datetime:
+        """
+        Gets the upper bound for bucketing. Daily buckets include the whole current day, monthly and yearly buckets end now.
+        """
+        if granularity == "day":
+            return datetime.combine(date.today(), time.max)
+        return datetime.now()
+
+
+def _to_arrays(keys: list[str], rows: list) -> dict[str, np.ndarray]:
+    """
+    Converts rows to a dictionary of column name to NumPy array
+    """
+    columns = list(zip(*rows)) or [() for _ in keys]
+    return {key: _to_array(values) for key, values in zip(keys, columns)}
+
+
+def _to_array(values: tuple) -> np.ndarray:
+    """
+    Converts the values of one column to a NumPy array, dates become datetime64
+    """
+    first = next((value for value in values if value is not None), None)
+    if isinstance(first, (datetime, date)):
+        return np.array(values, dtype="datetime64[us]")
+    return np.array(values)
@@ -1,5 +1,5 @@
 from DataAnalysis.db.models.BaseRepository import BaseRepository
-from DataAnalysis.db.models.queryparams import CustomerSignup as CustomerSignupParams
+from DataAnalysis.db.models.queryparams import CustomerSignup as CustomerSignupParams, GrowthBucket
 from DataAnalysis.db.model import Customer
 
 class CustomerSignupRepository(BaseRepository[Customer]):
@@ -8,8 +8,22 @@ class CustomerSignupRepository(BaseRepository[Customer]):
 
     def get(self) -> list[CustomerSignupParams]:
         try:
-            data = self.filter()
+            data = self.project(Customer.signedUp)
             return data
         except Exception as e:
             print(f"Error while getting customer signup data: {e}")
             return []
+
+    def getBuckets(self, granularity: str, last_days: int = 0, since=None) -> list[GrowthBucket]:
+        try:
+            return self.bucket(Customer.signedUp, granularity, last_days=last_days, since=since)
+        except Exception as e:
+            print(f"Error while getting customer signup buckets: {e}")
+            return []
+
+    def getTotalBefore(self, before) -> int:
+        try:
+            return self.total(Customer.signedUp, before)
+        except Exception as e:
+            print(f"Error while getting customer signup total: {e}")
+            return 0
@@ -1,7 +1,16 @@
 from DataAnalysis.db.models.BaseRepository import BaseRepository
 from DataAnalysis.db.models.queryparams import EmployeeAmount as EmployeeAmountParams
 from DataAnalysis.db.model import Employee, Role
-from sqlalchemy import func
+from sqlalchemy import Integer, bindparam, func, select
+
+# Roles by their amount of employees, the limit is bound per call
+EMPLOYEE_AMOUNT = (
+    select(Role.name, func.count(Employee.employeeId).label("employee_count"))
+    .join(Employee, Role.roleId == Employee.roleId)
+    .group_by(Role.name)
+    .order_by(func.count(Employee.employeeId).desc())
+    .limit(bindparam("limit", type_=Integer))
+)
 
 class EmployeeAmountRepository(BaseRepository[Employee]):
     def __init__(self, session, limit):
@@ -10,14 +19,7 @@ class EmployeeAmountRepository(BaseRepository[Employee]):
 
     def get(self) -> list[EmployeeAmountParams]:
         try:
-            result = (
-                self.session.query(Role.name, func.count(Employee.employeeId).label("employee_count"))
-                .join(Employee, Role.roleId == Employee.roleId)
-                .group_by(Role.name)
-                .order_by(func.count(Employee.employeeId).desc())
-                .limit(self.limit)
-                .all()
-            )
+            result = self.fetch(EMPLOYEE_AMOUNT, {"limit": self.limit})
             return result
         except Exception as e:
             print(f"Error while getting employee amount data: {e}")
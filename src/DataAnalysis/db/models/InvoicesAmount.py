@@ -1,5 +1,5 @@
 from DataAnalysis.db.models.BaseRepository import BaseRepository
-from DataAnalysis.db.models.queryparams import InvoicesAmount as InvoicesAmountParams
+from DataAnalysis.db.models.queryparams import InvoicesAmount as InvoicesAmountParams, GrowthBucket
 from DataAnalysis.db.model import Invoice
 
 class InvoicesAmountRepository(BaseRepository[Invoice]):
@@ -8,8 +8,22 @@ class InvoicesAmountRepository(BaseRepository[Invoice]):
 
     def get(self) -> list[InvoicesAmountParams]:
         try:
-            data = self.filter()
+            data = self.project(Invoice.paymentDate, Invoice.invoiceAmount)
             return data
         except Exception as e:
             print(f"Error while getting order amount data: {e}")
             return []
+
+    def getBuckets(self, granularity: str, last_days: int = 0, since=None) -> list[GrowthBucket]:
+        try:
+            return self.bucket(Invoice.paymentDate, granularity, last_days=last_days, since=since, value=Invoice.invoiceAmount)
+        except Exception as e:
+            print(f"Error while getting invoices amount buckets: {e}")
+            return []
+
+    def getTotalBefore(self, before) -> int:
+        try:
+            return self.total(Invoice.paymentDate, before, value=Invoice.invoiceAmount)
+        except Exception as e:
+            print(f"Error while getting invoices amount total: {e}")
+            return 0
@@ -1,36 +1,21 @@
-from DataAnalysis.db.models.BaseRepository import BaseRepository
-from DataAnalysis.db.models.queryparams import OrdersParam, ProductsParam, OrdersProductsParam
-from DataAnalysis.db.model import Product, ordersProducts, Order
-from uuid import UUID
+from DataAnalysis.db.models.BaseRepository import BaseRepository, STREAM_CHUNK_SIZE
+from DataAnalysis.db.model import Product, ordersProducts
+from sqlalchemy import select
+from typing import Iterator
+import numpy as np
 
 class ItemBoughtCorrelationRepository(BaseRepository[Product]):
     def __init__(self, session):
         super().__init__(Product, session)
 
-    def getProducts(self) -> list[ProductsParam]:
-        try:
-            data = self.filter()
-            return data
-        except Exception as e:
-            print(f"Error while getting order amount data: {e}")
-            return []
+    def streamOrdersProducts(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[dict[str, np.ndarray]]:
+        """
+        Streams the order and product IDs of ordersProducts, an error while streaming is raised so no truncated result is used
 
-    def getOrdersProducts(self) -> list[OrdersProductsParam]:
-        try:
-            data = self.get_from_custom_model(ordersProducts)
-            return data
-        except Exception as e:
-            print(f"Error while getting order amount data: {e}")
-            return []
-        
-    def getOrders(self) -> list[OrdersParam]:
-        try:
-            data = self.get_from_custom_model(Order)
-            return data
-        except Exception as e:
-            print(f"Error while getting order amount data: {e}")
-            return []
-        
-    def getAll(self) -> tuple[list[ProductsParam], list[OrdersProductsParam], list[OrdersParam]]:
-        return self.getProducts(), self.getOrdersProducts(), self.getOrders()
+        Args:
+            chunk_size (int, optional): Number of rows per chunk. Defaults to STREAM_CHUNK_SIZE.
 
+        Yields:
+            dict: Chunk of the order and product IDs as NumPy arrays
+        """
+        yield from self.stream(select(ordersProducts.c.orderId, ordersProducts.c.productId), chunk_size=chunk_size, as_arrays=True)
@@ -1,5 +1,5 @@
 from DataAnalysis.db.models.BaseRepository import BaseRepository
-from DataAnalysis.db.models.queryparams import OrderAmount as OrderAmountParams
+from DataAnalysis.db.models.queryparams import OrderAmount as OrderAmountParams, GrowthBucket
 from DataAnalysis.db.model import Order
 
 class OrderAmountRepository(BaseRepository[Order]):
@@ -8,8 +8,22 @@ class OrderAmountRepository(BaseRepository[Order]):
 
     def get(self) -> list[OrderAmountParams]:
         try:
-            data = self.filter()
+            data = self.project(Order.orderDate)
             return data
         except Exception as e:
             print(f"Error while getting order amount data: {e}")
             return []
+
+    def getBuckets(self, granularity: str, last_days: int = 0, since=None) -> list[GrowthBucket]:
+        try:
+            return self.bucket(Order.orderDate, granularity, last_days=last_days, since=since)
+        except Exception as e:
+            print(f"Error while getting order amount buckets: {e}")
+            return []
+
+    def getTotalBefore(self, before) -> int:
+        try:
+            return self.total(Order.orderDate, before)
+        except Exception as e:
+            print(f"Error while getting order amount total: {e}")
+            return 0
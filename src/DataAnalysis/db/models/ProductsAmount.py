@@ -1,6 +1,29 @@
 from DataAnalysis.db.models.BaseRepository import BaseRepository
 from DataAnalysis.db.models.queryparams import ProductsAmount as ProductsAmountParams
 from DataAnalysis.db.model import Product
+from sqlalchemy import Integer, bindparam, literal, select, union_all
+
+# Stock of every product
+PRODUCTS_AMOUNT = select(Product.name, Product.stock)
+
+# Products with the highest and the lowest stock in one round trip. Both ends are ordered by the stock index, ties are
+# broken by the productId in opposite directions, so the ends never overlap while there are at least top + bottom products
+HIGHEST_STOCK = (
+    select(Product.productId, Product.name, Product.stock)
+    .order_by(Product.stock.desc(), Product.productId)
+    .limit(bindparam("top", type_=Integer))
+    .subquery()
+)
+LOWEST_STOCK = (
+    select(Product.productId, Product.name, Product.stock)
+    .order_by(Product.stock, Product.productId.desc())
+    .limit(bindparam("bottom", type_=Integer))
+    .subquery()
+)
+STOCK_ENDS = union_all(
+    select(HIGHEST_STOCK.c.productId, HIGHEST_STOCK.c.name, HIGHEST_STOCK.c.stock, literal(True).label("highest")),
+    select(LOWEST_STOCK.c.productId, LOWEST_STOCK.c.name, LOWEST_STOCK.c.stock, literal(False).label("highest")),
+)
 
 class ProductsAmountRepository(BaseRepository[Product]):
     def __init__(self, session):
@@ -8,8 +31,25 @@ class ProductsAmountRepository(BaseRepository[Product]):
 
     def get(self) -> list[ProductsAmountParams]:
         try:
-            data = self.filter()
+            data = self.fetch(PRODUCTS_AMOUNT)
             return data
         except Exception as e:
             print(f"Error while getting order amount data: {e}")
             return []
+
+    def getStockEnds(self, top: int, bottom: int) -> list:
+        """
+        Gets the products with the highest and the lowest stock, only top + bottom rows are read
+
+        Args:
+            top (int): Number of products with the highest stock
+            bottom (int): Number of products with the lowest stock
+
+        Returns:
+            list: Rows of the productId, name, stock and whether the product belongs to the highest ones, in no particular order
+        """
+        try:
+            return self.fetch(STOCK_ENDS, {"top": top, "bottom": bottom})
+        except Exception as e:
+            print(f"Error while getting stock ends data: {e}")
+            return []
@@ -1,24 +1,43 @@
 from DataAnalysis.db.models.BaseRepository import BaseRepository
-from DataAnalysis.db.models.queryparams import ProductsMostlyBought as ProductsMostlyBoughtParams
-from DataAnalysis.db.models.queryparams import OrdersProducts as OrdersProductsParams
 from DataAnalysis.db.model import Product, ordersProducts
+from sqlalchemy import func, select
+from datetime import datetime
+
+# Bought amount per product by its name, highest first. Ties are ordered by the date of the first purchase
+PURCHASED = func.sum(ordersProducts.c.productAmount)
+TOP_PRODUCTS = (
+    select(Product.name, PURCHASED.label("amount"))
+    .join(ordersProducts, ordersProducts.c.productId == Product.productId)
+    .group_by(Product.productId, Product.name)
+    .order_by(PURCHASED.desc(), func.min(ordersProducts.c.orderDate))
+)
 
 class ProductsMostlyBoughtRepository(BaseRepository[Product]):
     def __init__(self, session):
         super().__init__(Product, session)
 
-    def get(self) -> list[ProductsMostlyBoughtParams]:
-        try:
-            data = self.filter()
-            return data
-        except Exception as e:
-            print(f"Error while getting order amount data: {e}")
-            return []
-        
-    def getOrdersProducts(self) -> list[OrdersProductsParams]:
+    def getTopProducts(self, limit: int | None = None, start: datetime | None = None, end: datetime | None = None) -> list:
+        """
+        Sums up the bought amount per product inside the DB and gets the names of the products mostly bought. Rows of
+        products that no longer exist are left out by the join.
+
+        Args:
+            limit (int, optional): Number of products. Defaults to None, which means all bought products.
+            start (datetime, optional): Inclusive lower bound of the order date. Defaults to None, which means no lower bound.
+            end (datetime, optional): Exclusive upper bound of the order date. Defaults to None, which means no upper bound.
+
+        Returns:
+            list: Rows of the product name and the bought amount, highest amount first
+        """
         try:
-            data = self.get_from_custom_model(ordersProducts)
-            return data
+            statement = TOP_PRODUCTS
+            if start is not None:
+                statement = statement.where(ordersProducts.c.orderDate >= start)
+            if end is not None:
+                statement = statement.where(ordersProducts.c.orderDate < end)
+            if limit is not None:
+                statement = statement.limit(limit)
+            return self.fetch(statement)
         except Exception as e:
-            print(f"Error while getting order amount data: {e}")
+            print(f"Error while getting top products data: {e}")
             return []
@@ -0,0 +1,138 @@
+from DataAnalysis.db.models.BaseRepository import BaseRepository
+from DataAnalysis.db.models.queryparams import GrowthBucket
+from DataAnalysis.db.model import DailyRollup, RollupWatermark, Order, Customer, Invoice
+from sqlalchemy import DateTime, bindparam, delete, func, insert, literal, select, text
+from datetime import datetime, time
+import logging
+import zlib
+
+# Rollup name to the date column the rows are rolled up by and the column summed up as amount
+ROLLUPS = {
+    "orders": (Order.orderDate, None),
+    "customers": (Customer.signedUp, None),
+    "invoices": (Invoice.paymentDate, Invoice.invoiceAmount),
+}
+
+# Lock of a refresh on Postgres, held until the transaction ends
+ADVISORY_LOCK = text("SELECT pg_try_advisory_xact_lock(:key)")
+# Latest date and amount of rows of each rolled up table, the rollup is current while its watermark matches them
+LATEST = {name: select(func.max(column), func.count(column)) for name, (column, _) in ROLLUPS.items()}
+# Watermark of a rollup
+WATERMARK = select(RollupWatermark.watermark, RollupWatermark.rows).where(RollupWatermark.metric == bindparam("metric"))
+
+logger = logging.getLogger(__name__)
+
+class RollupRepository(BaseRepository[DailyRollup]):
+    """
+    Daily counts (and sums) of a table, kept in the dailyRollups table. A refresh only recomputes the days from the
+    watermark on, which is the latest date rolled up so far. The rolled up tables only grow, so older days normally never
+    change. If rows turn up before the watermark anyway, the rollup is recomputed completely. Refreshes run in the
+    background, see DataAnalysis.db.rollups, requests only read the rollup while it is current.
+    """
+    def __init__(self, session, rollup: str):
+        super().__init__(DailyRollup, session)
+        if rollup not in ROLLUPS:
+            raise ValueError(f"Unknown rollup: {rollup}")
+
+        self.rollup = rollup
+        self.column, self.value = ROLLUPS[rollup]
+
+    def isCurrent(self) -> bool:
+        """
+        Checks whether the rollup holds every row of the rolled up table
+
+        Returns:
+            bool: True if the watermark of the rollup matches the table, False if it is behind or could not be read
+        """
+        try:
+            with self.onPrimary():
+                watermark = self.fetch(WATERMARK, {"metric": self.rollup})
+                latest = self.fetch(LATEST[self.rollup])
+            return len(watermark) == 1 and tuple(watermark[0]) == tuple(latest[0])
+        except Exception as e:
+            logger.warning("Error while checking the %s rollup: %s", self.rollup, e)
+            return False
+
+    def refresh(self) -> bool:
+        """
+        Brings the rollup up to date with the rolled up table and commits. The session should be used for nothing else,
+        on errors the caller rolls it back. On Postgres a transaction level advisory lock makes sure only one worker
+        refreshes a rollup at a time.
+
+        Returns:
+            bool: True if the rollup was refreshed, False if another worker is refreshing it
+        """
+        with self.onPrimary():
+            if not self._lock():
+                self.session.rollback()
+                return False
+
+            watermark = self.session.get(RollupWatermark, self.rollup)
+            latest, rows = self.fetch(LATEST[self.rollup])[0]
+            if watermark is None or (latest, rows) != (watermark.watermark, watermark.rows):
+                since = None
+                if watermark is not None and watermark.watermark is not None:
+                    since = datetime.combine(min(watermark.watermark, datetime.now()).date(), time.min)
+                self._recompute(since)
+
+                if since is not None and self._rolledUpRows() != rows:
+                    self._recompute(None) # Rows were added before the watermark
+
+            self.session.merge(RollupWatermark(metric=self.rollup, watermark=latest, rows=rows, refreshedAt=datetime.now()))
+            self.session.commit()
+            return True
+
+    def _lock(self) -> bool:
+        """
+        Takes the advisory lock of the rollup until the transaction ends. Other databases than Postgres serialize the
+        writes themselves and are not locked.
+
+        Returns:
+            bool: True if the lock was taken or is not needed, False if another worker holds it
+        """
+        if self.session.get_bind().dialect.name != "postgresql":
+            return True
+        return self.fetch(ADVISORY_LOCK, {"key": zlib.crc32(f"rollup:{self.rollup}".encode())})[0][0]
+
+    def _recompute(self, since: datetime | None) -> None:
+        """
+        Recomputes the days of the rollup from the given day on
+
+        Args:
+            since (datetime | None): First day to recompute, None recomputes all days
+        """
+        day = func.date_trunc("day", self.column, type_=DateTime)
+        amount = func.coalesce(func.sum(self.value), 0) if self.value is not None else literal(0)
+
+        source = select(literal(self.rollup), day, func.count(), amount).where(self.column.is_not(None)).group_by(day)
+        stale = delete(DailyRollup).where(DailyRollup.metric == self.rollup)
+        if since is not None:
+            source = source.where(self.column >= since)
+            stale = stale.where(DailyRollup.day >= since)
+
+        self.session.execute(stale)
+        self.session.execute(insert(DailyRollup).from_select(["metric", "day", "count", "amount"], source))
+
+    def _rolledUpRows(self) -> int:
+        """
+        Gets the amount of rows the rollup was computed from
+        """
+        return self.fetch(select(func.coalesce(func.sum(DailyRollup.count), 0)).where(DailyRollup.metric == self.rollup))[0][0]
+
+    def getBuckets(self, granularity: str, last_days: int = 0, since=None) -> list[GrowthBucket]:
+        try:
+            measure = DailyRollup.amount if self.value is not None else DailyRollup.count
+            with self.onPrimary(): # The rollup is written by this service, the replica may not have the latest refresh yet
+                return self.bucket(DailyRollup.day, granularity, last_days=last_days, since=since, value=measure, where=(DailyRollup.metric == self.rollup,))
+        except Exception as e:
+            logger.warning("Error while getting %s rollup buckets: %s", self.rollup, e)
+            return []
+
+    def getTotalBefore(self, before) -> int:
+        try:
+            measure = DailyRollup.amount if self.value is not None else DailyRollup.count
+            with self.onPrimary():
+                return self.total(DailyRollup.day, before, value=measure, where=(DailyRollup.metric == self.rollup,))
+        except Exception as e:
+            logger.warning("Error while getting %s rollup total: %s", self.rollup, e)
+            return 0
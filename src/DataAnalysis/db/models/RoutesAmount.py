@@ -1,7 +1,16 @@
 from DataAnalysis.db.models.BaseRepository import BaseRepository
 from DataAnalysis.db.models.queryparams import RoutesAmount as RoutesAmountParams
 from DataAnalysis.db.model import Route, routesOrders
-from sqlalchemy import func
+from sqlalchemy import Integer, bindparam, func, select
+
+# Routes by their amount of orders, the limit is bound per call so the statement is built and compiled once
+ROUTES_AMOUNT = (
+    select(Route.name, func.count(routesOrders.c.orderId).label("order_count"))
+    .join(routesOrders, Route.routeId == routesOrders.c.routeId)
+    .group_by(Route.name)
+    .order_by(func.count(routesOrders.c.orderId).desc())
+    .limit(bindparam("limit", type_=Integer))
+)
 
 class RoutesAmountRepository(BaseRepository[Route]):
     def __init__(self, session, limit):
@@ -10,14 +19,7 @@ class RoutesAmountRepository(BaseRepository[Route]):
 
     def get(self) -> list[RoutesAmountParams]:
         try:
-            result = (
-                self.session.query(Route.name, func.count(routesOrders.c.orderId).label("order_count"))
-                .join(routesOrders, Route.routeId == routesOrders.c.routeId)
-                .group_by(Route.name)
-                .order_by(func.count(routesOrders.c.orderId).desc())
-                .limit(self.limit)
-                .all()
-            )
+            result = self.fetch(ROUTES_AMOUNT, {"limit": self.limit})
             return result
         except Exception as e:
             print(f"Error while getting order amount data: {e}")
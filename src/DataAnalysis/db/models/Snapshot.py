@@ -0,0 +1,53 @@
+from DataAnalysis.db.models.BaseRepository import BaseRepository, STREAM_CHUNK_SIZE
+from DataAnalysis.db.model import Order, Product, Customer, Address, ordersProducts, routesOrders
+from sqlalchemy import func, select
+from typing import Iterator
+import numpy as np
+
+class SnapshotRepository(BaseRepository[Order]):
+    """
+    Reads the tables of the order star schema for the columnar snapshot. Errors are not caught here, a failed load
+    keeps the previous snapshot.
+    """
+    def __init__(self, session):
+        super().__init__(Order, session)
+
+    def getWatermark(self) -> tuple:
+        """
+        Gets the row counts and the latest dates of the snapshot tables in one round trip. The tables only grow,
+        so the snapshot is stale if the watermark changed.
+
+        Returns:
+            tuple: Watermark of the snapshot tables
+        """
+        return tuple(self.fetch(select(
+            select(func.count()).select_from(Order).scalar_subquery(),
+            select(func.max(Order.orderDate)).scalar_subquery(),
+            select(func.count()).select_from(ordersProducts).scalar_subquery(),
+            select(func.max(ordersProducts.c.orderDate)).scalar_subquery(),
+            select(func.count()).select_from(Product).scalar_subquery(),
+            select(func.count()).select_from(Customer).scalar_subquery(),
+            select(func.count()).select_from(Address).scalar_subquery(),
+            select(func.count()).select_from(routesOrders).scalar_subquery(),
+        ))[0])
+
+    def getProducts(self) -> dict[str, np.ndarray]:
+        return self.project(Product.productId, Product.name, as_arrays=True)
+
+    def getOrders(self) -> dict[str, np.ndarray]:
+        return self.project(Order.orderId, Order.orderDate, Order.customerReference, as_arrays=True)
+
+    def getCustomers(self) -> dict[str, np.ndarray]:
+        return self.project(Customer.customerReference, Customer.signedUp, Customer.addressId, as_arrays=True)
+
+    def getAddresses(self) -> dict[str, np.ndarray]:
+        return self.project(Address.addressId, Address.latitude, Address.longitude, as_arrays=True)
+
+    def getRoutesOrders(self) -> dict[str, np.ndarray]:
+        return self.project(routesOrders.c.routeId, routesOrders.c.orderId, as_arrays=True)
+
+    def streamOrdersProducts(self, chunk_size: int = STREAM_CHUNK_SIZE) -> Iterator[dict[str, np.ndarray]]:
+        yield from self.stream(
+            select(ordersProducts.c.orderId, ordersProducts.c.productId, ordersProducts.c.productAmount, ordersProducts.c.orderDate),
+            chunk_size=chunk_size, as_arrays=True
+        )
@@ -0,0 +1,37 @@
+from DataAnalysis.db.models.BaseRepository import BaseRepository
+from DataAnalysis.db.model import Order, Customer, Invoice, Product, Employee, Role, Route, ordersProducts, routesOrders
+from sqlalchemy import func, select
+
+# Table name to the scalar statements its watermark consists of, they change whenever rows are added and for
+# products also when the stock changes
+WATERMARKS = {
+    "orders": (select(func.count()).select_from(Order), select(func.max(Order.orderDate))),
+    "customers": (select(func.count()).select_from(Customer), select(func.max(Customer.signedUp))),
+    "invoices": (select(func.count()).select_from(Invoice), select(func.max(Invoice.paymentDate))),
+    "ordersProducts": (select(func.count()).select_from(ordersProducts), select(func.max(ordersProducts.c.orderDate))),
+    "products": (select(func.count()).select_from(Product), select(func.sum(Product.stock))),
+    "employees": (select(func.count()).select_from(Employee),),
+    "roles": (select(func.count()).select_from(Role),),
+    "routes": (select(func.count()).select_from(Route),),
+    "routesOrders": (select(func.count()).select_from(routesOrders),),
+}
+
+class WatermarkRepository(BaseRepository[Order]):
+    """
+    Reads the watermarks of tables, results computed from the tables are stale once one of them changed
+    """
+    def __init__(self, session):
+        super().__init__(Order, session)
+
+    def get(self, tables: tuple[str, ...]) -> tuple:
+        """
+        Gets the watermarks of the tables in one round trip
+
+        Args:
+            tables (tuple): Names of the tables, keys of WATERMARKS
+
+        Returns:
+            tuple: Watermark values of the tables in the given order
+        """
+        aggregates = [statement.scalar_subquery() for table in tables for statement in WATERMARKS[table]]
+        return tuple(self.fetch(select(*aggregates))[0])
@@ -33,6 +33,10 @@ class InvoicesAmount(BaseModel):
     paymentDate: datetime
     invoiceAmount: float
 
+class GrowthBucket(BaseModel):
+    bucket: datetime
+    value: float
+
 # ItemBought Correlation
 
 class OrdersParam(BaseModel):
@@ -0,0 +1,77 @@
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import QueuePool
+from threading import Lock
+from time import perf_counter
+
+# Upper bounds of the checkout latency histogram in milliseconds, the last bucket takes everything above
+CHECKOUT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool that measures how long every checkout takes and how often a checkout has to wait for a connection
+    """
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self._stats_lock = Lock()
+        self._checkouts = 0
+        self._waits = 0
+        self._timeouts = 0
+        self._wait_time = 0.0
+        self._max_wait_time = 0.0
+        self._histogram = [0] * (len(CHECKOUT_BUCKETS_MS) + 1)
+
+    def connect(self):
+        exhausted = self.checkedin() == 0 and self._max_overflow > -1 and self.overflow() >= self._max_overflow
+        start = perf_counter()
+        try:
+            return super().connect()
+        except PoolTimeoutError:
+            with self._stats_lock:
+                self._timeouts += 1
+            raise
+        finally:
+            self._record(perf_counter() - start, exhausted)
+
+    def _record(self, elapsed: float, exhausted: bool) -> None:
+        """
+        Records the latency of a checkout
+
+        Args:
+            elapsed (float): Seconds the checkout took
+            exhausted (bool): If True, no connection was idle and no overflow was left, so the checkout had to wait
+        """
+        elapsed_ms = elapsed * 1000
+        bucket = next((i for i, bound in enumerate(CHECKOUT_BUCKETS_MS) if elapsed_ms <= bound), len(CHECKOUT_BUCKETS_MS))
+
+        with self._stats_lock:
+            self._checkouts += 1
+            self._histogram[bucket] += 1
+            if exhausted:
+                self._waits += 1
+                self._wait_time += elapsed
+                self._max_wait_time = max(self._max_wait_time, elapsed)
+
+    def stats(self) -> dict:
+        """
+        Gets the current state of the pool and the checkout statistics since it was created
+
+        Returns:
+            dict: Pool statistics
+        """
+        with self._stats_lock:
+            histogram = {f"<={bound}ms": count for bound, count in zip(CHECKOUT_BUCKETS_MS, self._histogram)}
+            histogram[f">{CHECKOUT_BUCKETS_MS[-1]}ms"] = self._histogram[-1]
+
+            return {
+                "size": self.size(),
+                "checked_in": self.checkedin(),
+                "checked_out": self.checkedout(),
+                "overflow": max(self.overflow(), 0),
+                "max_overflow": self._max_overflow,
+                "checkouts": self._checkouts,
+                "waits": self._waits,
+                "timeouts": self._timeouts,
+                "wait_time_total_ms": round(self._wait_time * 1000, 3),
+                "wait_time_max_ms": round(self._max_wait_time * 1000, 3),
+                "checkout_latency_histogram": histogram,
+            }
@@ -0,0 +1,108 @@
+from contextlib import contextmanager
+from threading import Lock
+from time import monotonic
+from typing import Iterator
+
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+from sqlalchemy.sql.dml import UpdateBase
+
+# Seconds the replica is behind the primary, zero if it replayed everything it received
+POSTGRESQL_LAG = text(
+    "SELECT CASE WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+)
+
+class ReplicaMonitor:
+    """
+    Checks whether the read replica is reachable and how far it lags behind. The result of a check is reused for
+    check_interval seconds, so only one request per interval pays for it.
+    """
+    def __init__(self, engine: Engine, max_lag: float, check_interval: float) -> None:
+        self.engine = engine
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.lag: float | None = None
+        self.error: str | None = None
+        self._checked_at: float | None = None
+        self._lock = Lock()
+
+    def available(self) -> bool:
+        """
+        Gets whether reads can go to the replica
+
+        Returns:
+            bool: True if the replica is reachable and does not lag more than max_lag seconds
+        """
+        now = monotonic()
+        if self._checked_at is None or now - self._checked_at >= self.check_interval:
+            if self._lock.acquire(blocking=False):
+                try:
+                    self._check()
+                    self._checked_at = monotonic()
+                finally:
+                    self._lock.release()
+
+        return self.error is None and self.lag is not None and self.lag <= self.max_lag
+
+    def _check(self) -> None:
+        """
+        Measures the lag of the replica
+        """
+        try:
+            with self.engine.connect() as connection:
+                if self.engine.dialect.name == "postgresql":
+                    self.lag = float(connection.execute(POSTGRESQL_LAG).scalar() or 0)
+                else:
+                    connection.execute(text("SELECT 1"))
+                    self.lag = 0.0
+            self.error = None
+        except Exception as e:
+            self.lag = None
+            self.error = str(e)
+            print(f"Error while checking the read replica: {e}")
+
+    def status(self) -> dict:
+        """
+        Gets the result of the last check
+
+        Returns:
+            dict: Availability, lag in seconds and the error of the last check
+        """
+        return {"available": self.error is None and self.lag is not None and self.lag <= self.max_lag, "lag": self.lag, "max_lag": self.max_lag, "error": self.error}
+
+
+class RoutingSession(Session):
+    """
+    Session that sends reads to the read replica and writes to the primary. Reads fall back to the primary if there
+    is no replica, it is unavailable or lags too far behind, or if they run inside primary().
+    """
+    def __init__(self, *args, replica: Engine | None = None, monitor: ReplicaMonitor | None = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.replica = replica
+        self.monitor = monitor
+        self._primary = 0
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if (
+            self.replica is None
+            or self._primary
+            or self._flushing
+            or isinstance(clause, UpdateBase)
+            or (self.monitor is not None and not self.monitor.available())
+        ):
+            return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+        return self.replica
+
+    @contextmanager
+    def primary(self) -> Iterator["RoutingSession"]:
+        """
+        Sends all statements inside the block to the primary, e.g. reads of tables the block writes to
+        """
+        self._primary += 1
+        try:
+            yield self
+        finally:
+            self._primary -= 1
@@ -0,0 +1,76 @@
+import logging
+from os import getenv
+from threading import Event, Thread
+
+from sqlalchemy.engine import Engine
+
+from DataAnalysis.db.model import DailyRollup, RollupWatermark
+from DataAnalysis.db.models.Rollup import ROLLUPS, RollupRepository
+
+from dotenv import load_dotenv
+load_dotenv()
+
+# Seconds between two refreshes of the rollups
+ROLLUP_REFRESH_INTERVAL = float(getenv("ROLLUP_REFRESH_INTERVAL", 10))
+
+logger = logging.getLogger(__name__)
+
+def createRollupTables(engine: Engine) -> None:
+    """
+    Creates the rollup tables if they do not exist yet, run once when the service starts
+
+    Args:
+        engine (Engine): Engine of the primary database
+    """
+    with engine.begin() as connection:
+        DailyRollup.__table__.create(connection, checkfirst=True)
+        RollupWatermark.__table__.create(connection, checkfirst=True)
+
+def refreshRollups(session_factory) -> dict[str, bool]:
+    """
+    Refreshes every rollup, each in its own session, so a failing rollup does not affect the others
+
+    Args:
+        session_factory: Creates the sessions of the refreshes, e.g. SessionLocal
+
+    Returns:
+        dict: Per rollup True if it was refreshed, False if another worker is refreshing it or the refresh failed
+    """
+    refreshed = {}
+    for rollup in ROLLUPS:
+        with session_factory() as session:
+            try:
+                refreshed[rollup] = RollupRepository(session, rollup).refresh()
+            except Exception:
+                session.rollback()
+                logger.exception("Error while refreshing the %s rollup", rollup)
+                refreshed[rollup] = False
+
+    return refreshed
+
+
+class RollupRefresher:
+    """
+    Background thread refreshing the rollups every interval seconds, started and stopped with the API
+    """
+    def __init__(self, session_factory, interval: float = ROLLUP_REFRESH_INTERVAL) -> None:
+        self.session_factory = session_factory
+        self.interval = interval
+        self._stopped = Event()
+        self._thread: Thread | None = None
+
+    def start(self) -> None:
+        self._stopped.clear()
+        self._thread = Thread(target=self._run, name="rollup-refresher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            refreshRollups(self.session_factory)
+            self._stopped.wait(self.interval)
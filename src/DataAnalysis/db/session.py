@@ -3,16 +3,77 @@ from dotenv import load_dotenv
 
 from sqlalchemy import (
     MetaData,
-    create_engine
+    create_engine,
+    make_url
 )
 
 load_dotenv()
 from sqlalchemy.orm import sessionmaker
 
+from DataAnalysis.db.pool import InstrumentedQueuePool
+from DataAnalysis.db.instrumentation import instrumentEngine
+from DataAnalysis.db.replica import ReplicaMonitor, RoutingSession
+
 DATABASE_URL = os.getenv("DATABASE_URL")
 
+# Read replica, reads fall back to the primary if it is not set, unavailable or lags more than REPLICA_MAX_LAG seconds
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL")
+REPLICA_MAX_LAG = float(os.getenv("REPLICA_MAX_LAG", 30))
+REPLICA_CHECK_INTERVAL = float(os.getenv("REPLICA_CHECK_INTERVAL", 5))
+
+# Compiled statements kept per engine. The statements of the repositories are built once at import, so they are
+# compiled once and then only looked up in this cache
+STATEMENT_CACHE_SIZE = int(os.getenv("STATEMENT_CACHE_SIZE", 1200))
+# Executions of a statement before psycopg 3 prepares it server-side. psycopg2 and sqlite have no server-side prepared statements.
+PREPARE_THRESHOLD = int(os.getenv("PREPARE_THRESHOLD", 2))
+
+def get_connect_args(url: str) -> dict:
+    """
+    Gets the connect arguments of the driver of the URL that enable server-side prepared statements
+
+    Args:
+        url (str): Database URL
+
+    Returns:
+        dict: Connect arguments, empty if the driver does not prepare statements
+    """
+    drivername = make_url(url).drivername
+    if drivername == "postgresql+psycopg":
+        return {"prepare_threshold": PREPARE_THRESHOLD}
+    return {}
+
 # SQLAlchemy
-engine = create_engine(DATABASE_URL, pool_pre_ping=True, pool_size=10, max_overflow=20)
+engine = create_engine(DATABASE_URL, poolclass=InstrumentedQueuePool, pool_pre_ping=True, pool_size=10, max_overflow=20,
+                       query_cache_size=STATEMENT_CACHE_SIZE, connect_args=get_connect_args(DATABASE_URL))
+instrumentEngine(engine)
 metadata = MetaData()
 
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+replica_engine = None
+replica_monitor = None
+if REPLICA_DATABASE_URL:
+    replica_engine = create_engine(REPLICA_DATABASE_URL, poolclass=InstrumentedQueuePool, pool_pre_ping=True, pool_size=10, max_overflow=20,
+                                   query_cache_size=STATEMENT_CACHE_SIZE, connect_args=get_connect_args(REPLICA_DATABASE_URL))
+    instrumentEngine(replica_engine)
+    replica_monitor = ReplicaMonitor(replica_engine, max_lag=REPLICA_MAX_LAG, check_interval=REPLICA_CHECK_INTERVAL)
+
+SessionLocal = sessionmaker(class_=RoutingSession, autocommit=False, autoflush=False, bind=engine, replica=replica_engine, monitor=replica_monitor)
+
+def get_pool_stats() -> dict:
+    """
+    Gets the statistics of the connection pool
+
+    Returns:
+        dict: Checked out connections, overflow, wait time and checkout latency histogram
+    """
+    return engine.pool.stats()
+
+def get_replica_stats() -> dict | None:
+    """
+    Gets the state of the read replica and the statistics of its connection pool
+
+    Returns:
+        dict | None: Availability, lag and pool statistics of the replica or None if no replica is configured
+    """
+    if replica_engine is None:
+        return None
+    return {**replica_monitor.status(), "pool": replica_engine.pool.stats()}
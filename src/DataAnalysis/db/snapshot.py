@@ -0,0 +1,234 @@
+from datetime import datetime
+from threading import Lock
+from time import monotonic
+from types import MappingProxyType
+from os import getenv
+
+import numpy as np
+import pandas as pd
+
+from DataAnalysis.db.models.Snapshot import SnapshotRepository
+from DataAnalysis.db.models.queryparams import RouteClassifierParam
+
+from dotenv import load_dotenv
+load_dotenv()
+
+# Seconds a snapshot is used at most, also picks up changes the watermark does not see, e.g. renamed products
+SNAPSHOT_TTL = float(getenv("SNAPSHOT_TTL", 600))
+# Seconds between two watermark checks, reads within this time use the snapshot as it is
+SNAPSHOT_CHECK_INTERVAL = float(getenv("SNAPSHOT_CHECK_INTERVAL", 10))
+
+class StarSnapshot:
+    """
+    Read-only columnar snapshot of the order star schema: orders, ordersProducts, products, customers, addresses and
+    routesOrders. Every table is a dictionary of column name to NumPy array. Key columns hold the keys, foreign key
+    columns are dictionary encoded and hold the row of the referenced table instead, -1 if it does not exist. So joins
+    are array lookups and no UUID is held per ordersProducts row. Dates are datetime64.
+    """
+    def __init__(self, tables: dict[str, dict[str, np.ndarray]], watermark: tuple) -> None:
+        for columns in tables.values():
+            for array in columns.values():
+                array.flags.writeable = False
+
+        self.orders = MappingProxyType(tables["orders"])
+        self.ordersProducts = MappingProxyType(tables["ordersProducts"])
+        self.products = MappingProxyType(tables["products"])
+        self.customers = MappingProxyType(tables["customers"])
+        self.addresses = MappingProxyType(tables["addresses"])
+        self.routes = MappingProxyType(tables["routes"])
+        self.routesOrders = MappingProxyType(tables["routesOrders"])
+        self.watermark = watermark
+        self.loaded_at = datetime.now()
+
+    @classmethod
+    def load(cls, repository: SnapshotRepository) -> "StarSnapshot":
+        """
+        Loads the snapshot, the ordersProducts rows are streamed and encoded chunk by chunk
+
+        Args:
+            repository (SnapshotRepository): Repository to read the tables with
+
+        Returns:
+            StarSnapshot: The loaded snapshot
+        """
+        watermark = repository.getWatermark()
+
+        products = repository.getProducts()
+        addresses = repository.getAddresses()
+        customers = repository.getCustomers()
+        orders = repository.getOrders()
+        routes_orders = repository.getRoutesOrders()
+
+        order_index = pd.Index(orders["orderId"])
+        product_index = pd.Index(products["productId"])
+
+        order_codes, product_codes, amounts, dates = [], [], [], []
+        for chunk in repository.streamOrdersProducts():
+            order_codes.append(_encode(order_index, chunk["orderId"]))
+            product_codes.append(_encode(product_index, chunk["productId"]))
+            amounts.append(np.asarray(chunk["productAmount"], dtype=np.int64))
+            dates.append(_dates(chunk["orderDate"]))
+
+        route_codes, route_ids = pd.factorize(routes_orders["routeId"])
+
+        tables = {
+            "products": {
+                "productId": products["productId"],
+                "name": products["name"],
+            },
+            "addresses": {
+                "addressId": addresses["addressId"],
+                "latitude": np.asarray(addresses["latitude"], dtype=np.float64),
+                "longitude": np.asarray(addresses["longitude"], dtype=np.float64),
+            },
+            "customers": {
+                "customerReference": customers["customerReference"],
+                "signedUp": _dates(customers["signedUp"]),
+                "addressId": _encode(pd.Index(addresses["addressId"]), customers["addressId"]),
+            },
+            "orders": {
+                "orderId": orders["orderId"],
+                "orderDate": _dates(orders["orderDate"]),
+                "customerReference": _encode(pd.Index(customers["customerReference"]), orders["customerReference"]),
+            },
+            "ordersProducts": {
+                "orderId": _concatenate(order_codes, np.int32),
+                "productId": _concatenate(product_codes, np.int32),
+                "productAmount": _concatenate(amounts, np.int64),
+                "orderDate": _concatenate(dates, "datetime64[us]"),
+            },
+            "routes": {
+                "routeId": np.asarray(route_ids, dtype=object),
+            },
+            "routesOrders": {
+                "routeId": route_codes.astype(np.int32),
+                "orderId": _encode(order_index, routes_orders["orderId"]),
+            },
+        }
+
+        return cls(tables, watermark)
+
+    def getRouteCoordinates(self) -> list[RouteClassifierParam]:
+        """
+        Joins routesOrders over orders and customers to the coordinates of the addresses, rows without a match are dropped
+
+        Returns:
+            list: Route ID and the coordinates of every routesOrders row, missing coordinates are None
+        """
+        rows = self.routesOrders["orderId"]
+        customers = _lookup(self.orders["customerReference"], rows)
+        addresses = _lookup(self.customers["addressId"], customers)
+
+        mask = addresses >= 0
+        route_ids = self.routes["routeId"][self.routesOrders["routeId"][mask]]
+        latitudes = self.addresses["latitude"][addresses[mask]]
+        longitudes = self.addresses["longitude"][addresses[mask]]
+
+        return [
+            RouteClassifierParam.model_construct(
+                routeId=route_id,
+                latitude=None if np.isnan(latitude) else float(latitude),
+                longitude=None if np.isnan(longitude) else float(longitude),
+            )
+            for route_id, latitude, longitude in zip(route_ids, latitudes, longitudes)
+        ]
+
+
+class SnapshotManager:
+    """
+    Keeps one snapshot per process and hands it to every analysis. The snapshot is loaded again once it is older than
+    the TTL or the watermark of the tables changed, which is checked at most every check_interval seconds. Only one
+    request loads at a time, the others wait for it and use its snapshot.
+    """
+    def __init__(self, ttl: float, check_interval: float) -> None:
+        self.ttl = ttl
+        self.check_interval = check_interval
+        self.loads = 0
+        self._snapshot: StarSnapshot | None = None
+        self._loaded_at: float | None = None
+        self._checked_at: float | None = None
+        self._lock = Lock()
+
+    def get(self, repository: SnapshotRepository, fresh: bool = False) -> StarSnapshot:
+        """
+        Gets the snapshot, loads it first if it is missing or stale
+
+        Args:
+            repository (SnapshotRepository): Repository to check the watermark and load the tables with
+            fresh (bool, optional): If True, the watermark is checked now instead of once per check_interval and the
+                snapshot is never older than the tables. Defaults to False.
+
+        Returns:
+            StarSnapshot: Current snapshot
+
+        Raises:
+            Exception: If no snapshot could be loaded yet, or if fresh is True and it could not be refreshed
+        """
+        with self._lock:
+            now = monotonic()
+            try:
+                if self._snapshot is None or now - self._loaded_at >= self.ttl:
+                    self._load(repository)
+                elif fresh or now - self._checked_at >= self.check_interval:
+                    self._checked_at = now
+                    if repository.getWatermark() != self._snapshot.watermark:
+                        self._load(repository)
+            except Exception as e:
+                if self._snapshot is None or fresh:
+                    raise
+                print(f"Error while refreshing the snapshot: {e}")
+
+            return self._snapshot
+
+    def invalidate(self) -> None:
+        """
+        Loads the snapshot again on the next get
+        """
+        with self._lock:
+            self._snapshot = None
+
+    def _load(self, repository: SnapshotRepository) -> None:
+        """
+        Loads the snapshot, the lock has to be held
+        """
+        self._snapshot = StarSnapshot.load(repository)
+        self._loaded_at = self._checked_at = monotonic()
+        self.loads += 1
+
+
+snapshot_manager = SnapshotManager(SNAPSHOT_TTL, SNAPSHOT_CHECK_INTERVAL)
+
+def getSnapshot(session, fresh: bool = False) -> StarSnapshot:
+    """
+    Gets the snapshot of the order star schema shared by the analyses
+
+    Args:
+        session (Session): Session to load the snapshot with if it is stale
+        fresh (bool, optional): If True, the snapshot is checked against the tables now, for results that are cached
+            under the current watermark of the tables. Defaults to False.
+
+    Returns:
+        StarSnapshot: Read-only snapshot
+    """
+    return snapshot_manager.get(SnapshotRepository(session), fresh)
+
+
+def _encode(index: pd.Index, values: np.ndarray) -> np.ndarray:
+    """
+    Gets the row of every value in the key column of the index, -1 if the key does not exist
+    """
+    if len(values) == 0:
+        return np.array([], dtype=np.int32)
+    return index.get_indexer(values).astype(np.int32)
+
+def _lookup(codes: np.ndarray, rows: np.ndarray) -> np.ndarray:
+    """
+    Gets the codes of the given rows, -1 stays -1
+    """
+    return np.where(rows >= 0, codes[np.maximum(rows, 0)] if len(codes) else -1, -1).astype(np.int32)
+
+def _dates(values: np.ndarray) -> np.ndarray:
+    return np.asarray(values).astype("datetime64[us]")
+
+def _concatenate(arrays: list[np.ndarray], dtype) -> np.ndarray:
+    return np.concatenate(arrays) if arrays else np.array([], dtype=dtype)
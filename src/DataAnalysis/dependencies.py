@@ -1,9 +1,53 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from sqlalchemy.orm import Session
+
 from DataAnalysis.db.session import SessionLocal
 
+_current_session: ContextVar[Session | None] = ContextVar("current_session", default=None)
+
 def get_db():
+    session = _current_session.get()
+    if session is not None:
+        yield session
+        return
+
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
 
+@contextmanager
+def session_scope() -> Iterator[Session]:
+    """
+    Opens a session that is shared by everything running inside the scope, e.g. one API request, and closes it when the scope ends,
+    so its connection goes back to the pool
+
+    Yields:
+        Session: Session of the scope
+    """
+    session = _current_session.get()
+    if session is not None:
+        yield session
+        return
+
+    session = SessionLocal()
+    token = _current_session.set(session)
+    try:
+        yield session
+    finally:
+        _current_session.reset(token)
+        session.close()
+
+def get_session() -> Session | None:
+    """
+    Gets the session of the current scope
+
+    Returns:
+        Session | None: Session of the current scope or None if no scope is open
+    """
+    return _current_session.get()
+
@@ -0,0 +1,211 @@
+from datetime import date
+from threading import Lock
+from os import getenv
+import numpy as np
+
+from dotenv import load_dotenv
+load_dotenv()
+
+# NumPy unit of the buckets of every granularity, a bucket is the integer offset in this unit since 1970
+UNITS = {"day": "D", "week": "D", "month": "M", "quarter": "M", "year": "Y"}
+# Units per bucket and the shift of the first bucket of the granularities spanning several units, ISO weeks start on
+# Monday 1969-12-29, three days before 1970-01-01
+SPANS = {"week": (7, 3), "quarter": (3, 0)}
+GRANULARITIES = tuple(UNITS)
+# Frequency code of every granularity in columnar results
+FREQUENCIES = {"day": "D", "week": "W", "month": "M", "quarter": "Q", "year": "Y"}
+# First day the calendars cover initially, they are extended if a bucket lies outside
+CALENDAR_START = getenv("CALENDAR_START", "2000-01-01")
+# Buckets the calendars cover after the current one, so they do not have to be extended every day
+CALENDAR_AHEAD = {"day": 366, "week": 53, "month": 12, "quarter": 4, "year": 1}
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+class Calendar:
+    """
+    Dense calendar of one granularity. Every bucket from first to last is an integer offset since 1970, its labels are
+    formatted once when the calendar is built, so zero filling is a range of offsets and keys are array lookups.
+    Weeks are labeled by their ISO year and week, e.g. "2024-W05", quarters like "2024-Q1".
+    """
+    def __init__(self, granularity: str, first: int, last: int) -> None:
+        """
+        Args:
+            granularity (str): One of GRANULARITIES
+            first (int): Offset of the first bucket
+            last (int): Offset of the last bucket, inclusive
+        """
+        self.granularity = granularity
+        self.first = first
+        self.last = last
+
+        offsets = np.arange(first, last + 1)
+        if granularity == "week":
+            self._labels = self._keys = _weekLabels(offsets)
+            return
+        if granularity == "quarter":
+            self._labels = self._keys = np.array([f"{i // 4 + 1970}-Q{i % 4 + 1}" for i in offsets.tolist()], dtype=object)
+            return
+
+        unit = UNITS[granularity]
+        stamps = offsets.astype(f"datetime64[{unit}]")
+
+        self._labels = np.datetime_as_string(stamps, unit=unit).astype(object)
+        if granularity == "day":
+            self._keys = stamps.astype(object)
+        elif granularity == "year":
+            self._keys = (np.arange(first, last + 1) + 1970).astype(object)
+        else:
+            self._keys = self._labels
+
+    def covers(self, first: int, last: int) -> bool:
+        return self.first <= first and last <= self.last
+
+    def labels(self, offsets: np.ndarray) -> list:
+        """
+        Gets the labels of the buckets: "%Y-%m-%d", "%G-W%V", "%Y-%m", "%Y-Q<quarter>" or "%Y" strings
+
+        Args:
+            offsets (np.ndarray): Offsets of the buckets
+
+        Returns:
+            list: Label of every bucket
+        """
+        return self._labels[np.asarray(offsets, dtype=np.int64) - self.first].tolist()
+
+    def keys(self, offsets: np.ndarray) -> list:
+        """
+        Gets the keys of the buckets: dates for days, years as integers and the labels for the other granularities
+
+        Args:
+            offsets (np.ndarray): Offsets of the buckets
+
+        Returns:
+            list: Key of every bucket
+        """
+        return self._keys[np.asarray(offsets, dtype=np.int64) - self.first].tolist()
+
+
+_calendars: dict[str, Calendar] = {}
+_lock = Lock()
+
+def getCalendar(granularity: str, first: int | None = None, last: int | None = None) -> Calendar:
+    """
+    Gets the cached calendar of the granularity, it is built again with a wider range if it does not cover first to last
+
+    Args:
+        granularity (str): One of GRANULARITIES
+        first (int, optional): Offset of the first bucket needed. Defaults to None, which means the current bucket.
+        last (int, optional): Offset of the last bucket needed. Defaults to None, which means the current bucket.
+
+    Returns:
+        Calendar: Calendar covering at least CALENDAR_START to the current bucket and first to last
+
+    Raises:
+        ValueError: If the granularity is unknown
+    """
+    current = currentOffset(granularity)
+    first = current if first is None else int(first)
+    last = current if last is None else int(last)
+
+    with _lock:
+        calendar = _calendars.get(granularity)
+        if calendar is None or not calendar.covers(first, last):
+            start = int(toOffsets(np.datetime64(CALENDAR_START, "D"), granularity))
+            end = current + CALENDAR_AHEAD[granularity]
+            if calendar is not None:
+                start, end = min(start, calendar.first), max(end, calendar.last)
+
+            calendar = Calendar(granularity, min(start, first), max(end, last))
+            _calendars[granularity] = calendar
+
+        return calendar
+
+def toOffsets(dates: np.ndarray, granularity: str) -> np.ndarray:
+    """
+    Maps datetime64 values to the integer offset of their bucket since 1970
+
+    Args:
+        dates (np.ndarray): datetime64 values
+        granularity (str): One of GRANULARITIES
+
+    Returns:
+        np.ndarray: Offsets in days, weeks, months, quarters or years
+
+    Raises:
+        ValueError: If the granularity is unknown
+    """
+    if granularity not in UNITS:
+        raise ValueError(f"Unknown granularity: {granularity}")
+
+    offsets = np.asarray(dates).astype(f"datetime64[{UNITS[granularity]}]").astype(np.int64)
+    if granularity in SPANS:
+        size, shift = SPANS[granularity]
+        offsets = (offsets + shift) // size
+    return offsets
+
+def toDays(dates: list[date]) -> np.ndarray:
+    """
+    Maps dates or datetimes to datetime64 days by their ordinal, the time of day is dropped. This is much faster than
+    letting NumPy convert the Python objects.
+
+    Args:
+        dates (list): Dates or datetimes
+
+    Returns:
+        np.ndarray: datetime64 days
+    """
+    days = np.fromiter((i.toordinal() for i in dates), dtype=np.int64, count=len(dates)) - EPOCH_ORDINAL
+    return days.astype("datetime64[D]")
+
+def shiftMonths(days: np.ndarray, months: int) -> np.ndarray:
+    """
+    Shifts days by whole months, days missing in the target month become its last day, e.g. 2024-03-31 minus one month
+    is 2024-02-29
+
+    Args:
+        days (np.ndarray): datetime64 days
+        months (int): Months to shift by, negative values shift back
+
+    Returns:
+        np.ndarray: Shifted datetime64 days
+    """
+    days = np.asarray(days).astype("datetime64[D]")
+    month = days.astype("datetime64[M]")
+    day_of_month = days - month.astype("datetime64[D]")
+
+    shifted = month + months
+    month_length = (shifted + 1).astype("datetime64[D]") - shifted.astype("datetime64[D]")
+    return shifted.astype("datetime64[D]") + np.minimum(day_of_month, month_length - 1)
+
+def currentOffset(granularity: str) -> int:
+    """
+    Gets the offset of the current bucket
+    """
+    return int(toOffsets(np.datetime64(date.today(), "D"), granularity))
+
+def fillForward(values: np.ndarray, skip_zeros: bool = False) -> np.ndarray:
+    """
+    Replaces missing values with the previous value, leading ones become zero
+
+    Args:
+        values (np.ndarray): Float values, missing ones are NaN
+        skip_zeros (bool, optional): If True, zeros are replaced like missing values. Defaults to False.
+
+    Returns:
+        np.ndarray: Forward filled values
+    """
+    valid = ~np.isnan(values)
+    if skip_zeros:
+        valid &= values != 0
+    index = np.where(valid, np.arange(len(values)), -1)
+    np.maximum.accumulate(index, out=index)
+    return np.where(index >= 0, values[np.maximum(index, 0)], 0.0)
+
+def _weekLabels(offsets: np.ndarray) -> np.ndarray:
+    """
+    Gets the ISO labels of week offsets. The Thursday of week k is day 7k since 1970, its year is the ISO year and the
+    week number counts the Thursdays of that year up to it.
+    """
+    thursdays = (offsets * 7).astype("datetime64[D]")
+    years = thursdays.astype("datetime64[Y]")
+    weeks = (thursdays - years.astype("datetime64[D]")).astype(np.int64) // 7 + 1
+    return np.array([f"{year}-W{week:02d}" for year, week in zip((years.astype(np.int64) + 1970).tolist(), weeks.tolist())], dtype=object)
@@ -0,0 +1,234 @@
+from DataAnalysis.db.models.BaseRepository import BaseRepository
+from DataAnalysis.db.models.queryparams import GrowthBucket
+from DataAnalysis.descriptive.PrefixSumIndex import PrefixSumIndex
+from DataAnalysis.descriptive.GrowthEngine import GrowthEngine, rolling
+from DataAnalysis.descriptive.Calendar import getCalendar, toOffsets
+from datetime import date, datetime, time, timedelta
+from threading import Lock
+import numpy as np
+
+# NumPy unit the days are truncated to per granularity
+TRUNCATE = {"day": "D", "month": "M", "year": "Y"}
+
+class DailyAggregate:
+    """
+    In-process daily aggregate of a growth analysis. The first update reads all days, every further update only reads
+    the days from the watermark on, which is the latest day already ingested, and merges them into the aggregate.
+    The aggregated tables only grow, so days before the watermark normally never change. If they do, which is checked
+    with one sum per update, the aggregate is read again. Sums and windows are answered by a prefix sum index over the
+    days, which is built again after an update changed them.
+    """
+    def __init__(self) -> None:
+        self.days: dict[datetime, int] = {}
+        self.watermark: datetime | None = None
+        self._index: PrefixSumIndex | None = None
+        self._lock = Lock()
+
+    def update(self, repository) -> None:
+        """
+        Fetches the days from the watermark on and merges them into the aggregate
+
+        Args:
+            repository: Repository providing getBuckets(granularity, since=...) and getTotalBefore(before) for the analysis
+        """
+        with self._lock:
+            if self.watermark is not None and repository.getTotalBefore(self.watermark) != self._sumBefore(self.watermark):
+                # Rows were added before the watermark, the aggregate is read again
+                self.days, self.watermark, self._index = {}, None, None
+
+            buckets = repository.getBuckets("day", since=self.watermark)
+
+            for i in buckets:
+                if self.days.get(i.bucket) != i.value:
+                    self.days[i.bucket] = i.value
+                    self._index = None
+
+            if self.days:
+                self.watermark = max(self.days)
+
+    def getBuckets(self, granularity: str, last_days: int = 0, date_from: datetime | None = None, date_to: datetime | None = None) -> list[GrowthBucket]:
+        """
+        Buckets the aggregated days by day, month or year
+
+        Args:
+            granularity (str): One of "day", "month" or "year"
+            last_days (int, optional): Only days of the last days are bucketed. Defaults to 0, which means no window.
+            date_from (datetime, optional): First day to bucket. Defaults to None, which means no lower bound.
+            date_to (datetime, optional): Last day to bucket, inclusive. Defaults to None, which means up to today.
+
+        Returns:
+            list: Buckets containing the bucket start and the value, ordered by bucket
+
+        Raises:
+            ValueError: If the granularity is unknown
+        """
+        if granularity not in TRUNCATE:
+            raise ValueError(f"Unknown granularity: {granularity}")
+
+        start = BaseRepository.window_start(last_days) if last_days > 0 else None
+        if date_from is not None:
+            start = date_from if start is None else max(start, date_from)
+
+        end = BaseRepository._until("day") + timedelta(microseconds=1) # Exclusive bound of the index
+        if date_to is not None:
+            end = min(end, _nextDay(date_to))
+
+        with self._lock:
+            days, values = self._getIndex().slice(start, end)
+
+        if len(days) == 0:
+            return []
+
+        buckets = days.astype(f"datetime64[{TRUNCATE[granularity]}]").astype("datetime64[us]")
+        starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+        sums = np.add.reduceat(values, starts) if granularity != "day" else values
+
+        return [GrowthBucket.model_construct(bucket=bucket, value=value) for bucket, value in zip(buckets[starts].astype(object).tolist(), sums.tolist())]
+
+    def getRolling(self, windows: tuple[int, ...], last_days: int = 0, date_from: datetime | None = None, date_to: datetime | None = None) -> dict:
+        """
+        Gets the moving sums and averages of the aggregated days. The days before the range are read as well, so the
+        first windows of the range are complete. Days without a value count as zero.
+
+        Args:
+            windows (tuple): Days of the windows
+            last_days (int, optional): Only the last days are returned. Defaults to 0, which means no window.
+            date_from (datetime, optional): First day to return. Defaults to None, which means the first aggregated day.
+            date_to (datetime, optional): Last day to return, inclusive. Defaults to None, which means up to today.
+
+        Returns:
+            dict: Per window the moving sums and averages by "%Y-%m-%d", e.g. {7: {"sum": {...}, "average": {...}}}
+        """
+        start = BaseRepository.window_start(last_days) if last_days > 0 else None
+        if date_from is not None:
+            start = date_from if start is None else max(start, date_from)
+
+        end = date.today() if date_to is None else min(date.today(), date_to.date() if isinstance(date_to, datetime) else date_to)
+        warm_up = max(windows) - 1
+
+        with self._lock:
+            index = self._getIndex()
+            if start is None and len(index.dates) == 0:
+                return {window: {"sum": {}, "average": {}} for window in windows}
+
+            first = int(toOffsets(index.dates[0] if start is None else np.datetime64(start, "us"), "day"))
+            last = int(toOffsets(np.datetime64(end, "D"), "day"))
+            days, values = index.slice(np.datetime64(first - warm_up, "D").astype(datetime), _nextDay(end))
+
+        series = GrowthEngine(days, values).dense("day", first - warm_up, last)
+        offsets = np.arange(first, last + 1)
+        if last_days > 0:
+            offsets = offsets[-last_days:]
+        labels = getCalendar("day", first, last).labels(offsets)
+
+        result = {}
+        for window in windows:
+            sums, averages = rolling(series, window)
+            sums, averages = sums[len(series) - len(offsets):], averages[len(series) - len(offsets):]
+            sums = np.rint(sums).astype(np.int64) if series.dtype.kind in "iub" else np.round(sums, 2)
+            result[window] = {"sum": dict(zip(labels, sums.tolist())), "average": dict(zip(labels, np.round(averages, 2).tolist()))}
+
+        return result
+
+    def getTotal(self, date_from: date | None = None, date_to: date | None = None) -> int:
+        """
+        Sums up the aggregated days of a date range with two binary searches
+
+        Args:
+            date_from (date, optional): First day of the range. Defaults to None, which means no lower bound.
+            date_to (date, optional): Last day of the range, inclusive. Defaults to None, which means no upper bound.
+
+        Returns:
+            int: Sum of the values
+        """
+        with self._lock:
+            return self._getIndex().total(date_from, None if date_to is None else _nextDay(date_to))
+
+    def getTotalBefore(self, before: datetime) -> int:
+        """
+        Sums up the aggregated days before the given point in time
+
+        Args:
+            before (datetime): Exclusive upper bound
+
+        Returns:
+            int: Sum of the values
+        """
+        with self._lock:
+            return self._sumBefore(before)
+
+    def getCursor(self, date_to: date | None = None) -> str:
+        """
+        Gets the cursor of the aggregate: the last day of the range and the sum of the days before it. A client holding
+        the buckets of this state only needs the buckets from that day on as long as the sum stays the same.
+
+        Args:
+            date_to (date, optional): Last day of the range, inclusive. Defaults to None, which means today.
+
+        Returns:
+            str: Cursor like "2024-05-03:1520"
+        """
+        day = date.today()
+        if date_to is not None:
+            day = min(day, date_to.date() if isinstance(date_to, datetime) else date_to)
+        return f"{day.isoformat()}:{self.getTotalBefore(datetime.combine(day, time.min))}"
+
+    def getSince(self, cursor: str) -> date | None:
+        """
+        Gets the first day whose buckets may have changed since the cursor was issued
+
+        Args:
+            cursor (str): Cursor of getCursor
+
+        Returns:
+            date | None: Day of the cursor, None if days before it changed since and everything has to be sent again
+
+        Raises:
+            ValueError: If the cursor is malformed
+        """
+        day, separator, total = cursor.partition(":")
+        if not separator or not total:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        day = date.fromisoformat(day)
+
+        if str(self.getTotalBefore(datetime.combine(day, time.min))) != total:
+            return None
+        return day
+
+    def _sumBefore(self, before: datetime) -> int:
+        """
+        Sums up the aggregated days before the given point in time, the lock has to be held
+        """
+        return self._getIndex().total(None, before)
+
+    def _getIndex(self) -> PrefixSumIndex:
+        """
+        Gets the prefix sum index of the days, builds it if the days changed, the lock has to be held
+        """
+        if self._index is None:
+            self._index = PrefixSumIndex.fromDays(self.days)
+        return self._index
+
+
+def _nextDay(day: date) -> datetime:
+    """
+    Gets midnight of the day after the given date or datetime
+    """
+    day = day.date() if isinstance(day, datetime) else day
+    return datetime.combine(day + timedelta(days=1), time.min)
+
+_aggregates: dict[str, DailyAggregate] = {}
+_aggregates_lock = Lock()
+
+def getAggregate(name: str) -> DailyAggregate:
+    """
+    Gets the aggregate of the given name, it is kept for the lifetime of the process
+
+    Args:
+        name (str): Name of the aggregate, e.g. the rollup of the analysis
+
+    Returns:
+        DailyAggregate: Aggregate of the name
+    """
+    with _aggregates_lock:
+        return _aggregates.setdefault(name, DailyAggregate())
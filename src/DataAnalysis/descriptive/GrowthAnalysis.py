@@ -0,0 +1,248 @@
+from DataAnalysis.descriptive.DescriptiveAnalysis import DescriptiveAnalysis
+from DataAnalysis.DataCollector import DataCollector
+from DataAnalysis.db.models.BaseRepository import BaseRepository
+from DataAnalysis.db.models.Rollup import RollupRepository
+from DataAnalysis.descriptive.DailyAggregate import getAggregate
+from DataAnalysis.db.models.queryparams import GrowthBucket
+from DataAnalysis.descriptive.dependencies import calculate_percentage_growth
+from DataAnalysis.descriptive.GrowthEngine import GrowthEngine, ROLLING_WINDOWS
+from DataAnalysis.descriptive.Calendar import GRANULARITIES
+
+from datetime import date, datetime, time
+
+TYPEOFGRAPH = "line"
+
+
+class GrowthAnalysis(DataCollector, DescriptiveAnalysis):
+    """ Trend of a table growing over time, e.g. orders, signups or invoice amounts
+
+    Subclasses set the rollup and the repository of the raw rows, and the keys of the result if they differ.
+    """
+    rollup: str
+    repository_class: type[BaseRepository]
+    # Keys of the growth and the cumulative growth in the result
+    keys: tuple[str, str] = ("growth", "cumulative_growth")
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.aggregate = getAggregate(self.rollup)
+        self.repository = self.repository_class(self.db)
+
+    def collect(self) -> list[GrowthBucket]:
+        """
+        Collects the rows from the in-process daily aggregate, which only fetches the days not ingested yet from the daily rollup (or from the raw rows while the rollup is behind), bucketed by the granularity of the current analysis
+
+        Returns:
+            list: List of buckets containing the bucket start and the value
+        """
+        try:
+            rollup = RollupRepository(self.db, self.rollup)
+            if rollup.isCurrent():
+                self.repository = rollup # Reads the daily rollup instead of the raw rows
+            self.aggregate.update(self.repository)
+            return self.aggregate.getBuckets(self.granularity, self.last_days, self.date_from, self.date_to)
+        except ConnectionRefusedError as e:
+            print("Connection refused: ", e)
+        except ConnectionError as e:
+            print("Connection error: ", e)
+        except Exception as e:
+            print("Error: ", e)
+
+    def perform(self, last_days: int = 0, year: bool = False, month: bool = False, showzeros: bool = False, percentage: bool = False, cumulative: bool = False, year_over_year: bool = False, last_month: bool = False, date_from: date | None = None, date_to: date | None = None, rolling: bool = False) -> dict:
+        """
+        Perform the analysis
+
+        Args:
+            last_days (int, optional): Number of days to consider. Defaults to 0.
+            year (bool, optional): If True, returns the yearly growth. Defaults to False.
+            month (bool, optional): If True, returns the monthly growth. Defaults to False.
+            showzeros (bool, optional): If True, shows the buckets with zero growth. Defaults to False.
+            percentage (bool, optional): If True, shows the percentage growth in relation to the previous period. Defaults to False.
+            cumulative (bool, optional): If True, cumulative growth is calculated. Defaults to False.
+            year_over_year (bool, optional): If True, the percentage is also calculated in relation to the same period one year earlier. Defaults to False.
+            last_month (bool, optional): If True, the percentage is also calculated in relation to the same period one month earlier. Defaults to False.
+            date_from (date, optional): First day to consider. Defaults to None, which means no lower bound.
+            date_to (date, optional): Last day to consider, inclusive. Defaults to None, which means up to today.
+            rolling (bool, optional): If True, the moving sums and averages of the last 7, 30 and 90 days are added to the daily growth. Defaults to False.
+
+        Returns:
+            dict: Dictionary containing the growth and the cumulative growth, the growth as percentages if percentage is True, and the type of graph
+
+        Raises:
+            ValueError: If the number of days is less than zero
+            Exception: If no data is found
+        """
+        if last_days < 0:
+            raise ValueError("The number of days should be greater than zero")
+
+        self.cumulative = cumulative
+        self.year_over_year = year_over_year
+        self.last_month = last_month
+        self.rolling = rolling
+        self.date_from = datetime.combine(date_from, time.min) if date_from is not None else None
+        self.date_to = datetime.combine(date_to, time.min) if date_to is not None else None
+
+        self.granularity = "year" if year else "month" if month else "day"
+        self.last_days = last_days if self.granularity == "day" else 0
+
+        data = self.collect()
+
+        if data == None:
+            raise Exception("No data found")
+
+        if year:
+            return self._getYearlyGrowth(data, showzeros, percentage)
+
+        elif month:
+            return self._getMonthlyGrowth(data, showzeros, percentage)
+
+        else:
+            return self._getGrowthByDays(data, last_days, showzeros, percentage)
+
+    def performGranularities(self, granularities: tuple[str, ...] = GRANULARITIES, showzeros: bool = False, cumulative: bool = False, date_from: date | None = None, date_to: date | None = None) -> dict:
+        """
+        Perform the analysis for several granularities at once, the rows are collected and bucketed by day only once
+
+        Args:
+            granularities (tuple, optional): Any of "day", "week", "month", "quarter" and "year". Defaults to all of them.
+            showzeros (bool, optional): If True, shows the buckets with zero growth. Defaults to False.
+            cumulative (bool, optional): If True, the cumulative growth is calculated. Defaults to False.
+            date_from (date, optional): First day to consider. Defaults to None, which means no lower bound.
+            date_to (date, optional): Last day to consider, inclusive. Defaults to None, which means up to today.
+
+        Returns:
+            dict: The growth and cumulative growth per granularity and the type of graph, e.g. {"week": {"growth": {"2024-W01": 3}, "cumulative_growth": {}}, "typeofgraph": "line"}
+
+        Raises:
+            Exception: If no data is found
+        """
+        self.cumulative = cumulative
+        self.date_from = datetime.combine(date_from, time.min) if date_from is not None else None
+        self.date_to = datetime.combine(date_to, time.min) if date_to is not None else None
+        self.granularity = "day"
+        self.last_days = 0
+
+        data = self.collect()
+
+        if data == None:
+            raise Exception("No data found")
+
+        total_before = 0
+        if cumulative and self.date_from is not None:
+            total_before = self.aggregate.getTotalBefore(self.date_from) # Rows before the range
+
+        growth_key, cumulative_key = self.keys
+        result = {}
+
+        try:
+            growths = GrowthEngine.fromBuckets(data).growths(
+                granularities, showzeros=showzeros, cumulative=cumulative,
+                start=self.date_from, initial=total_before, end=self.date_to
+            )
+            for granularity, (growth, cumulative_growth) in growths.items():
+                result[granularity] = {growth_key: growth, cumulative_key: cumulative_growth}
+        except Exception as e:
+            print("Error in performGranularities: ", e)
+
+        result["typeofgraph"] = TYPEOFGRAPH
+        return result
+
+    def report(self):
+        pass
+
+    def _getYearlyGrowth(self, data: list[GrowthBucket], showzeros: bool = False, percentage: bool = False) -> dict:
+        """
+        gets the yearly growth
+
+        Args:
+            data (list): List of buckets containing the data
+            showzeros (bool) : If True, shows the years with zero growth
+            percentage (bool) : If True, shows the percentage growth in relation to the previous year
+
+        Returns:
+            dict: Dictionary containing the growth and cumulative growth data
+        """
+        return self._getGrowth("year", data, showzeros, percentage)
+
+    def _getMonthlyGrowth(self, data: list[GrowthBucket], showzeros: bool = False, percentage: bool = False) -> dict:
+        """
+        gets the monthly growth
+
+        Args:
+            data (list): List of buckets containing the data
+            showzeros (bool) : If True, shows the months with zero growth
+            percentage (bool) : If True, shows the percentage growth in relation to the previous month
+
+        Returns:
+            dict: Dictionary containing the growth and cumulative growth data
+        """
+        return self._getGrowth("month", data, showzeros, percentage)
+
+    def _getGrowth(self, granularity: str, data: list[GrowthBucket], showzeros: bool = False, percentage: bool = False) -> dict:
+        """
+        gets the growth by month or year, the cumulative growth starts with the rows before date_from
+        """
+        total_before = 0
+        if self.cumulative and self.date_from is not None:
+            total_before = self.aggregate.getTotalBefore(self.date_from) # Rows before the range
+
+        growth, cumulative_growth = {}, {}
+
+        try:
+            growth, cumulative_growth = GrowthEngine.fromBuckets(data).growth(
+                granularity, showzeros=showzeros, cumulative=self.cumulative,
+                start=self.date_from, initial=total_before, end=self.date_to
+            )
+        except Exception as e:
+            print(f"Error in _getGrowth by {granularity}: ", e)
+
+        return self._result(growth, cumulative_growth, percentage)
+
+    def _getGrowthByDays(self, data: list[GrowthBucket], last_days: int, showzeros: bool = False, percentage: bool = False) -> dict:
+        """
+        gets the growth by the number of days
+
+        Args:
+            data (list): List of buckets containing the data
+            last_days (int): Number of days to consider
+            showzeros (bool) : If True, shows the days with zero growth
+            percentage (bool) : If True, shows the percentage growth in relation to the previous day
+
+        Returns:
+            dict: Dictionary containing the growth and cumulative growth data, and the moving sums and averages if rolling is set
+        """
+        start = BaseRepository.window_start(last_days) if last_days > 0 else None
+        if self.date_from is not None:
+            start = self.date_from if start is None else max(start, self.date_from)
+
+        total_before = 0
+        if self.cumulative and start is not None:
+            total_before = self.aggregate.getTotalBefore(start) # Rows before the window or range
+
+        growth, cumulative_growth = {}, {}
+
+        try:
+            growth, cumulative_growth = GrowthEngine.fromBuckets(data).growth(
+                "day", showzeros=showzeros, cumulative=self.cumulative,
+                start=start, initial=total_before, last_days=last_days, end=self.date_to
+            )
+        except Exception as e:
+            print("Error in _getGrowthByDays: ", e)
+
+        result = self._result(growth, cumulative_growth, percentage)
+        if self.rolling:
+            try:
+                result["rolling"] = self.aggregate.getRolling(ROLLING_WINDOWS, last_days, self.date_from, self.date_to)
+            except Exception as e:
+                print("Error in _getGrowthByDays: ", e)
+
+        return result
+
+    def _result(self, growth: dict, cumulative_growth: dict, percentage: bool) -> dict:
+        """
+        Builds the result under the keys of the analysis, the growth as percentages if percentage is True
+        """
+        growth_key, cumulative_key = self.keys
+        if percentage:
+            growth = calculate_percentage_growth(growth, self.year_over_year, self.last_month)
+        return {growth_key: growth, cumulative_key: cumulative_growth, "typeofgraph": TYPEOFGRAPH}
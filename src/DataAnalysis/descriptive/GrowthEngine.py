@@ -0,0 +1,235 @@
+from DataAnalysis.db.models.queryparams import GrowthBucket
+from DataAnalysis.descriptive.Calendar import getCalendar, toOffsets, toDays, currentOffset, fillForward
+from datetime import datetime
+import numpy as np
+
+# Days of the rolling windows of the daily growth
+ROLLING_WINDOWS = (7, 30, 90)
+
+class GrowthEngine:
+    """
+    Vectorized bucketing of the descriptive time series. Dates are mapped to integer bucket offsets, so bucketing is a
+    bincount, zero filling is a dense range of offsets, cumulative sums are a cumsum and windows are slices. Keys are
+    looked up in the cached calendar of the granularity when the result is built.
+    """
+    def __init__(self, dates: np.ndarray, values: np.ndarray | None = None) -> None:
+        """
+        Args:
+            dates (np.ndarray): datetime64 array, one entry per row or per bucket
+            values (np.ndarray, optional): Value of every date, e.g. an amount. Defaults to None, which counts the dates.
+        """
+        self.dates = np.asarray(dates, dtype="datetime64[us]")
+        self.values = np.ones(len(self.dates), dtype=np.int64) if values is None else np.asarray(values)
+
+    @classmethod
+    def fromBuckets(cls, data: list[GrowthBucket]) -> "GrowthEngine":
+        """
+        Creates the engine from the buckets of a repository or the daily aggregate, buckets start at midnight
+
+        Args:
+            data (list): Buckets containing the bucket start and the value
+
+        Returns:
+            GrowthEngine: Engine over the buckets
+        """
+        dates = toDays([i.bucket for i in data])
+        values = np.array([i.value for i in data]) if data else np.array([], dtype=np.int64)
+        return cls(dates, values)
+
+    def offsets(self, granularity: str) -> np.ndarray:
+        """
+        Gets the bucket offset of every date
+
+        Args:
+            granularity (str): One of GRANULARITIES
+
+        Returns:
+            np.ndarray: Offsets since 1970 in days, months or years
+        """
+        return toOffsets(self.dates, granularity)
+
+    def buckets(self, granularity: str) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Sums up the values per bucket, only buckets containing dates are returned
+
+        Args:
+            granularity (str): One of GRANULARITIES
+
+        Returns:
+            tuple: Ascending offsets of the buckets and their sums
+        """
+        offsets = self.offsets(granularity)
+        if len(offsets) == 0:
+            return offsets, self._sum(offsets, 0)
+
+        first = offsets.min()
+        present = np.flatnonzero(np.bincount(offsets - first))
+        return present + first, self._sum(offsets - first, len(present) and present[-1] + 1)[present]
+
+    def dense(self, granularity: str, first: int, last: int) -> np.ndarray:
+        """
+        Sums up the values per bucket for every bucket from first to last, buckets without dates are zero
+
+        Args:
+            granularity (str): One of GRANULARITIES
+            first (int): Offset of the first bucket
+            last (int): Offset of the last bucket, inclusive
+
+        Returns:
+            np.ndarray: Sum of every bucket of the range
+        """
+        offsets = self.offsets(granularity) - first
+        inside = (offsets >= 0) & (offsets <= last - first)
+        return self._sum(offsets[inside], max(last - first + 1, 0), self.values[inside])
+
+    def growth(self, granularity: str, showzeros: bool = False, cumulative: bool = False, start: datetime | None = None, initial=0, last_days: int = 0, end: datetime | None = None) -> tuple[dict, dict]:
+        """
+        Builds the growth and the cumulative growth of the descriptive time series
+
+        Without showzeros only buckets containing dates are returned, keyed by date (day), "%Y-%m" (month), year
+        (year) or the label of the week or quarter. With showzeros the buckets from start (or the first bucket) to end
+        (or the current one) are returned, both keyed by their label, e.g. "%Y-%m-%d". The cumulative growth is then
+        filled up as well, buckets whose cumulative value is zero take the previous one. Days are cut to the last_days
+        buckets.
+
+        Args:
+            granularity (str): One of GRANULARITIES
+            showzeros (bool, optional): If True, buckets without dates are filled in with zero. Defaults to False.
+            cumulative (bool, optional): If True, the cumulative growth is calculated. Defaults to False.
+            start (datetime, optional): First bucket of the zero filled range. Defaults to None, which means the first bucket containing dates.
+            initial (optional): Cumulative value before the first bucket. Defaults to 0.
+            last_days (int, optional): Number of buckets the zero filled days are cut to. Defaults to 0, which means no cut.
+            end (datetime, optional): Last bucket of the zero filled range. Defaults to None, which means the current bucket.
+
+        Returns:
+            tuple: Growth and cumulative growth by bucket key, the cumulative growth is empty if cumulative is False
+        """
+        offsets, sums = self.buckets(granularity)
+        totals = np.cumsum(sums) + initial
+
+        if not showzeros or (len(offsets) == 0 and start is None):
+            calendar = getCalendar(granularity, *((offsets[0], offsets[-1]) if len(offsets) else ()))
+            keys = calendar.keys(offsets)
+            return dict(zip(keys, sums.tolist())), dict(zip(keys, totals.tolist())) if cumulative else {}
+
+        first = int(offsets[0] if start is None else toOffsets(np.datetime64(start, "us"), granularity))
+        last = currentOffset(granularity) if end is None else int(toOffsets(np.datetime64(end, "us"), granularity))
+        lowest, highest = (min(first, offsets[0]), max(last, offsets[-1])) if len(offsets) else (first, last)
+        calendar = getCalendar(granularity, lowest, highest)
+
+        range_offsets = np.arange(first, last + 1)
+        range_sums = self.dense(granularity, first, last)
+        if granularity == "day" and last_days > 0:
+            range_offsets, range_sums = range_offsets[-last_days:], range_sums[-last_days:]
+        labels = calendar.labels(range_offsets)
+
+        cumulative_growth = {}
+        if cumulative:
+            known = np.full(last - first + 1, np.nan)
+            if start is not None:
+                known[0] = initial
+            inside = (offsets >= first) & (offsets <= last)
+            known[offsets[inside] - first] = totals[inside]
+            filled = fillForward(known, skip_zeros=True)[len(known) - len(range_offsets):]
+            if totals.dtype.kind in "iub":
+                filled = np.rint(filled).astype(np.int64) # Counts stay integers like the growth
+            cumulative_growth = dict(zip(labels, filled.tolist()))
+
+        return dict(zip(labels, range_sums.tolist())), cumulative_growth
+
+    def growths(self, granularities: tuple[str, ...], showzeros: bool = False, cumulative: bool = False, start: datetime | None = None, initial=0, end: datetime | None = None) -> dict[str, tuple[dict, dict]]:
+        """
+        Builds the growth of several granularities in one pass. The dates are bucketed by day once, the coarser
+        buckets are then built from the daily sums instead of the dates.
+
+        Args:
+            granularities (tuple): Granularities of GRANULARITIES
+            showzeros (bool, optional): If True, buckets without dates are filled in with zero. Defaults to False.
+            cumulative (bool, optional): If True, the cumulative growth is calculated. Defaults to False.
+            start (datetime, optional): First bucket of the zero filled range. Defaults to None, which means the first bucket containing dates.
+            initial (optional): Cumulative value before the first bucket. Defaults to 0.
+            end (datetime, optional): Last bucket of the zero filled range. Defaults to None, which means the current bucket.
+
+        Returns:
+            dict: Growth and cumulative growth of every granularity, see growth
+        """
+        days, sums = self.buckets("day")
+        daily = GrowthEngine(days.astype("datetime64[D]"), sums)
+        return {granularity: daily.growth(granularity, showzeros, cumulative, start, initial, end=end) for granularity in granularities}
+
+    def _sum(self, offsets: np.ndarray, length: int, values: np.ndarray | None = None) -> np.ndarray:
+        """
+        Sums up the values by offset with a bincount, integer values stay integers
+        """
+        values = self.values if values is None else values
+        sums = np.bincount(offsets, weights=values, minlength=length) if len(offsets) else np.zeros(length)
+        if values.dtype.kind in "iub":
+            return np.rint(sums).astype(np.int64)
+        return sums
+
+
+def rolling(values: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Moving sum and moving average of a dense series in one pass: the sum of a window is the difference of two entries
+    of the cumulative sum. Like a pandas rolling window, the first window - 1 entries are NaN.
+
+    Args:
+        values (np.ndarray): Values of consecutive buckets, missing buckets have to be filled in with zero
+        window (int): Number of buckets per window
+
+    Returns:
+        tuple: Float arrays of the moving sums and the moving averages
+
+    Raises:
+        ValueError: If the window is not positive
+    """
+    if window <= 0:
+        raise ValueError("The window should be greater than zero")
+
+    values = np.asarray(values, dtype=np.float64)
+    totals = np.concatenate((np.zeros(1), np.cumsum(values)))
+    sums = np.full(len(values), np.nan)
+    if window <= len(values):
+        sums[window - 1:] = totals[window:] - totals[:-window]
+    return sums, sums / window
+
+def minMaxIndices(values: np.ndarray, max_points: int) -> np.ndarray:
+    """
+    Picks at most max_points positions of a series so its shape survives on a chart: the first and the last value and
+    the minimum and maximum of equally sized buckets in between, so spikes and drops are never dropped. The buckets are
+    the rows of a padded matrix, so every bucket is reduced at once.
+
+    Args:
+        values (np.ndarray): Values of the series
+        max_points (int): Number of positions to pick at most, at least 2
+
+    Returns:
+        np.ndarray: Sorted positions of the picked values, all positions if the series is not longer than max_points
+
+    Raises:
+        ValueError: If max_points is less than 2
+    """
+    if max_points < 2:
+        raise ValueError("max_points should be at least 2")
+
+    values = np.asarray(values, dtype=np.float64)
+    length = len(values)
+    buckets = (max_points - 2) // 2
+    if length <= max_points:
+        return np.arange(length)
+    if buckets == 0:
+        return np.array([0, length - 1])
+
+    inner = length - 2
+    size = -(-inner // buckets)
+    rows = -(-inner // size)
+
+    grid = np.full(rows * size, np.nan)
+    grid[:inner] = values[1:-1]
+    grid = grid.reshape(rows, size)
+    missing = np.isnan(grid)
+
+    start = np.arange(rows) * size + 1
+    lowest = start + np.argmin(np.where(missing, np.inf, grid), axis=1)
+    highest = start + np.argmax(np.where(missing, -np.inf, grid), axis=1)
+    return np.unique(np.concatenate(([0], lowest, highest, [length - 1])))
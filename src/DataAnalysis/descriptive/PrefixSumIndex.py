@@ -0,0 +1,77 @@
+from datetime import datetime
+import numpy as np
+
+class PrefixSumIndex:
+    """
+    Cumulative index over sorted event dates. totals[i] is the sum of the values of the first i dates, so the sum of
+    any date range is the difference of two totals found with a binary search, without scanning the dates.
+    """
+    def __init__(self, dates: np.ndarray, values: np.ndarray) -> None:
+        """
+        Args:
+            dates (np.ndarray): datetime64 dates of the events or of the aggregated days, in any order
+            values (np.ndarray): Value of every date, e.g. the number of events of the day
+        """
+        order = np.argsort(dates, kind="stable")
+        self.dates = np.asarray(dates, dtype="datetime64[us]")[order]
+        self.values = np.asarray(values)[order]
+        self.totals = np.concatenate((np.zeros(1, dtype=self.values.dtype), np.cumsum(self.values)))
+
+    @classmethod
+    def fromDays(cls, days: dict[datetime, int]) -> "PrefixSumIndex":
+        """
+        Creates the index from a dictionary of day to value
+
+        Args:
+            days (dict): Value of every day
+
+        Returns:
+            PrefixSumIndex: Index over the days
+        """
+        dates = np.array(list(days.keys()), dtype="datetime64[us]")
+        values = np.array(list(days.values())) if days else np.array([], dtype=np.int64)
+        return cls(dates, values)
+
+    def bounds(self, start: datetime | None = None, end: datetime | None = None) -> tuple[int, int]:
+        """
+        Gets the positions of the dates from start (inclusive) to end (exclusive)
+
+        Args:
+            start (datetime, optional): Inclusive lower bound. Defaults to None, which means no lower bound.
+            end (datetime, optional): Exclusive upper bound. Defaults to None, which means no upper bound.
+
+        Returns:
+            tuple: First position and the position after the last one
+        """
+        first = 0 if start is None else int(np.searchsorted(self.dates, np.datetime64(start, "us"), side="left"))
+        last = len(self.dates) if end is None else int(np.searchsorted(self.dates, np.datetime64(end, "us"), side="left"))
+        return first, max(first, last)
+
+    def total(self, start: datetime | None = None, end: datetime | None = None) -> int | float:
+        """
+        Sums up the values of the dates from start (inclusive) to end (exclusive)
+
+        Args:
+            start (datetime, optional): Inclusive lower bound. Defaults to None, which means no lower bound.
+            end (datetime, optional): Exclusive upper bound. Defaults to None, which means no upper bound.
+
+        Returns:
+            int | float: Sum of the values
+        """
+        first, last = self.bounds(start, end)
+        total = self.totals[last] - self.totals[first]
+        return total.item() if isinstance(total, np.generic) else total # Decimal amounts stay objects
+
+    def slice(self, start: datetime | None = None, end: datetime | None = None) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Gets the dates from start (inclusive) to end (exclusive) and their values, the arrays are views
+
+        Args:
+            start (datetime, optional): Inclusive lower bound. Defaults to None, which means no lower bound.
+            end (datetime, optional): Exclusive upper bound. Defaults to None, which means no upper bound.
+
+        Returns:
+            tuple: Sorted dates and their values
+        """
+        first, last = self.bounds(start, end)
+        return self.dates[first:last], self.values[first:last]
@@ -14,16 +14,22 @@ class ProductsAmount(DataCollector):
     """
     def __init__(self) -> None:
         super().__init__()
+        self.top = None
+        self.bottom = None
 
     def collect(self) -> list[ProductsAmountParams]:
         """
-        Collects data from the API
-        
+        Collects data from the API. If perform set top or bottom, only the products at these ends of the stock
+        ranking are collected
+
         Returns:
             list: List of dictionaries containing the data
         """
         try:
-            return ProductsAmountRepository(self.db).get()
+            repository = ProductsAmountRepository(self.db)
+            if self.top is None and self.bottom is None:
+                return repository.get()
+            return repository.getStockEnds(self.top or 0, self.bottom or 0)
         except ConnectionRefusedError as e:
             print("Connection refused: ", e)    
 
@@ -47,39 +53,41 @@ class ProductsAmount(DataCollector):
         Returns:
             dict: Dictionary containing the products and the stock
         """
+        # Only the ends of the stock ranking are collected, a limit of 0 collects all products
+        if limit <= 0:
+            self.top, self.bottom = None, None
+        elif well_stocked:
+            self.top, self.bottom = limit, 0
+        elif out_of_stock:
+            self.top, self.bottom = 0, limit
+        else:
+            self.top, self.bottom = limit - limit // 2, limit // 2
+
         data = self.collect()
         if data == None:
             raise Exception("No data found")
 
-        if limit > len(data):
+        # The ends only overlap or run short if there are fewer products than the limit
+        if limit > len(data) or (limit > 0 and len({i.productId for i in data}) < limit):
             raise Exception("Limit is greater than the amount of products present")
 
         if limit < 0:
             raise Exception("Limit cannot be negative")
-        
-        if limit == 0:
-            limit = len(data)
+
+        if limit > 0:
+            highest = sorted((i for i in data if i.highest), key=lambda i: (-i.stock, i.name))
+            if out_of_stock:
+                lowest = sorted(data, key=lambda i: (i.stock, i.name))
+            else:
+                lowest = sorted((i for i in data if not i.highest), key=lambda i: (-i.stock, i.name))
+            return { "products" : {i.name: i.stock for i in highest + lowest}, "typeofgraph" : TYPEOFGRAPH }
 
         products = {}
 
         for i in data:    
             products[i.name] = i.stock
 
-        if well_stocked:
-            products_res = dict(sorted(products.items(), key=lambda item: item[1], reverse=True)[:limit])
-        elif out_of_stock:
-            products_res = dict(sorted(products.items(), key=lambda item: item[1])[:limit])
-        else:
-            products_res = dict(sorted(products.items(), key=lambda item: item[1], reverse=True))
-
-            if limit % 2 == 0:
-                upper_bound = limit // 2
-                lower_bound = limit // 2
-            else:
-                upper_bound = limit // 2 + 1
-                lower_bound = limit // 2
-
-            products_res = dict(list(products_res.items())[:upper_bound] + list(products_res.items())[-lower_bound:])
+        products_res = dict(sorted(products.items(), key=lambda item: item[1], reverse=not out_of_stock))
 
         return { "products" : products_res, "typeofgraph" : TYPEOFGRAPH }
 
@@ -1,6 +1,5 @@
 from DataAnalysis.DataCollector import DataCollector
 from DataAnalysis.db.models.ProductsMostlyBought import ProductsMostlyBoughtRepository
-from DataAnalysis.db.models.queryparams import ProductsMostlyBought as ProductsMostlyBoughtParams, OrdersProducts as OrdersProductsParams
 from datetime import datetime, timedelta
 from os import getenv
 
@@ -15,15 +14,20 @@ class ProductsMostlyBought(DataCollector):
     def __init__(self) -> None:
         super().__init__()
 
-    def collect(self) -> tuple[list[ProductsMostlyBoughtParams], list[OrdersProductsParams]]:
+    def collect(self, limit: int | None = None, start: datetime | None = None, end: datetime | None = None) -> list:
         """
-        Collects data from the DB
+        Collects the products mostly bought from the DB, the amounts are summed up, ranked and limited by the DB
+
+        Args:
+            limit (int, optional): Number of products. Defaults to None, which means all bought products.
+            start (datetime, optional): Inclusive lower bound of the order date. Defaults to None.
+            end (datetime, optional): Exclusive upper bound of the order date. Defaults to None.
 
         Returns:
-            list: List of dictionaries containing the data
+            list: Rows of the product name and the bought amount, highest amount first
         """
         try:
-            return ProductsMostlyBoughtRepository(self.db).get(), ProductsMostlyBoughtRepository(self.db).getOrdersProducts()
+            return ProductsMostlyBoughtRepository(self.db).getTopProducts(limit, start, end)
         except ConnectionRefusedError as e:
             print("Connection refused: ", e)
 
@@ -31,11 +35,11 @@ class ProductsMostlyBought(DataCollector):
             print("Connection error: ", e)
         except Exception as e:
             print("Error: ", e)
-    
+
     def perform(self, last_days: int = 0, year: bool = False, month: bool = False, limit: int = 5) -> dict:
         """
         Perform the analysis
-        
+
         Args:
 
             last_days (int, optional): Number of days to consider. Defaults to 0.
@@ -44,168 +48,39 @@ class ProductsMostlyBought(DataCollector):
             limit (int, optional): Limit of products to be shown. Defaults to 5.
 
         Returns:
-            dict: Dictionary containing the products mostly bought
+            dict: Dictionary containing the products mostly bought, fewer than limit if fewer products were bought in the window
+
+        Raises:
+            Exception: If the limit is negative
+            ValueError: If the number of days is less than zero
+            Exception: If no data is found
         """
-        products, data = self.collect()
-        self.products = products
-        if data == None:
-            raise Exception("No data found")
-        
-        if limit > len(data):
-            raise Exception("Limit is greater than the amount of bought products present")
-        
         if limit < 0:
             raise Exception("Limit cannot be negative")
 
+        if not (year or month) and last_days < 0:
+            raise ValueError("The number of days should be greater than zero")
+
+        now = datetime.now()
         if year:
-            return self._getYearlyPurchases(data, limit)
+            start, end = datetime(now.year, 1, 1), datetime(now.year + 1, 1, 1)
         elif month:
-            return self._getMonthlyPurchases(data, limit)
+            current_month = self._getCurrentMonth()
+            start = datetime(now.year, current_month, 1)
+            end = datetime(now.year + current_month // 12, current_month % 12 + 1, 1)
+        elif last_days > 0:
+            start, end = now - timedelta(days=last_days), now
         else:
-            return self._getPurchasesByDays(data, last_days, limit)
-
-
-    def _getProductNameById(self, product_id: int) -> str:
-        """
-        Gets the product name from the product ID
-
-        Args:
-            product_id (int): Product ID
-
-        Returns:
-            str: Product name
-
-        Raises:
-            Exception: Product not found
-            Exception: Order not found
-            ValueError: The number of days should be greater than zero
-        """
-        products = self.products
-
-        for i in products:
-            if i.productId == product_id:
-                return i.name
-        
-        raise Exception("Product not found")
-
-    def _getYearlyPurchases(self, data: list[OrdersProductsParams], limit) -> dict:
-        """
-        gets the yearly purchases of the products
-        
-        Args:
-            data (list): List of dictionaries containing the data
-            
-        Returns:
-            dict: Dictionary containing the products mostly bought
-
-        Raises:
-            ValueError: The number of days should be greater than zero
-        """
-        
-        products_bought = {}
-        seen = set()
-        for i in data:
-            if i.orderDate.year == datetime.now().year:
-                if i.productId not in seen:
-                    products_bought[i.productId] = i.productAmount
-                    seen.add(i.productId)
-                else:
-                    products_bought[i.productId] += i.productAmount
-
-        products_bought = dict(list(sorted(products_bought.items(), key=lambda item: item[1], reverse=True))[:limit])
-
-        products_bought_named = {}
-        for i in products_bought.keys():
-            product_name = self._getProductNameById(i)
-            products_bought_named[product_name] = products_bought[i]
-        products_bought = products_bought_named
-
-        return {"products" : products_bought, "typeofgraph" : TYPEOFGRAPH}
-    
-    def _getMonthlyPurchases(self, data: list[OrdersProductsParams], limit) -> dict:
-        """
-        gets the monthly purchases of the products
-
-        Args:
-            data (list): List of dictionaries containing the data
-
-        Returns:
-            dict: Dictionary containing the products mostly bought
-        """
+            start, end = None, None
 
-        products_bought = {}
-        seen = set()
-        for i in data:
-            if i.orderDate.month == self._getCurrentMonth() and i.orderDate.year == datetime.now().year:
-                if i.productId not in seen:
-                    products_bought[i.productId] = i.productAmount
-                    seen.add(i.productId)
-                else:
-                    products_bought[i.productId] += i.productAmount
-
-        products_bought = dict(list(sorted(products_bought.items(), key=lambda item: item[1], reverse=True))[:limit])
-
-        products_bought_named = {}
-        for i in products_bought.keys():
-            product_name = self._getProductNameById(i)
-            products_bought_named[product_name] = products_bought[i]
-        products_bought = products_bought_named
-
-        return {"products" : products_bought, "typeofgraph" : TYPEOFGRAPH}
-    
-    def _getPurchasesByDays(self, data: list[OrdersProductsParams], last_days: int, limit) -> dict:
-        """
-        gets the purchases of the products by the number of days
+        # A limit of 0 shows all products only for the last days
+        top = None if limit == 0 and not (year or month) else limit
+        products_bought = self.collect(top, start, end)
+        if products_bought == None:
+            raise Exception("No data found")
 
-        Args:
-            data (list): List of dictionaries containing the data
-            last_days (int): Number of days to consider
+        return {"products" : {name: int(amount) for name, amount in products_bought}, "typeofgraph" : TYPEOFGRAPH}
 
-        Returns:
-            dict: Dictionary containing the products mostly bought
-        
-        Raises:
-            ValueError: If the number of days is less than zero
-        """
-
-        if limit > len(data):
-            raise Exception("Limit is greater than the amount of bought products present")
-        
-        if limit < 0:
-            raise Exception("Limit cannot be negative")
-        
-        if limit == 0:
-            limit = len(data)
-        
-        products_bought = {}
-        seen = set()
-        for i in data:
-            if last_days > 0:
-                if i.orderDate >= datetime.now() - timedelta(days=last_days) and i.orderDate <= datetime.now():
-                    if i.productId not in seen:
-                        products_bought[i.productId] = i.productAmount
-                        seen.add(i.productId)
-                    else:
-                        products_bought[i.productId] += i.productAmount
-            elif last_days == 0:
-                if i.productId not in seen:
-                    products_bought[i.productId] = i.productAmount
-                    seen.add(i.productId)
-                else:
-                    products_bought[i.productId] += i.productAmount
-            elif last_days < 0:
-                raise ValueError("The number of days should be greater than zero")
-            
-        products_bought = dict(list(sorted(products_bought.items(), key=lambda item: item[1], reverse=True))[:limit])
-
-        products_bought_named = {}
-        for i in products_bought.keys():
-            product_name = self._getProductNameById(i)
-            products_bought_named[product_name] = products_bought[i]
-        products_bought = products_bought_named
-
-        return {"products" : products_bought, "typeofgraph" : TYPEOFGRAPH}
-    
     def _getCurrentMonth(self) -> int:
         """
         Gets the current month
@@ -214,7 +89,7 @@ class ProductsMostlyBought(DataCollector):
             int: Current month
         """
         return datetime.now().month
-    
+
 
     def report(self):
-        pass
\ No newline at end of file
+        pass
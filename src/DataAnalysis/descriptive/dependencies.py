@@ -1,115 +1,226 @@
-from collections import defaultdict
-from datetime import datetime
-import pandas as pd
+from datetime import date
+import numpy as np
 
+from DataAnalysis.descriptive.Calendar import GRANULARITIES, FREQUENCIES, getCalendar, toOffsets, toDays, shiftMonths
+from DataAnalysis.descriptive.GrowthEngine import minMaxIndices
 
-def showZeros(growth: defaultdict, cumulative_growth: dict, end: datetime, freq: str, format: str, last_days: int = 0, cumulative: bool = False) -> tuple:
-        """
-        Fills in the missing dates with zero growth and forward fills the cumulative growth values.
 
-        Args:
-            growth (defaultdict): A defaultdict containing the growth data.
-            cumulative_growth (dict): A dictionary containing the cumulative growth data.
-            end (datetime): The end date for the date range.
-            freq (str): The frequency for the date range (e.g., 'D' for daily, 'MS' for monthly start, 'YS' for yearly start).
-            format (str): The date format to use for parsing and formatting dates (e.g., "%Y-%m-%d" for daily, "%Y-%m" for monthly, "%Y" for yearly).
-            last_days (int, optional): The number of last days to consider for filtering the growth data. Only applicable when growth is calculated by days. Defaults to 0, which means no filtering.
-
-        Returns:
-            tuple: A tuple containing the updated growth and cumulative growth dictionaries with missing dates filled in and cumulative growth forward filled.
-    
-        Raises:
-            ValueError: If the date format is invalid or if the end date is before the start date.
-            KeyError: If the growth or cumulative growth data is missing for a specific date.
-        """
-
-        df_growth = pd.DataFrame.from_dict(growth, orient='index', columns=['growth'])
-
-        df_growth.index = pd.to_datetime(df_growth.index.astype(str), format=format)
-        end = pd.to_datetime(end, format=format)
-
-        full_date_range = pd.date_range(start=df_growth.index.min(), end=end, freq=freq)
-    
-        df_growth_filled = df_growth.reindex(full_date_range, fill_value=0)
-        df_growth_filled.index = df_growth_filled.index.strftime(format)
-        df_growth_filled.update(df_growth)
-
-        if cumulative:
-            df_cumulative_growth = pd.DataFrame.from_dict(cumulative_growth, orient='index', columns=['cumulative_growth'])
-
-            if format == "%Y":
-                full_date_range = full_date_range.year
-                df_cumulative_growth_filled = df_cumulative_growth.reindex(full_date_range)
-
-                df_cumulative_growth_filled.ffill(inplace=True)
-                df_cumulative_growth_filled.fillna(0, inplace=True)
-            elif format == "%Y-%m":
-                full_date_range = full_date_range.year.astype(str) + '-' + full_date_range.month.astype(str).str.zfill(2)
-                df_cumulative_growth_filled = df_cumulative_growth.reindex(full_date_range)
-
-                df_cumulative_growth_filled.ffill(inplace=True)
-                df_cumulative_growth_filled.fillna(0, inplace=True)
-            else:
-                df_cumulative_growth_filled = df_cumulative_growth.reindex(full_date_range)
-                df_cumulative_growth_filled.index = df_cumulative_growth_filled.index.strftime(format)
-                df_cumulative_growth_filled.update(df_cumulative_growth)
-                
-                df_cumulative_growth_filled.replace(0, pd.NA, inplace=True)
-                df_cumulative_growth_filled.ffill(inplace=True)
-                df_cumulative_growth_filled.replace(pd.NA, 0, inplace=True)
-
-                if last_days > 0:
-                    cumulative_growth = df_cumulative_growth_filled['cumulative_growth'].iloc[-last_days:].to_dict()
-                elif last_days == 0:
-                    cumulative_growth = df_cumulative_growth_filled.to_dict()['cumulative_growth']
-
-        if last_days > 0:
-            growth = df_growth_filled['growth'].iloc[-last_days:].to_dict()
-        elif last_days == 0:
-            growth = df_growth_filled.to_dict()['growth']
-
-
-        return growth, cumulative_growth if cumulative else {}
+def _toOffsets(dates, granularity: str) -> np.ndarray:
+    """
+    Maps dates, datetimes, years or date strings to the offsets of their buckets
+    """
+    dates = list(dates)
+    if all(isinstance(i, date) for i in dates):
+        return toOffsets(toDays(dates), granularity)
+    return toOffsets(np.array([str(i) for i in dates], dtype="datetime64[us]"), granularity)
     
-def calculate_percentage_growth(growth: dict) -> dict:
+def calculate_percentage_growth(growth: dict, year_over_year: bool = False, last_month: bool = False) -> dict:
     """
-    Calculates the percentage growth in relation to the previous period.
+    Calculates the percentage growth in relation to the previous period, and optionally in relation to the same period
+    one year and one month earlier. These are found by shifting the date of the period by the calendar, e.g. 2024-03
+    is compared to 2023-03 and 2024-02. Periods whose comparison period is missing or zero get zero.
 
     Args:
-        growth (dict): A dictionary containing the growth data.
+        growth (dict): A dictionary containing the growth data, ordered by date.
+        year_over_year (bool, optional): If True, the percentage growth in relation to the same period one year earlier is added. Defaults to False.
+        last_month (bool, optional): If True, the percentage growth in relation to the same period one month earlier is added. Defaults to False.
 
     Returns:
-        dict: A dictionary containing the percentage growth and growth data.
+        dict: A dictionary containing the percentage growth and growth data, followed by the year over year and last month percentage growth if requested.
         Example: {
             "2023": [0, 100],
             "2024": [100.0, 200]
         }
     """
-    first_item = True
     try:
-        percentage_growth = {}
-        key_list = list(growth.keys())
-        for i in range(len(key_list)):
-            key = key_list[i]
-            if first_item:
-                percentage_growth[key] = 0
-                first_item = False
-            else:
-                previous_key = key_list[i-1]
-                if growth[previous_key] == 0:
-                    percentage_growth[key] = 0
-                else:
-                    percentage_growth[key] = round((growth[key] - growth[previous_key]) / growth[previous_key] * 100, 1)
-        
-        df = pd.DataFrame.from_dict(percentage_growth, orient='index', columns=['percentage_growth'])
-
-        df_growth = pd.DataFrame.from_dict(growth, orient='index', columns=['growth'])
-
-        df_combined = pd.concat([df, df_growth], axis=1)
-
-        result = df_combined.apply(lambda row: [row["percentage_growth"], row["growth"]], axis=1).to_dict()
-
-        return result
+        keys = list(growth.keys())
+        values = np.array(list(growth.values()))
+        if len(keys) == 0:
+            return {}
+
+        columns = [_percentage(values, np.arange(len(keys)) - 1), values]
+
+        if year_over_year or last_month:
+            days = toDays(keys) if all(isinstance(i, date) for i in keys) else _toOffsets(keys, "day").astype("datetime64[D]")
+            if year_over_year:
+                columns.append(_percentage(values, _find(days, shiftMonths(days, -12))))
+            if last_month:
+                columns.append(_percentage(values, _find(days, shiftMonths(days, -1))))
+
+        # Like a row of a DataFrame, all values are floats as soon as one of them is
+        if values.dtype.kind == "f" or any(i.dtype.kind == "f" for i in columns):
+            rows = np.column_stack(columns).astype(np.float64)
+        else:
+            rows = np.column_stack(columns).astype(np.int64)
+
+        return dict(zip(keys, rows.tolist()))
     except Exception as e:
         print("Error in _calculate_percentage_growth: ", e)
         return {}
+
+def downsample(result: dict, max_points: int | None = None) -> dict:
+    """
+    Reduces every series of a growth result to at most max_points buckets with minMaxIndices, so long daily series stay
+    small enough to be sent and drawn. Nested results like the granularities or the rolling windows are reduced as
+    well, the cached result itself is not changed.
+
+    Args:
+        result (dict): Result of a growth analysis, e.g. {"growth": {...}, "cumulative_growth": {...}, "typeofgraph": "line"}
+        max_points (int, optional): Number of buckets per series at most, at least 2. Defaults to None, which means the result is returned as it is.
+
+    Returns:
+        dict: Result with the reduced series, percentage rows are reduced by their amount
+    """
+    if max_points is None:
+        return result
+
+    reduced = {}
+    for name, item in result.items():
+        if not isinstance(item, dict) or not item:
+            reduced[name] = item
+        elif all(isinstance(i, dict) for i in item.values()):
+            reduced[name] = downsample(item, max_points)
+        else:
+            keys = list(item)
+            values = [i[1] if isinstance(i, list) else i for i in item.values()] # Percentage rows hold the amount second
+            reduced[name] = {keys[i]: item[keys[i]] for i in minMaxIndices(values, max_points).tolist()}
+    return reduced
+
+def changedSince(result: dict, day: date, granularity: str = "day") -> dict:
+    """
+    Keeps the buckets of every series of a growth result from the bucket containing the day on, the ones a client
+    polling with a cursor of that day may not have yet. Percentages, cumulative values and moving windows only depend
+    on earlier buckets, so the earlier ones are unchanged as long as the cursor is valid.
+
+    Args:
+        result (dict): Result of a growth analysis, granularities are read from the keys of nested results
+        day (date): Day of the cursor
+        granularity (str, optional): One of GRANULARITIES, the granularity of the series. Defaults to "day".
+
+    Returns:
+        dict: Result with the buckets from the one containing the day on
+    """
+    first = getCalendar(granularity).labels(toOffsets(np.datetime64(day, "D"), granularity).reshape(1))[0]
+
+    changed = {}
+    for name, item in result.items():
+        if not isinstance(item, dict) or not item:
+            changed[name] = item
+        elif all(isinstance(i, dict) for i in item.values()):
+            changed[name] = changedSince(item, day, name if name in GRANULARITIES else granularity)
+        else:
+            changed[name] = {key: value for key, value in item.items() if str(key) >= first} # Labels sort like the buckets
+    return changed
+
+def toColumnar(result: dict, granularity: str = "day", year_over_year: bool = False, last_month: bool = False, labels: bool = False) -> dict:
+    """
+    Converts a growth result to parallel arrays, so the bucket labels are not repeated per series. A series of
+    consecutive buckets is described by its first label and frequency, otherwise its labels are listed as well.
+    Percentage rows are split into one array per column, moving windows are aligned to the buckets of the growth.
+
+    Args:
+        result (dict): Result of a growth analysis, granularities are read from the keys of nested results
+        granularity (str, optional): One of GRANULARITIES, the granularity of the series. Defaults to "day".
+        year_over_year (bool, optional): If True, the percentage rows contain the year over year percentage. Defaults to False.
+        last_month (bool, optional): If True, the percentage rows contain the last month percentage. Defaults to False.
+        labels (bool, optional): If True, the labels are always listed. Defaults to False.
+
+    Returns:
+        dict: Result like {"start": "2024-01-01", "freq": "D", "values": [3, 0, 5], "cumulative": [3, 3, 8], "typeofgraph": "line"}
+    """
+    growth_key, cumulative_key = ("amount", "cumulative_amount") if "amount" in result else ("growth", "cumulative_growth")
+    if growth_key not in result:
+        return {name: toColumnar(item, name, year_over_year, last_month, labels) if name in GRANULARITIES else item for name, item in result.items()}
+
+    growth = result[growth_key]
+    keys = [str(i) for i in growth]
+    columns = {"start": keys[0] if keys else None, "freq": FREQUENCIES[granularity]}
+    if labels or not _consecutive(keys, granularity):
+        columns["labels"] = keys
+
+    rows = list(growth.values())
+    if rows and isinstance(rows[0], list):
+        names = ["percentage", "values"] + ["year_over_year"] * year_over_year + ["last_month"] * last_month
+        columns.update((name, [row[i] for row in rows]) for i, name in enumerate(names))
+    else:
+        columns["values"] = rows
+
+    if result.get(cumulative_key):
+        cumulative = {str(key): value for key, value in result[cumulative_key].items()}
+        columns["cumulative"] = [cumulative.get(i) for i in keys]
+
+    for name, item in result.items():
+        if name == "rolling":
+            columns["rolling"] = {
+                window: {measure: [series.get(i) for i in keys] for measure, series in measures.items()}
+                for window, measures in item.items()
+            }
+        elif name not in (growth_key, cumulative_key):
+            columns[name] = item
+    return columns
+
+def columnLabels(columns: dict) -> list[str]:
+    """
+    Gets the labels of the buckets of a columnar series, they are built from the first label and the frequency if the
+    series does not list them
+
+    Args:
+        columns (dict): Series of toColumnar
+
+    Returns:
+        list: Label of every bucket
+    """
+    if "labels" in columns:
+        return columns["labels"]
+    if columns["start"] is None:
+        return []
+
+    granularity = next(name for name, frequency in FREQUENCIES.items() if frequency == columns["freq"])
+    first = _labelOffset(columns["start"], granularity)
+    last = first + len(columns["values"]) - 1
+    return getCalendar(granularity, first, last).labels(np.arange(first, last + 1))
+
+def _percentage(values: np.ndarray, previous: np.ndarray) -> np.ndarray:
+    """
+    Gets the percentage growth of every value in relation to the value at the previous index, rounded to one decimal.
+    The growth is an integer zero where the previous index is -1 or its value is zero.
+    """
+    previous_values = np.where(previous >= 0, values[np.maximum(previous, 0)], 0)
+    compared = previous_values != 0
+    if not compared.any():
+        return np.zeros(len(values), dtype=np.int64)
+
+    percentage = np.zeros(len(values))
+    percentage[compared] = np.round((values[compared] - previous_values[compared]) / previous_values[compared] * 100, 1)
+    return percentage
+
+def _find(days: np.ndarray, targets: np.ndarray) -> np.ndarray:
+    """
+    Gets the index of every target in days, -1 if it is missing
+    """
+    order = np.argsort(days, kind="stable")
+    position = np.minimum(np.searchsorted(days[order], targets), len(days) - 1)
+    return np.where(days[order][position] == targets, order[position], -1)
+
+def _consecutive(labels: list[str], granularity: str) -> bool:
+    """
+    Checks if the labels are the ones of consecutive buckets of the granularity
+    """
+    if not labels:
+        return True
+
+    first = _labelOffset(labels[0], granularity)
+    last = first + len(labels) - 1
+    return getCalendar(granularity, first, last).labels(np.arange(first, last + 1)) == labels
+
+def _labelOffset(label: str, granularity: str) -> int:
+    """
+    Gets the offset of the bucket of a label of the calendar of the granularity
+    """
+    if granularity == "week":
+        year, week = label.split("-W")
+        return int(toOffsets(np.datetime64(date.fromisocalendar(int(year), int(week), 4)), "week"))
+    if granularity == "quarter":
+        year, quarter = label.split("-Q")
+        return (int(year) - 1970) * 4 + int(quarter) - 1
+    return int(toOffsets(np.datetime64(label), granularity))
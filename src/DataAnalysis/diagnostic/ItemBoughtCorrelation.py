@@ -1,5 +1,5 @@
 from DataAnalysis.DataCollector import DataCollector
-from DataAnalysis.db.models.ItemBoughtCorrelation import ItemBoughtCorrelationRepository
+from DataAnalysis.db.snapshot import getSnapshot
 import pandas as pd
 import numpy as np
 from uuid import UUID
@@ -17,23 +17,30 @@ class ItemBoughtCorrelation(DataCollector):
 
     def collect(self) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
         """
-        Collects data from the DB
+        Collects data from the snapshot of the order star schema. Orders are identified by their row in the snapshot,
+        so no UUID is held per order. The result is cached and answered with an ETag under the current watermark of
+        ordersProducts and products, so the snapshot is checked against the tables first instead of once per check interval
 
         Returns:
             tuple: Tuple of dataframes containing the data
         """
         try:
-            products, ordersProducts, orders = ItemBoughtCorrelationRepository(self.db).getAll()
+            snapshot = getSnapshot(self.db, fresh=True)
         except Exception as e:
             print("Error: ", e)
             return None, None, None
-        
-        df_orders = pd.DataFrame([i.orderId for i in orders], columns=['orderId'])
 
-        df_ordersProducts = pd.DataFrame(ordersProducts, columns=['orderId', 'productId', 'productAmount', 'orderDate'])
-        df_ordersProducts = df_ordersProducts.drop(columns=['orderDate', 'productAmount'])
+        order_codes, product_codes = snapshot.ordersProducts["orderId"], snapshot.ordersProducts["productId"]
+        mask = (order_codes >= 0) & (product_codes >= 0)
+
+        df_orders = pd.DataFrame({"orderId": np.arange(len(snapshot.orders["orderId"]), dtype=np.int32)})
+
+        df_ordersProducts = pd.DataFrame({
+            "orderId": order_codes[mask],
+            "productId": snapshot.products["productId"][product_codes[mask]],
+        })
 
-        df_products = pd.DataFrame([i.productId for i in products], columns=['productId'])
+        df_products = pd.DataFrame({"productId": snapshot.products["productId"]})
 
         return df_orders, df_ordersProducts, df_products
 
@@ -67,13 +74,6 @@ class ItemBoughtCorrelation(DataCollector):
         if combination_product_amount > len(df_orders['productId'].unique()):
             raise ValueError("Too many products to combine")
 
-
-        pivot_df = pd.crosstab(df_orders['orderId'], df_orders['productId'])
-        product_correlation = np.dot(pivot_df.T, pivot_df)
-        np.fill_diagonal(product_correlation, 0)
-
-        correlation_df = pd.DataFrame(product_correlation, index=pivot_df.columns, columns=pivot_df.columns)
-    
         try:
             product_id = df_products.loc[df_products['productId'] == UUID(productId), 'productId'].values[0]
             print(f"Product ID: {product_id}")
@@ -81,10 +81,41 @@ class ItemBoughtCorrelation(DataCollector):
             raise ValueError("Product not found")
         except IndexError as e:
             raise IndexError("Product not found")
-        
-        products =  correlation_df.loc[product_id].nlargest(combination_product_amount).index.to_list()
+
+        correlation = self._correlate(df_orders['orderId'], df_orders['productId'], product_id)
+
+        products = correlation.nlargest(combination_product_amount).index.to_list()
 
         return {"products": products}
-    
+
+    def _correlate(self, order_ids: pd.Series, product_ids: pd.Series, product_id) -> pd.Series:
+        """
+        Counts how often every product is bought together with the given product. Equals the row of the product in
+        crosstab(orderId, productId).T @ crosstab(orderId, productId) with a zero diagonal, without building the crosstab
+
+        Args:
+            order_ids (pd.Series): Order ID of every ordersProducts row
+            product_ids (pd.Series): Product ID of every ordersProducts row
+            product_id: Product ID to correlate
+
+        Returns:
+            pd.Series: Amount of common purchases by product ID, sorted by product ID
+
+        Raises:
+            KeyError: If the product was never bought
+        """
+        order_codes, _ = pd.factorize(order_ids)
+        product_codes, products = pd.factorize(product_ids)
+
+        code = np.flatnonzero(np.asarray(products) == product_id)
+        if len(code) == 0:
+            raise KeyError(product_id)
+
+        product_per_order = np.bincount(order_codes, weights=product_codes == code[0])
+        correlation = np.bincount(product_codes, weights=product_per_order[order_codes], minlength=len(products)).astype(np.int64)
+        correlation[code[0]] = 0
+
+        return pd.Series(correlation, index=products).sort_index()
+
     def report():
         pass
\ No newline at end of file
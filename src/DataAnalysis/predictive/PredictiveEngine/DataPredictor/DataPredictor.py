@@ -13,6 +13,7 @@ os.environ["MLFLOW_HTTP_REQUEST_MAX_RETRIES"] = "1"
 
 from DataAnalysis.descriptive.CustomerSignup import CustomerSignup
 from DataAnalysis.descriptive.OrdersAmount import OrdersAmount
+from DataAnalysis.descriptive.GrowthEngine import rolling
 from DataAnalysis.predictive.dependencies import OPTIONS, HORIZONS, MONTHLY_OPTIONS
 
 
@@ -52,6 +53,12 @@ class DataPredictor:
         best_run = runs[0]
         return best_run.info.run_id, best_run.info.artifact_uri
 
+    def get_model_version(self) -> str:
+        """
+        Gets the run id of the best model, it changes as soon as a better model was trained
+        """
+        return self._get_best_model_id()[0]
+
     def _load_scaler(self, run_id: str, artifact_name: str):
         try:
             local_path = mlflow.artifacts.download_artifacts(
@@ -143,9 +150,7 @@ class DataPredictor:
         for i in range(1, lag + 1):
             df[f"lag_{i}"] = df["growth"].shift(i)
 
-        df["rolling_mean"] = df["growth"].rolling(
-            window=rolling_mean
-        ).mean()
+        df["rolling_mean"] = rolling(values, rolling_mean)[1]
 
         df.dropna(inplace=True)
 
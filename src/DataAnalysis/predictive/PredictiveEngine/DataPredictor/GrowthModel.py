@@ -28,6 +28,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../s
 from DataAnalysis.predictive.PredictiveAnalysis import PredictiveAnalysis
 from DataAnalysis.descriptive.OrdersAmount import OrdersAmount
 from DataAnalysis.descriptive.CustomerSignup import CustomerSignup
+from DataAnalysis.descriptive.GrowthEngine import rolling
 from DataAnalysis.predictive.ModelOptimizer.models.ModelParams import ModelParams
 from DataAnalysis.predictive.ModelOptimizer.models.ModelData import ModelData
 
@@ -147,7 +148,7 @@ class GrowthModel(PredictiveAnalysis):
             df = pd.concat([df, lag_df], axis=1)
 
             # Add rolling mean
-            df['rolling_mean'] = df[self.growthtype].rolling(window=rolling_mean).mean()
+            df['rolling_mean'] = rolling(y, rolling_mean)[1]
             df.dropna(inplace=True)
         except Exception:
             logger.exception("Error adding lags or rolling mean")
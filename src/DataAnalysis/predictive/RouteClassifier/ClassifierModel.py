@@ -14,7 +14,7 @@ import mlflow
 from mlflow.sklearn import log_model
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '../../src')))
-from DataAnalysis.db.models.RouteClassifier import RouteClassifierRepository
+from DataAnalysis.db.snapshot import getSnapshot
 from DataAnalysis.db.models.queryparams import RouteClassifierParam as RouteClassifierParams
 from DataAnalysis.DataCollector import DataCollector
 
@@ -71,13 +71,13 @@ class ClassifierModel(DataCollector):
     # -------------------------------
     def collect(self) -> list[RouteClassifierParams]:
         """
-        Collects data from the DB
+        Collects data from the snapshot of the order star schema
 
         Returns:
             list: List of dictionaries containing the data
         """
         try:
-            return RouteClassifierRepository(self.db).get()
+            return getSnapshot(self.db).getRouteCoordinates()
         except ConnectionRefusedError as e:
             print("Connection refused: ", e)
         except ConnectionError as e:
@@ -5,7 +5,7 @@ import mlflow.artifacts
 from mlflow.sklearn import load_model
 from mlflow.tracking import MlflowClient
 
-from DataAnalysis.db.models.RouteClassifier import RouteClassifierRepository
+from DataAnalysis.db.snapshot import getSnapshot
 from DataAnalysis.db.models.queryparams import RouteClassifierParam as RouteClassifierParams
 from DataAnalysis.DataCollector import DataCollector
 
@@ -29,13 +29,13 @@ class DataPredictor(DataCollector):
     # -------------------------------
     def collect(self) -> list[RouteClassifierParams]:
         """
-        Collects data from the DB
+        Collects data from the snapshot of the order star schema
 
         Returns:
             list: List of dictionaries containing the data
         """
         try:
-            return RouteClassifierRepository(self.db).get()
+            return getSnapshot(self.db).getRouteCoordinates()
         except ConnectionRefusedError as e:
             print("Connection refused: ", e)
         except ConnectionError as e:
@@ -69,6 +69,12 @@ class DataPredictor(DataCollector):
         best_run = runs[0]
         return best_run.info.run_id, best_run.info.artifact_uri
 
+    def get_model_version(self) -> str:
+        """
+        Gets the run id of the best model, it changes as soon as a better model was trained
+        """
+        return self._get_best_model_id()[0]
+
     def _load_scaler(self, run_id: str, artifact_name: str):
         local_path = mlflow.artifacts.download_artifacts(
             run_id=run_id,
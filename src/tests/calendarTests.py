@@ -0,0 +1,100 @@
+import os,sys
+import numpy as np
+from datetime import date
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from DataAnalysis.descriptive.Calendar import Calendar, getCalendar, toOffsets, shiftMonths, fillForward
+from DataAnalysis.descriptive.dependencies import calculate_percentage_growth
+
+###################### Calendar Class ######################
+
+def test01_keysCalendar():
+    '''
+    Test case to check the labels and keys methods of Calendar class
+
+    Test01:
+    Day, month and year calendars of 2024
+    '''
+    days = Calendar("day", int(toOffsets(np.datetime64("2024-01-01"), "day")), int(toOffsets(np.datetime64("2024-12-31"), "day")))
+    months = Calendar("month", int(toOffsets(np.datetime64("2024-01"), "month")), int(toOffsets(np.datetime64("2024-12"), "month")))
+    years = Calendar("year", 54, 54)
+
+    assert days.labels([days.first + 59]) == ["2024-02-29"]
+    assert days.keys([days.first + 59]) == [date(2024, 2, 29)]
+    assert months.labels([months.last]) == ["2024-12"]
+    assert years.labels([54]) == ["2024"]
+    assert years.keys([54]) == [2024]
+
+def test02_getCalendarExtends():
+    '''
+    Test case to check that getCalendar builds the calendar again if the range is not covered
+
+    Test02:
+    Range starting in 1900
+    '''
+    first = int(toOffsets(np.datetime64("1900-01"), "month"))
+
+    calendar = getCalendar("month", first, first)
+
+    assert calendar.labels([first]) == ["1900-01"]
+    assert getCalendar("month") is calendar
+
+###################### Functions ######################
+
+def test03_fillForward():
+    '''
+    Test case to check the fillForward function
+
+    Test03:
+    Leading missing value and a zero, skip_zeros = True and False
+    '''
+    values = np.array([np.nan, 3.0, 0.0, np.nan, 5.0])
+
+    assert fillForward(values).tolist() == [0.0, 3.0, 0.0, 0.0, 5.0]
+    assert fillForward(values, skip_zeros=True).tolist() == [0.0, 3.0, 3.0, 3.0, 5.0]
+
+def test04_shiftMonths():
+    '''
+    Test case to check the shiftMonths function
+
+    Test04:
+    Days at the end of a month shifted back one and twelve months
+    '''
+    days = np.array(["2024-03-31", "2025-02-28", "2024-02-29"], dtype="datetime64[D]")
+
+    assert shiftMonths(days, -1).astype(str).tolist() == ["2024-02-29", "2025-01-28", "2024-01-29"]
+    assert shiftMonths(days, -12).astype(str).tolist() == ["2023-03-31", "2024-02-28", "2023-02-28"]
+
+def test05_calculatePercentageGrowth():
+    '''
+    Test case to check the calculate_percentage_growth function with the year over year and last month comparisons
+
+    Test05:
+    Four months of two years, year_over_year = True, last_month = True
+    '''
+    result = calculate_percentage_growth({"2023-02": 10, "2023-03": 20, "2024-02": 15, "2024-03": 30}, year_over_year=True, last_month=True)
+
+    assert calculate_percentage_growth({"2023": 100, "2024": 200}) == {"2023": [0, 100], "2024": [100.0, 200]}
+    assert result == {
+        "2023-02": [0, 10, 0, 0],
+        "2023-03": [100.0, 20, 0, 100.0],
+        "2024-02": [-25.0, 15, 50.0, 0],
+        "2024-03": [100.0, 30, 50.0, 100.0],
+    }
+
+def test06_weeksAndQuarters():
+    '''
+    Test case to check the ISO week and quarter buckets of toOffsets and their labels
+
+    Test06:
+    Days around the turn of the years 2020, 2024 and 2025
+    '''
+    days = np.array(["2020-12-31", "2021-01-03", "2021-01-04", "2024-01-01", "2024-12-30"], dtype="datetime64[D]")
+
+    weeks = toOffsets(days, "week")
+    quarters = toOffsets(days, "quarter")
+    calendar = getCalendar("week", int(weeks.min()), int(weeks.max()))
+
+    assert calendar.labels(weeks) == ["2020-W53", "2020-W53", "2021-W01", "2024-W01", "2025-W01"]
+    assert calendar.labels(weeks) == [f"{i.isocalendar()[0]}-W{i.isocalendar()[1]:02d}" for i in days.astype(object)]
+    assert getCalendar("quarter", int(quarters.min()), int(quarters.max())).labels(quarters) == ["2020-Q4", "2021-Q1", "2021-Q1", "2024-Q1", "2024-Q4"]
@@ -0,0 +1,165 @@
+import pytest
+import os,sys
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from DataAnalysis.descriptive.DailyAggregate import DailyAggregate
+from DataAnalysis.descriptive.PrefixSumIndex import PrefixSumIndex
+
+class MockRepository:
+    '''
+    Repository serving the daily buckets of a dictionary of day to value
+    '''
+    def __init__(self, days: dict):
+        self.days = days
+        self.since = []
+
+    def getBuckets(self, granularity, last_days=0, since=None):
+        self.since.append(since)
+        return [SimpleNamespace(bucket=day, value=value) for day, value in sorted(self.days.items()) if since is None or day >= since]
+
+    def getTotalBefore(self, before):
+        return sum(value for day, value in self.days.items() if day < before)
+
+def day(days_ago: int) -> datetime:
+    return datetime.combine(datetime.now().date() - timedelta(days=days_ago), datetime.min.time())
+
+###################### DailyAggregate Class ######################
+
+def test01_updateDailyAggregateOnlyFetchesFromWatermark():
+    '''
+    Test case to check that the update method of DailyAggregate class only fetches the days from the watermark on
+
+    Test01:
+    Two updates, the second one with a new row on the latest day and a new day
+    '''
+    repository = MockRepository({day(3): 1, day(1): 2})
+    aggregate = DailyAggregate()
+
+    aggregate.update(repository)
+    repository.days[day(1)] = 3
+    repository.days[day(0)] = 4
+    aggregate.update(repository)
+
+    assert repository.since == [None, day(1)]
+    assert [(i.bucket, i.value) for i in aggregate.getBuckets("day")] == [(day(3), 1), (day(1), 3), (day(0), 4)]
+
+def test02_updateDailyAggregateRowsBeforeWatermark():
+    '''
+    Test case to check the update method of DailyAggregate class with rows added before the watermark
+
+    Test02:
+    The aggregate is read again
+    '''
+    repository = MockRepository({day(3): 1, day(1): 2})
+    aggregate = DailyAggregate()
+
+    aggregate.update(repository)
+    repository.days[day(2)] = 5
+    aggregate.update(repository)
+
+    assert repository.since == [None, None]
+    assert aggregate.getTotalBefore(day(0)) == 8
+
+def test03_getBucketsDailyAggregateMonthAndYear():
+    '''
+    Test case to check the getBuckets method of DailyAggregate class with month and year granularity
+
+    Test03:
+    Days are summed up by month and year
+    '''
+    repository = MockRepository({datetime(2024, 1, 5): 1, datetime(2024, 1, 20): 2, datetime(2024, 3, 1): 3, datetime(2025, 2, 1): 4})
+    aggregate = DailyAggregate()
+    aggregate.update(repository)
+
+    assert [(i.bucket, i.value) for i in aggregate.getBuckets("month")] == [(datetime(2024, 1, 1), 3), (datetime(2024, 3, 1), 3), (datetime(2025, 2, 1), 4)]
+    assert [(i.bucket, i.value) for i in aggregate.getBuckets("year")] == [(datetime(2024, 1, 1), 6), (datetime(2025, 1, 1), 4)]
+
+def test04_getBucketsDailyAggregateInvalidGranularity():
+    '''
+    Test case to check the getBuckets method of DailyAggregate class with an unknown granularity
+
+    Test04:
+    granularity = "week"
+    '''
+    with pytest.raises(ValueError) as e:
+        DailyAggregate().getBuckets("week")
+
+    assert str(e.value) == "Unknown granularity: week"
+
+def test05_getBucketsDailyAggregateDateRange():
+    '''
+    Test case to check the getBuckets and getTotal methods of DailyAggregate class with a date range
+
+    Test05:
+    date_from = 3 days ago, date_to = 1 day ago
+    '''
+    repository = MockRepository({day(5): 1, day(3): 2, day(2): 3, day(1): 4, day(0): 5})
+    aggregate = DailyAggregate()
+    aggregate.update(repository)
+
+    assert [(i.bucket, i.value) for i in aggregate.getBuckets("day", date_from=day(3), date_to=day(1))] == [(day(3), 2), (day(2), 3), (day(1), 4)]
+    assert [(i.bucket, i.value) for i in aggregate.getBuckets("day", last_days=2, date_from=day(3))] == [(day(2), 3), (day(1), 4), (day(0), 5)]
+    assert aggregate.getTotal(day(3).date(), day(1).date()) == 9
+
+###################### PrefixSumIndex Class ######################
+
+def test06_totalPrefixSumIndex():
+    '''
+    Test case to check the total and slice methods of PrefixSumIndex class
+
+    Test06:
+    Unsorted dates, ranges inside, before and after the dates
+    '''
+    index = PrefixSumIndex.fromDays({datetime(2024, 1, 3): 3, datetime(2024, 1, 1): 1, datetime(2024, 1, 2): 2})
+
+    assert index.total() == 6
+    assert index.total(datetime(2024, 1, 2), datetime(2024, 1, 3)) == 2
+    assert index.total(None, datetime(2023, 12, 31)) == 0
+    assert index.total(datetime(2024, 1, 4), None) == 0
+    assert index.slice(datetime(2024, 1, 2))[1].tolist() == [2, 3]
+
+def test07_getRollingDailyAggregate():
+    '''
+    Test case to check the getRolling method of DailyAggregate class
+
+    Test07:
+    Windows of 2 and 3 days, last_days = 2, the day before the range counts towards its first windows
+    '''
+    repository = MockRepository({day(4): 1, day(2): 2, day(1): 4, day(0): 8})
+    aggregate = DailyAggregate()
+    aggregate.update(repository)
+
+    result = aggregate.getRolling((2, 3), last_days=2)
+    labels = [day(i).strftime("%Y-%m-%d") for i in (1, 0)]
+
+    assert result[2] == {"sum": dict(zip(labels, [6, 12])), "average": dict(zip(labels, [3.0, 6.0]))}
+    assert result[3] == {"sum": dict(zip(labels, [6, 14])), "average": dict(zip(labels, [2.0, 4.67]))}
+    assert DailyAggregate().getRolling((7,)) == {7: {"sum": {}, "average": {}}}
+
+def test08_cursorDailyAggregate():
+    '''
+    Test case to check the getCursor and getSince methods of DailyAggregate class
+
+    Test08:
+    A new row today keeps the cursor valid, a row before today invalidates it, a malformed cursor
+    '''
+    repository = MockRepository({day(3): 1, day(1): 2})
+    aggregate = DailyAggregate()
+    aggregate.update(repository)
+
+    cursor = aggregate.getCursor()
+    repository.days[day(0)] = 4
+    aggregate.update(repository)
+    today = aggregate.getSince(cursor)
+    repository.days[day(2)] = 5
+    aggregate.update(repository)
+
+    assert cursor == f"{day(0).date().isoformat()}:3"
+    assert aggregate.getCursor(day(2)) == f"{day(2).date().isoformat()}:1"
+    assert today == day(0).date()
+    assert aggregate.getSince(cursor) is None
+
+    with pytest.raises(ValueError):
+        aggregate.getSince("yesterday")
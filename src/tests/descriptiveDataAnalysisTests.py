@@ -1,5 +1,6 @@
 import pytest
 import os,sys
+from collections import namedtuple
 from datetime import datetime, timedelta
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
@@ -1694,4 +1695,97 @@ def test39_performRoutesAmountLimitGreaterThanData(monkeypatch):
         analysis = RoutesAmount.RoutesAmount()
         RoutesAmount.RoutesAmount.perform(analysis, limit=5)
 
-    assert str(e.value) == "Limit is greater than the amount of routes with orders are present"
\ No newline at end of file
+    assert str(e.value) == "Limit is greater than the amount of routes with orders are present"
+
+def test40_performProductsMostlyBoughtTopProducts(monkeypatch):
+    '''
+    Test case to check the perform method of ProductsMostlyBought class with the products ranked by the DB
+    Fewer products than the limit are returned if fewer were bought in the window
+
+    Test40:
+    year = True, limit = 3, two bought products in the current year
+    '''
+    calls = []
+
+    def mock_collect(self, limit=None, start=None, end=None):
+        calls.append((limit, start, end))
+        return [("product4", 20), ("product3", 15)]
+
+    monkeypatch.setattr(ProductsMostlyBought.ProductsMostlyBought, 'collect', mock_collect)
+
+    analysis = ProductsMostlyBought.ProductsMostlyBought()
+    result = ProductsMostlyBought.ProductsMostlyBought.perform(analysis, year=True, limit=3)
+
+    year = datetime.now().year
+    assert result == {"products": {'product4': 20, 'product3': 15}, "typeofgraph": "bar"}
+    assert calls == [(3, datetime(year, 1, 1), datetime(year + 1, 1, 1))]
+
+def test41_performProductsMostlyBoughtLimitZero(monkeypatch):
+    '''
+    Test case to check the perform method of ProductsMostlyBought class with limit 0
+    Should return all products for the last days
+
+    Test41:
+    last_days = 0, limit = 0
+    '''
+    def mock_collect(self, limit=None, start=None, end=None):
+        assert limit is None and start is None and end is None
+        return [("product4", 20), ("product3", 15)]
+
+    monkeypatch.setattr(ProductsMostlyBought.ProductsMostlyBought, 'collect', mock_collect)
+
+    analysis = ProductsMostlyBought.ProductsMostlyBought()
+    result = ProductsMostlyBought.ProductsMostlyBought.perform(analysis, limit=0)
+
+    assert result == {"products": {'product4': 20, 'product3': 15}, "typeofgraph": "bar"}
+
+def test42_performProductsAmountStockEnds(monkeypatch):
+    '''
+    Test case to check the perform method of ProductsAmount class with the ends of the stock ranking collected by the DB
+
+    Test42:
+    limit = 3, two products with the highest and one with the lowest stock, then limit = 4 with only three products
+    '''
+    Row = namedtuple("Row", ["productId", "name", "stock", "highest"])
+    rows = {
+        (2, 1): [Row(1, "product1", 5, False), Row(4, "product4", 20, True), Row(3, "product3", 15, True)],
+        (2, 2): [Row(4, "product4", 20, True), Row(3, "product3", 15, True), Row(1, "product1", 5, False), Row(3, "product3", 15, False)],
+    }
+
+    def mock_collect(self):
+        return rows[(self.top, self.bottom)]
+
+    monkeypatch.setattr(ProductsAmount.ProductsAmount, 'collect', mock_collect)
+
+    analysis = ProductsAmount.ProductsAmount()
+    result = ProductsAmount.ProductsAmount.perform(analysis, 3)
+
+    assert list(result["products"].items()) == [("product4", 20), ("product3", 15), ("product1", 5)]
+
+    with pytest.raises(Exception) as e:
+        ProductsAmount.ProductsAmount.perform(analysis, 4)
+
+    assert str(e.value) == "Limit is greater than the amount of products present"
+
+def test43_performProductsMostlyBoughtInvalidParametersBeforeCollect(monkeypatch):
+    '''
+    Test case to check that the perform method of ProductsMostlyBought class validates its parameters before querying
+    Should raise without calling collect
+
+    Test43:
+    limit = -1, last_days = -1
+    '''
+    def mock_collect(self, limit=None, start=None, end=None):
+        raise AssertionError("collect must not be called")
+
+    monkeypatch.setattr(ProductsMostlyBought.ProductsMostlyBought, 'collect', mock_collect)
+
+    analysis = ProductsMostlyBought.ProductsMostlyBought()
+
+    with pytest.raises(Exception) as e:
+        ProductsMostlyBought.ProductsMostlyBought.perform(analysis, limit=-1)
+    assert str(e.value) == "Limit cannot be negative"
+
+    with pytest.raises(ValueError) as e:
+        ProductsMostlyBought.ProductsMostlyBought.perform(analysis, last_days=-1)
+    assert str(e.value) == "The number of days should be greater than zero"
@@ -0,0 +1,199 @@
+import pytest
+import os,sys
+import numpy as np
+import pandas as pd
+from datetime import date, datetime, timedelta
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from DataAnalysis.descriptive.GrowthEngine import GrowthEngine, rolling, minMaxIndices
+from DataAnalysis.descriptive.dependencies import downsample, changedSince, toColumnar, columnLabels
+from DataAnalysis.db.models.queryparams import GrowthBucket
+
+###################### GrowthEngine Class ######################
+
+def test01_bucketsGrowthEngine():
+    '''
+    Test case to check the buckets method of GrowthEngine class
+
+    Test01:
+    Rows of two days and one day later in another year
+    '''
+    engine = GrowthEngine(np.array(["2023-12-31T10:00", "2023-12-31T12:00", "2024-01-02T08:00"], dtype="datetime64[us]"))
+
+    days, sums = engine.buckets("day")
+    years, year_sums = engine.buckets("year")
+
+    assert sums.tolist() == [2, 1]
+    assert (days[1] - days[0]) == 2
+    assert (years + 1970).tolist() == [2023, 2024]
+    assert year_sums.tolist() == [2, 1]
+
+def test02_growthGrowthEngine():
+    '''
+    Test case to check the growth method of GrowthEngine class without showzeros
+
+    Test02:
+    Buckets of two months, cumulative = True
+    '''
+    data = [GrowthBucket(bucket=datetime(2024, 1, 5), value=2), GrowthBucket(bucket=datetime(2024, 1, 20), value=1), GrowthBucket(bucket=datetime(2024, 3, 1), value=4)]
+
+    growth, cumulative_growth = GrowthEngine.fromBuckets(data).growth("month", cumulative=True)
+    yearly, _ = GrowthEngine.fromBuckets(data).growth("year")
+    daily, _ = GrowthEngine.fromBuckets(data).growth("day")
+
+    assert growth == {"2024-01": 3, "2024-03": 4}
+    assert cumulative_growth == {"2024-01": 3, "2024-03": 7}
+    assert yearly == {2024: 7}
+    assert list(daily) == [date(2024, 1, 5), date(2024, 1, 20), date(2024, 3, 1)]
+
+def test03_growthShowZerosGrowthEngine():
+    '''
+    Test case to check the growth method of GrowthEngine class with showzeros for the last days
+
+    Test03:
+    last_days = 3, one bucket two days ago, initial = 5
+    '''
+    today = datetime.combine(date.today(), datetime.min.time())
+    data = [GrowthBucket(bucket=today - timedelta(days=2), value=2)]
+
+    growth, cumulative_growth = GrowthEngine.fromBuckets(data).growth(
+        "day", showzeros=True, cumulative=True, start=today - timedelta(days=3), initial=5, last_days=3
+    )
+
+    keys = [(today - timedelta(days=i)).strftime("%Y-%m-%d") for i in (2, 1, 0)]
+    assert growth == dict(zip(keys, [2, 0, 0]))
+    assert cumulative_growth == dict(zip(keys, [7, 7, 7]))
+
+def test04_rolling():
+    '''
+    Test case to check the rolling function against a pandas rolling window
+
+    Test04:
+    Window of 3 over 6 values, window longer than the values and a window of 0
+    '''
+    values = np.array([1, 0, 4, 2, 0, 5])
+
+    sums, averages = rolling(values, 3)
+
+    assert np.allclose(sums, pd.Series(values).rolling(window=3).sum().to_numpy(), equal_nan=True)
+    assert np.allclose(averages, pd.Series(values).rolling(window=3).mean().to_numpy(), equal_nan=True)
+    assert np.isnan(rolling(values, 7)[0]).all()
+
+    with pytest.raises(ValueError):
+        rolling(values, 0)
+
+def test05_growthsGrowthEngine():
+    '''
+    Test case to check that the growths method builds the same growth as the growth method for every granularity
+
+    Test05:
+    Rows of three days in two years, showzeros = True, cumulative = True
+    '''
+    engine = GrowthEngine(np.array(["2023-12-30T10:00", "2023-12-31T12:00", "2024-02-02T08:00"], dtype="datetime64[us]"))
+    start, end = datetime(2023, 12, 1), datetime(2024, 3, 1)
+
+    growths = engine.growths(("day", "week", "month", "quarter", "year"), showzeros=True, cumulative=True, start=start, initial=4, end=end)
+
+    for granularity, growth in growths.items():
+        assert growth == engine.growth(granularity, True, True, start, 4, end=end)
+    assert growths["week"][0]["2023-W52"] == 2
+    assert growths["quarter"][1] == {"2023-Q4": 6, "2024-Q1": 7}
+
+def test06_minMaxIndices():
+    '''
+    Test case to check that the minMaxIndices function keeps the ends and the extremes of a long series
+
+    Test06:
+    1000 values with one spike and one drop, max_points = 20, a short series and max_points = 1
+    '''
+    values = np.ones(1000)
+    values[123], values[877] = 50, -5
+
+    indices = minMaxIndices(values, 20)
+
+    assert len(indices) <= 20
+    assert {0, 123, 877, 999} <= set(indices.tolist())
+    assert (np.diff(indices) > 0).all()
+    assert minMaxIndices(values[:5], 20).tolist() == [0, 1, 2, 3, 4]
+    assert minMaxIndices(values, 3).tolist() == [0, 999]
+
+    with pytest.raises(ValueError):
+        minMaxIndices(values, 1)
+
+def test07_downsample():
+    '''
+    Test case to check that the downsample function reduces every series of a growth result without changing it
+
+    Test07:
+    Percentage growth of 90 days and the granularities result, max_points = 10 and None
+    '''
+    days = [f"2024-01-{i:02d}" for i in range(1, 32)] + [f"2024-02-{i:02d}" for i in range(1, 30)] + [f"2024-03-{i:02d}" for i in range(1, 31)]
+    growth = {day: [0, 7 if i == 40 else 1] for i, day in enumerate(days)}
+    result = {"growth": growth, "cumulative_growth": {}, "typeofgraph": "line"}
+
+    reduced = downsample(result, 10)
+    nested = downsample({"day": {"growth": dict(zip(days, range(90))), "cumulative_growth": {}}, "typeofgraph": "line"}, 10)
+
+    assert len(reduced["growth"]) <= 10
+    assert reduced["growth"]["2024-02-10"] == [0, 7]
+    assert reduced["cumulative_growth"] == {} and reduced["typeofgraph"] == "line"
+    assert len(result["growth"]) == 90
+    assert list(nested["day"]["growth"])[-1] == "2024-03-30"
+    assert downsample(result) is result
+
+def test08_changedSince():
+    '''
+    Test case to check that the changedSince function keeps the buckets from the one containing the day on
+
+    Test08:
+    Daily growth with date keys and rolling windows, monthly percentage growth and the granularities result
+    '''
+    daily = {"growth": {date(2024, 4, 29): 1, date(2024, 5, 3): 2}, "cumulative_growth": {}, "rolling": {7: {"sum": {"2024-05-02": 1, "2024-05-03": 3}}}, "typeofgraph": "line"}
+    monthly = {"growth": {"2024-04": [0, 1], "2024-05": [100.0, 2]}, "cumulative_growth": {"2024-04": 1, "2024-05": 3}}
+    granularities = {"week": {"growth": {"2024-W17": 1, "2024-W18": 2}}, "year": {"growth": {2023: 4, 2024: 3}}, "typeofgraph": "line"}
+
+    assert changedSince(daily, date(2024, 5, 3)) == {"growth": {date(2024, 5, 3): 2}, "cumulative_growth": {}, "rolling": {7: {"sum": {"2024-05-03": 3}}}, "typeofgraph": "line"}
+    assert changedSince(monthly, date(2024, 5, 3), "month") == {"growth": {"2024-05": [100.0, 2]}, "cumulative_growth": {"2024-05": 3}}
+    assert changedSince(granularities, date(2024, 5, 3)) == {"week": {"growth": {"2024-W18": 2}}, "year": {"growth": {2024: 3}}, "typeofgraph": "line"}
+
+def test09_toColumnar():
+    '''
+    Test case to check that the toColumnar function converts growth results to parallel arrays
+
+    Test09:
+    Consecutive days with rolling windows, months with a gap and year over year percentages, the granularities result
+    '''
+    daily = {"growth": {"2024-02-28": 1, "2024-02-29": 0, "2024-03-01": 2}, "cumulative_growth": {"2024-02-28": 1, "2024-02-29": 1, "2024-03-01": 3}, "rolling": {7: {"sum": {"2024-03-01": 3}}}, "typeofgraph": "line"}
+    monthly = {"growth": {"2023-02": [0, 10, 0], "2024-02": [50.0, 15, 50.0]}, "cumulative_growth": {}, "typeofgraph": "line"}
+    granularities = {"week": {"amount": {"2024-W52": 2, "2025-W01": 3}, "cumulative_amount": {}}, "typeofgraph": "line"}
+
+    columns = toColumnar(daily)
+    months = toColumnar(monthly, "month", year_over_year=True)
+    weeks = toColumnar(granularities)
+
+    assert columns == {"start": "2024-02-28", "freq": "D", "values": [1, 0, 2], "cumulative": [1, 1, 3], "rolling": {7: {"sum": [None, None, 3]}}, "typeofgraph": "line"}
+    assert columnLabels(columns) == ["2024-02-28", "2024-02-29", "2024-03-01"]
+    assert months == {"start": "2023-02", "freq": "M", "labels": ["2023-02", "2024-02"], "percentage": [0, 50.0], "values": [10, 15], "year_over_year": [0, 50.0], "typeofgraph": "line"}
+    assert weeks == {"week": {"start": "2024-W52", "freq": "W", "values": [2, 3]}, "typeofgraph": "line"}
+    assert columnLabels(weeks["week"]) == ["2024-W52", "2025-W01"]
+
+def test10_growthShowZerosKeysGrowthEngine():
+    '''
+    Test case to check that with showzeros the growth and the cumulative growth have the same keys for every granularity
+
+    Test10:
+    Buckets in 2022 and 2024 without any in 2023, showzeros = True, cumulative = True
+    '''
+    engine = GrowthEngine(np.array(["2022-11-05", "2024-02-20"], dtype="datetime64[us]"), np.array([2, 3]))
+
+    for granularity in ("day", "week", "month", "quarter", "year"):
+        growth, cumulative_growth = engine.growth(granularity, showzeros=True, cumulative=True, end=datetime(2024, 3, 1))
+
+        assert growth.keys() == cumulative_growth.keys()
+        assert all(isinstance(value, int) for value in cumulative_growth.values())
+        assert list(cumulative_growth.values())[0] == 2
+        assert list(cumulative_growth.values())[-1] == 5
+
+    growth, cumulative_growth = engine.growth("year", showzeros=True, cumulative=True, end=datetime(2024, 3, 1))
+    assert growth == {"2022": 2, "2023": 0, "2024": 3}
+    assert cumulative_growth == {"2022": 2, "2023": 2, "2024": 5}
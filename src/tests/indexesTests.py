@@ -0,0 +1,66 @@
+import pytest
+import os,sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import datetime
+from sqlalchemy import bindparam, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from DataAnalysis.db.indexes import _parsePlan, explain
+from DataAnalysis.db.model import Order
+
+###################### EXPLAIN reports ######################
+
+def test01_parsePlanPostgresql():
+    '''
+    Test case to check the parsing of a Postgres JSON plan
+
+    Test01:
+    Hash join of an index only scan and a sequential scan
+    '''
+    plan = [{"Plan": {"Node Type": "Hash Join", "Plans": [
+        {"Node Type": "Index Only Scan", "Relation Name": "routesOrders", "Index Name": "ix_routesOrders_orderId_routeId"},
+        {"Node Type": "Hash", "Plans": [{"Node Type": "Seq Scan", "Relation Name": "orders"}]},
+    ]}}]
+
+    result, indexes, scans = _parsePlan("postgresql", [(plan,)])
+
+    assert result == plan
+    assert indexes == {"ix_routesOrders_orderId_routeId"}
+    assert scans == {"orders"}
+
+def test02_parsePlanSqlite():
+    '''
+    Test case to check the parsing of a SQLite query plan
+
+    Test02:
+    Covering index search and a full table scan
+    '''
+    rows = [
+        (2, 0, 0, "SEARCH orders USING COVERING INDEX ix_orders_orderDate (orderDate>? AND orderDate<?)"),
+        (3, 0, 0, "SCAN routesOrders"),
+        (4, 0, 0, "USE TEMP B-TREE FOR GROUP BY"),
+    ]
+
+    result, indexes, scans = _parsePlan("sqlite", rows)
+
+    assert len(result) == 3
+    assert indexes == {"ix_orders_orderDate"}
+    assert scans == {"routesOrders"}
+
+def test03_explainLiteralParameters():
+    '''
+    Test case to check that the explained statement is compiled with its parameters inline
+
+    Test03:
+    Bound date of a prebuilt statement on Postgres and SQLite
+    '''
+    statement = select(Order.orderId).where(Order.orderDate >= bindparam("start"))
+
+    postgres = str(explain(statement, {"start": datetime(2024, 1, 1)}, postgresql.dialect()))
+    lite = str(explain(statement, {"start": datetime(2024, 1, 1)}, sqlite.dialect()))
+
+    assert postgres.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert lite.startswith("EXPLAIN QUERY PLAN SELECT")
+    assert "'2024-01-01 00:00:00'" in postgres
+    assert "'2024-01-01 00:00:00.000000'" in lite
@@ -0,0 +1,96 @@
+import pytest
+import os,sys
+from datetime import datetime
+from sqlalchemy import create_engine, Column, DateTime, Integer, MetaData, Table
+from sqlalchemy.orm import Session
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from DataAnalysis.db.instrumentation import QueryStats, tagQueries, currentTag, query_stats, UNTAGGED
+from DataAnalysis.db.models.BaseRepository import BaseRepository
+
+###################### tagQueries Function ######################
+
+def test01_tagQueriesOuterTagIsKept():
+    '''
+    Test case to check that tagQueries keeps the tag of the outer function
+
+    Test01:
+    A tagged function calling another tagged function
+    '''
+    inner = tagQueries("Repository.inner", lambda: currentTag())
+    outer = tagQueries("Repository.outer", lambda: (currentTag(), inner()))
+
+    assert inner() == "Repository.inner"
+    assert outer() == ("Repository.outer", "Repository.outer")
+    assert currentTag() == UNTAGGED
+
+def test02_tagQueriesGenerator():
+    '''
+    Test case to check tagQueries with a generator function
+
+    Test02:
+    The tag is set while the generator is resumed, not between
+    '''
+    def generator():
+        yield currentTag()
+        yield currentTag()
+
+    tagged = tagQueries("Repository.stream", generator)()
+
+    assert next(tagged) == "Repository.stream"
+    assert currentTag() == UNTAGGED
+    assert list(tagged) == ["Repository.stream"]
+
+###################### QueryStats Class ######################
+
+def test03_getQueryStatsOrderedByTotalTime():
+    '''
+    Test case to check the get method of QueryStats class
+
+    Test03:
+    Two tags, the one with the most total time comes first
+    '''
+    stats = QueryStats()
+    stats.recordQuery("Repository.fast", 1.0, False)
+    stats.recordQuery("Repository.slow", 600.0, True)
+    stats.recordQuery("Repository.slow", 200.0, False)
+    stats.recordRows("Repository.slow", 10, 80)
+    stats.recordError("Repository.fast")
+
+    result = stats.get()
+
+    assert [i["tag"] for i in result] == ["Repository.slow", "Repository.fast"]
+    assert result[0]["queries"] == 2
+    assert result[0]["slow_queries"] == 1
+    assert result[0]["avg_ms"] == 400.0
+    assert result[0]["max_ms"] == 600.0
+    assert result[0]["rows"] == 10 and result[0]["bytes"] == 80
+    assert result[1]["errors"] == 1
+
+###################### BaseRepository Class ######################
+
+def test04_totalBaseRepositoryRecordsRows():
+    '''
+    Test case to check that the rows of the total method of BaseRepository class are recorded under the tag of the calling method
+
+    Test04:
+    Two rows in an in-memory table, one of them before the given point in time
+    '''
+    table = Table("events", MetaData(), Column("id", Integer, primary_key=True), Column("date", DateTime))
+
+    class EventRepository(BaseRepository):
+        def countBefore(self, before):
+            return self.total(table.c.date, before)
+
+    engine = create_engine("sqlite://")
+    table.create(engine)
+    with engine.begin() as connection:
+        connection.execute(table.insert(), [{"date": datetime(2024, 1, 1)}, {"date": datetime(2024, 1, 3)}])
+
+    query_stats.reset()
+    with Session(engine) as session:
+        result = EventRepository(None, session).countBefore(datetime(2024, 1, 2))
+
+    stats = {i["tag"]: i for i in query_stats.get()}
+    assert result == 1
+    assert stats["EventRepository.countBefore"]["rows"] == 1
@@ -0,0 +1,127 @@
+import pytest
+import os,sys
+from sqlalchemy import create_engine, select, insert, Integer, String
+from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
+from sqlalchemy.pool import StaticPool
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from DataAnalysis.db.replica import ReplicaMonitor, RoutingSession
+
+class Base(DeclarativeBase):
+    pass
+
+class Event(Base):
+    __tablename__ = "events"
+
+    eventId: Mapped[int] = mapped_column(Integer, primary_key=True)
+    source: Mapped[str] = mapped_column(String(20), nullable=False)
+
+def mock_database(source: str):
+    '''
+    In-memory SQLite database whose events table holds one row naming the database
+    '''
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Event), [{"eventId": 1, "source": source}])
+    return engine
+
+def sources(engine) -> list[str]:
+    with engine.connect() as connection:
+        return connection.execute(select(Event.source).order_by(Event.eventId)).scalars().all()
+
+@pytest.fixture
+def engines():
+    primary, replica = mock_database("primary"), mock_database("replica")
+    yield primary, replica
+    primary.dispose()
+    replica.dispose()
+
+###################### RoutingSession Class ######################
+
+def test01_routingSessionReadsFromReplica(engines):
+    '''
+    Test case to check that the reads of RoutingSession class go to the read replica
+
+    Test01:
+    Replica available without lag
+    '''
+    primary, replica = engines
+    monitor = ReplicaMonitor(replica, max_lag=30, check_interval=0)
+
+    with RoutingSession(bind=primary, replica=replica, monitor=monitor) as session:
+        assert session.execute(select(Event.source)).scalars().all() == ["replica"]
+
+def test02_routingSessionWritesToPrimary(engines):
+    '''
+    Test case to check that the writes of RoutingSession class go to the primary
+
+    Test02:
+    A Core insert and an ORM insert flushed by the commit
+    '''
+    primary, replica = engines
+
+    with RoutingSession(bind=primary, replica=replica) as session:
+        session.execute(insert(Event).values(eventId=2, source="core"))
+        session.add(Event(eventId=3, source="orm"))
+        session.commit()
+
+    assert sources(primary) == ["primary", "core", "orm"]
+    assert sources(replica) == ["replica"]
+
+def test03_routingSessionPrimaryBlock(engines):
+    '''
+    Test case to check that the reads inside the primary block of RoutingSession class go to the primary
+
+    Test03:
+    A read inside the block, nested blocks and a read after it
+    '''
+    primary, replica = engines
+
+    with RoutingSession(bind=primary, replica=replica) as session:
+        with session.primary():
+            with session.primary():
+                assert session.execute(select(Event.source)).scalars().all() == ["primary"]
+            assert session.execute(select(Event.source)).scalars().all() == ["primary"]
+        assert session.execute(select(Event.source)).scalars().all() == ["replica"]
+
+def test04_routingSessionFallsBackToPrimary(engines):
+    '''
+    Test case to check that the reads of RoutingSession class fall back to the primary
+
+    Test04:
+    No replica, an unreachable replica and a replica lagging behind more than max_lag
+    '''
+    primary, replica = engines
+    unreachable = create_engine("sqlite:////nonexistent/directory/replica.db")
+    unreachable_monitor = ReplicaMonitor(unreachable, max_lag=30, check_interval=0)
+    lagging_monitor = ReplicaMonitor(replica, max_lag=-1, check_interval=0)
+
+    with RoutingSession(bind=primary) as session:
+        assert session.execute(select(Event.source)).scalars().all() == ["primary"]
+
+    with RoutingSession(bind=primary, replica=unreachable, monitor=unreachable_monitor) as session:
+        assert session.execute(select(Event.source)).scalars().all() == ["primary"]
+
+    with RoutingSession(bind=primary, replica=replica, monitor=lagging_monitor) as session:
+        assert session.execute(select(Event.source)).scalars().all() == ["primary"]
+
+    assert unreachable_monitor.status()["available"] is False
+    assert unreachable_monitor.status()["error"] is not None
+    assert lagging_monitor.status() == {"available": False, "lag": 0.0, "max_lag": -1, "error": None}
+
+###################### ReplicaMonitor Class ######################
+
+def test05_replicaMonitorCheckInterval(engines):
+    '''
+    Test case to check that ReplicaMonitor class reuses the result of a check for check_interval seconds
+
+    Test05:
+    The replica becomes unreachable after the first check, check_interval = 600
+    '''
+    primary, replica = engines
+    monitor = ReplicaMonitor(replica, max_lag=30, check_interval=600)
+
+    assert monitor.available()
+    monitor.engine = create_engine("sqlite:////nonexistent/directory/replica.db")
+    assert monitor.available()
@@ -0,0 +1,89 @@
+import os,sys
+from datetime import date
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from DataAnalysis.db.cache import ResultCache, getVersion
+
+class MockAnalysis:
+    '''
+    Analysis counting how often it was computed
+    '''
+    def __init__(self):
+        self.computed = 0
+
+    def perform(self, **parameters):
+        self.computed += 1
+        return {"growth": {"2024-01-01": self.computed}, "parameters": parameters}
+
+###################### ResultCache Class ######################
+
+def test01_getResultCacheHitsAndMisses():
+    '''
+    Test case to check that the get method of ResultCache class only computes a result once per parameters
+
+    Test01:
+    The same parameters in another order, then other parameters
+    '''
+    cache = ResultCache(max_bytes=1024 * 1024, max_entries=10, ttl=600, check_interval=600)
+    analysis = MockAnalysis()
+
+    first = cache.get("Mock", ("orders",), {"month": True, "last_days": 0}, lambda: analysis.perform(month=True), lambda: (1,))
+    second = cache.get("Mock", ("orders",), {"last_days": 0, "month": True}, lambda: analysis.perform(month=True), lambda: (1,))
+    cache.get("Mock", ("orders",), {"last_days": 7, "month": False, "date_from": date(2024, 1, 1)}, lambda: analysis.perform(), lambda: (1,))
+
+    assert first is second
+    assert analysis.computed == 2
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 2
+
+def test02_getResultCacheWatermarkInvalidation():
+    '''
+    Test case to check that the get method of ResultCache class computes the result again once the watermark changed
+
+    Test02:
+    check_interval = 0, the watermark changes before the third get
+    '''
+    cache = ResultCache(max_bytes=1024 * 1024, max_entries=10, ttl=600, check_interval=0)
+    analysis = MockAnalysis()
+    watermark = [(1,)]
+
+    cache.get("Mock", ("orders",), {}, analysis.perform, lambda: watermark[0])
+    cache.get("Mock", ("orders",), {}, analysis.perform, lambda: watermark[0])
+    watermark[0] = (2,)
+    result = cache.get("Mock", ("orders",), {}, analysis.perform, lambda: watermark[0])
+
+    assert result["growth"] == {"2024-01-01": 2}
+    assert cache.stats()["invalidations"] == 1
+
+def test03_getResultCacheEviction():
+    '''
+    Test case to check that the least recently used results are evicted once the cache is full
+
+    Test03:
+    max_entries = 2, three parameter combinations, the first one is used again before the third one
+    '''
+    cache = ResultCache(max_bytes=1024 * 1024, max_entries=2, ttl=600, check_interval=600)
+    analysis = MockAnalysis()
+
+    for limit in (1, 2, 1, 3, 1):
+        cache.get("Mock", ("products",), {"limit": limit}, lambda: analysis.perform(limit=limit), lambda: (1,))
+
+    assert analysis.computed == 3
+    assert cache.stats()["evictions"] == 1
+    assert cache.stats()["entries"] == 2
+    assert cache.stats()["bytes"] > 0
+
+def test04_getVersionCheckInterval():
+    '''
+    Test case to check that the getVersion function reads a version like the run of a model only once per check interval
+
+    Test04:
+    Two calls in a row, the run changed in between
+    '''
+    runs = ["run-1", "run-2"]
+
+    first = getVersion(("model", "Mock"), lambda: (runs.pop(0),))
+    second = getVersion(("model", "Mock"), lambda: (runs.pop(0),))
+
+    assert first == second == ("run-1",)
+    assert runs == ["run-2"]
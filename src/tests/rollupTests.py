@@ -0,0 +1,138 @@
+import pytest
+import os,sys
+from datetime import datetime
+from uuid import uuid4
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from DataAnalysis.db.model import Base, Customer, Order, Invoice
+from DataAnalysis.db.rollups import createRollupTables, refreshRollups
+from DataAnalysis.db.models.Rollup import RollupRepository
+from DataAnalysis.db.models.OrderAmount import OrderAmountRepository
+from DataAnalysis.db.models.CustomerSignup import CustomerSignupRepository
+from DataAnalysis.db.models.InvoicesAmount import InvoicesAmountRepository
+
+RAW = {"orders": OrderAmountRepository, "customers": CustomerSignupRepository, "invoices": InvoicesAmountRepository}
+
+def date_trunc(granularity: str, value: str | None) -> str | None:
+    '''
+    date_trunc of Postgres for the day, month and year buckets on SQLite
+    '''
+    if value is None:
+        return None
+    day = datetime.fromisoformat(value).replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity in ("month", "year"):
+        day = day.replace(day=1)
+    if granularity == "year":
+        day = day.replace(month=1)
+    return day.strftime("%Y-%m-%d %H:%M:%S.%f")
+
+@pytest.fixture
+def session_factory():
+    '''
+    In-memory SQLite database with the customers, orders and invoices tables and the rollup tables
+    '''
+    engine = create_engine("sqlite://", poolclass=StaticPool, connect_args={"check_same_thread": False})
+    event.listen(engine, "connect", lambda connection, record: connection.create_function("date_trunc", 2, date_trunc))
+    Base.metadata.create_all(engine, tables=[Customer.__table__, Order.__table__, Invoice.__table__])
+    createRollupTables(engine)
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+def add_orders(session_factory, *dates: datetime):
+    '''
+    Adds a customer that signed up, an order and its invoice per date, the invoice amounts are 10, 20, 30, ...
+    '''
+    with session_factory() as session:
+        for number, day in enumerate(dates, start=1):
+            reference = int(day.timestamp())
+            order = Order(orderId=uuid4(), orderDate=day, customerReference=reference)
+            session.add(Customer(customerReference=reference, signedUp=day, addressId=uuid4()))
+            session.add(order)
+            session.add(Invoice(orderId=order.orderId, invoiceAmount=number * 10, paymentDate=day))
+        session.commit()
+
+def assert_rollups_match(session_factory):
+    '''
+    Asserts that every rollup is current and its buckets equal the raw bucketed counts and sums
+    '''
+    with session_factory() as session:
+        for rollup, repository in RAW.items():
+            assert RollupRepository(session, rollup).isCurrent()
+            for granularity in ("day", "month", "year"):
+                expected = [tuple(i) for i in repository(session).getBuckets(granularity)]
+                assert expected
+                assert [tuple(i) for i in RollupRepository(session, rollup).getBuckets(granularity)] == expected
+
+###################### createRollupTables Function ######################
+
+def test01_createRollupTables(session_factory):
+    '''
+    Test case to check that createRollupTables creates the rollup tables only if they do not exist yet
+
+    Test01:
+    Called a second time on a database that already has them
+    '''
+    engine = session_factory.kw["bind"]
+    createRollupTables(engine)
+
+    assert {"dailyRollups", "rollupWatermarks"} <= set(inspect(engine).get_table_names())
+
+###################### refreshRollups Function ######################
+
+def test02_refreshRollupsMatchesRawBuckets(session_factory):
+    '''
+    Test case to check that the rollups equal the raw bucketed counts and sums after a refresh
+
+    Test02:
+    Four orders on three days of two months and two years, two of them on the same day
+    '''
+    add_orders(session_factory, datetime(2023, 12, 31, 23, 0), datetime(2024, 1, 5, 8, 0), datetime(2024, 1, 5, 17, 30), datetime(2024, 2, 1, 12, 0))
+
+    with session_factory() as session:
+        assert not RollupRepository(session, "orders").isCurrent()
+
+    assert refreshRollups(session_factory) == {"orders": True, "customers": True, "invoices": True}
+    assert_rollups_match(session_factory)
+
+    with session_factory() as session:
+        assert [(i.bucket, i.value) for i in RollupRepository(session, "invoices").getBuckets("day")] == [
+            (datetime(2023, 12, 31), 10), (datetime(2024, 1, 5), 50), (datetime(2024, 2, 1), 40)
+        ]
+
+def test03_refreshRollupsIncremental(session_factory):
+    '''
+    Test case to check that a refresh picks up the rows added after the last one
+
+    Test03:
+    Rows on the day of the watermark and after it
+    '''
+    add_orders(session_factory, datetime(2024, 1, 5, 8, 0), datetime(2024, 1, 6, 8, 0))
+    refreshRollups(session_factory)
+
+    add_orders(session_factory, datetime(2024, 1, 6, 20, 0), datetime(2024, 3, 1, 9, 0))
+
+    with session_factory() as session:
+        assert not RollupRepository(session, "customers").isCurrent()
+
+    refreshRollups(session_factory)
+    assert_rollups_match(session_factory)
+
+def test04_refreshRollupsBackfill(session_factory):
+    '''
+    Test case to check that a refresh recomputes the whole rollup if rows turn up before the watermark
+
+    Test04:
+    A row dated a year before the rows already rolled up
+    '''
+    add_orders(session_factory, datetime(2024, 1, 5, 8, 0), datetime(2024, 1, 6, 8, 0))
+    refreshRollups(session_factory)
+
+    add_orders(session_factory, datetime(2023, 1, 5, 8, 0))
+    refreshRollups(session_factory)
+
+    assert_rollups_match(session_factory)
+    with session_factory() as session:
+        assert RollupRepository(session, "orders").getTotalBefore(datetime(2024, 1, 1)) == 1
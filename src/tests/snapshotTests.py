@@ -0,0 +1,145 @@
+import pytest
+import os,sys
+import numpy as np
+from datetime import datetime
+from uuid import uuid4
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from DataAnalysis.db.snapshot import StarSnapshot, SnapshotManager
+
+PRODUCTS = [uuid4(), uuid4()]
+ORDERS = [uuid4(), uuid4()]
+ADDRESSES = [uuid4(), uuid4()]
+ROUTE = uuid4()
+
+class MockRepository:
+    '''
+    Repository serving two products, two orders of two customers and one route
+    '''
+    def __init__(self):
+        self.watermark = (2,)
+        self.loads = 0
+
+    def getWatermark(self):
+        return self.watermark
+
+    def getProducts(self):
+        self.loads += 1
+        return {"productId": np.array(PRODUCTS, dtype=object), "name": np.array(["Apple", "Pear"], dtype=object)}
+
+    def getAddresses(self):
+        return {"addressId": np.array(ADDRESSES, dtype=object), "latitude": np.array([47.0, None], dtype=object), "longitude": np.array([15.0, None], dtype=object)}
+
+    def getCustomers(self):
+        return {"customerReference": np.array([10, 20]), "signedUp": np.array([datetime(2024, 1, 1)] * 2, dtype="datetime64[us]"), "addressId": np.array(ADDRESSES, dtype=object)}
+
+    def getOrders(self):
+        return {"orderId": np.array(ORDERS, dtype=object), "orderDate": np.array([datetime(2024, 2, 1)] * 2, dtype="datetime64[us]"), "customerReference": np.array([20, 10])}
+
+    def getRoutesOrders(self):
+        return {"routeId": np.array([ROUTE, ROUTE], dtype=object), "orderId": np.array(ORDERS, dtype=object)}
+
+    def streamOrdersProducts(self):
+        yield {"orderId": np.array([ORDERS[1], ORDERS[0]], dtype=object), "productId": np.array([PRODUCTS[0], PRODUCTS[1]], dtype=object),
+               "productAmount": np.array([1, 2]), "orderDate": np.array([datetime(2024, 2, 1)] * 2, dtype="datetime64[us]")}
+        yield {"orderId": np.array([uuid4()], dtype=object), "productId": np.array([PRODUCTS[1]], dtype=object),
+               "productAmount": np.array([3]), "orderDate": np.array([datetime(2024, 2, 2)], dtype="datetime64[us]")}
+
+###################### StarSnapshot Class ######################
+
+def test01_loadStarSnapshotEncodesForeignKeys():
+    '''
+    Test case to check that the load method of StarSnapshot class dictionary encodes the foreign keys
+
+    Test01:
+    ordersProducts rows of two chunks, one with an unknown order
+    '''
+    snapshot = StarSnapshot.load(MockRepository())
+
+    assert snapshot.ordersProducts["orderId"].tolist() == [1, 0, -1]
+    assert snapshot.ordersProducts["productId"].tolist() == [0, 1, 1]
+    assert snapshot.ordersProducts["productAmount"].tolist() == [1, 2, 3]
+    assert snapshot.orders["customerReference"].tolist() == [1, 0]
+    assert snapshot.customers["addressId"].tolist() == [0, 1]
+
+def test02_starSnapshotIsReadOnly():
+    '''
+    Test case to check that a StarSnapshot cannot be changed
+
+    Test02:
+    Writing to a column and replacing a column
+    '''
+    snapshot = StarSnapshot.load(MockRepository())
+
+    with pytest.raises(ValueError):
+        snapshot.ordersProducts["productAmount"][0] = 5
+
+    with pytest.raises(TypeError):
+        snapshot.ordersProducts["productAmount"] = np.zeros(3)
+
+def test03_getRouteCoordinatesStarSnapshot():
+    '''
+    Test case to check the getRouteCoordinates method of StarSnapshot class
+
+    Test03:
+    Two orders of the route, one customer without coordinates
+    '''
+    result = StarSnapshot.load(MockRepository()).getRouteCoordinates()
+
+    assert [(i.routeId, i.latitude, i.longitude) for i in result] == [(ROUTE, None, None), (ROUTE, 47.0, 15.0)]
+
+###################### SnapshotManager Class ######################
+
+def test04_getSnapshotManagerReloadsOnWatermark():
+    '''
+    Test case to check that the get method of SnapshotManager class only loads again if the watermark changed
+
+    Test04:
+    Three gets, the watermark changes before the third one
+    '''
+    repository = MockRepository()
+    manager = SnapshotManager(ttl=600, check_interval=0)
+
+    first = manager.get(repository)
+    second = manager.get(repository)
+    repository.watermark = (3,)
+    third = manager.get(repository)
+
+    assert first is second
+    assert third is not second
+    assert repository.loads == 2
+
+def test05_getSnapshotManagerReloadsAfterTTL():
+    '''
+    Test case to check that the get method of SnapshotManager class loads again once the snapshot is older than the TTL
+
+    Test05:
+    ttl = 0
+    '''
+    repository = MockRepository()
+    manager = SnapshotManager(ttl=0, check_interval=600)
+
+    manager.get(repository)
+    manager.get(repository)
+
+    assert repository.loads == 2
+
+def test06_getSnapshotManagerFreshChecksWatermark():
+    '''
+    Test case to check that the get method of SnapshotManager class checks the watermark right away if fresh is True
+
+    Test06:
+    check_interval = 600, the watermark changes before a get with and a get without fresh
+    '''
+    repository = MockRepository()
+    manager = SnapshotManager(ttl=600, check_interval=600)
+
+    first = manager.get(repository)
+    repository.watermark = (3,)
+    second = manager.get(repository)
+    third = manager.get(repository, fresh=True)
+
+    assert second is first
+    assert third is not first
+    assert third.watermark == (3,)
+    assert repository.loads == 2